@@ -0,0 +1,81 @@
+import copy
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from apps.common.utils.ttl_cache import TTLCache
+from .models import User
+from .tokens import ROLE_CLAIM, TOKEN_VERSION_CLAIM, UUID_CLAIM, TokenVersionCache
+
+CLAIM_FIELDS = ("id", "uuid", "role", "is_active", "token_version")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that keeps recently authenticated users in a per-process TTL/LRU cache.
+
+    User writes evict the entry in the writing process (see accounts.signals);
+    other processes pick the change up once ``AUTH_USER_CACHE_TTL`` expires.
+    Each request gets its own copy, so views can never mutate the cached user.
+    """
+
+    _users = None
+
+    @classmethod
+    def user_cache(cls) -> TTLCache:
+        if cls._users is None:
+            cls._users = TTLCache(
+                maxsize=getattr(settings, "AUTH_USER_CACHE_SIZE", 10_000),
+                ttl=getattr(settings, "AUTH_USER_CACHE_TTL", 30),
+            )
+        return cls._users
+
+    @classmethod
+    def evict(cls, user_id) -> None:
+        cls.user_cache().delete(str(user_id))
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Keyed by the claim as a string, which is how simplejwt encodes it
+        user = self.user_cache().get(str(user_id))
+        if user is None:
+            # Raises for missing or inactive users, which are therefore never cached
+            user = super().get_user(validated_token)
+            self.user_cache().set(str(user_id), user)
+        return copy.copy(user)
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    """JWT authentication that builds ``request.user`` from signed claims instead of the users table.
+
+    Tokens issued by AuthRefreshToken carry the user's uuid, role and token
+    version. The version is compared with TokenVersionCache, so role changes
+    and deactivation still revoke tokens in every worker; without a shared
+    cache that check is one indexed query. The returned User is deferred: only
+    the claimed fields are set, and touching any other field (email, names)
+    loads them all with one query. Tokens without these claims fall back to
+    the cached lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in (UUID_CLAIM, ROLE_CLAIM, TOKEN_VERSION_CLAIM)):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        current_version = TokenVersionCache.get(user_id)
+        if current_version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if current_version != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        # A current version implies the account is still active: deactivation bumps it
+        values = (user_id, validated_token[UUID_CLAIM], validated_token[ROLE_CLAIM], True, current_version)
+        return User.from_db(User.objects.db, CLAIM_FIELDS, values)
@@ -0,0 +1,84 @@
+import statistics
+import time
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.accounts.models import User
+
+BENCHMARK_DOMAIN = "bench.acad.invalid"
+BENCHMARK_PASSWORD = "benchmark-pass"
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the email lookups behind registration and login against a users table of --users rows. "
+        "Synthetic users are inserted in a transaction that is rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000, help="Table size to benchmark at (default 1M).")
+        parser.add_argument("--iterations", type=int, default=200, help="Lookups timed per scenario (default 200).")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per bulk insert (default 10000).")
+        parser.add_argument("--keep", action="store_true", help="Keep the synthetic users instead of rolling back.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["iterations"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--users, --iterations and --batch-size must be positive")
+
+        with transaction.atomic():
+            synthetic = self._populate(options["users"], options["batch_size"])
+            self._report(synthetic, options["iterations"])
+            transaction.set_rollback(not options["keep"])
+
+    def _email(self, i):
+        return f"student{i}@{BENCHMARK_DOMAIN}"
+
+    def _populate(self, total, batch_size):
+        """Top the table up to ``total`` rows; returns how many synthetic users it now holds."""
+        synthetic = User.objects.filter(email__endswith=f"@{BENCHMARK_DOMAIN}").count()
+        missing = max(0, total - User.objects.count())
+        started = time.monotonic()
+        # One hash shared by every synthetic user; hashing is not what is being measured
+        password = make_password(BENCHMARK_PASSWORD)
+        end = synthetic + missing
+        for start in range(synthetic, end, batch_size):
+            User.objects.bulk_create(
+                User(email=self._email(i), first_name="Bench", last_name=str(i), password=password)
+                for i in range(start, min(start + batch_size, end))
+            )
+        self.stdout.write(f"Inserted {missing} users in {time.monotonic() - started:.1f}s ({total} in table).")
+        return end
+
+    def _time(self, label, lookup, samples):
+        timings = []
+        for sample in samples:
+            started = time.perf_counter()
+            lookup(sample)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+        self.stdout.write(f"  {label:<36} mean {statistics.mean(timings):8.3f}ms  p95 {p95:8.3f}ms")
+
+    def _report(self, synthetic, iterations):
+        if not synthetic:
+            raise CommandError("The table already holds --users rows and none of them are synthetic")
+        # Spread over the table and upper-cased, as users type them
+        step = max(1, synthetic // iterations)
+        samples = [self._email(i).upper() for i in range(0, synthetic, step)][:iterations]
+
+        self.stdout.write(f"Lookup latency over {len(samples)} emails:")
+        self._time("registration check (LOWER index)", lambda e: User.objects.by_email(e).exists(), samples)
+        self._time(
+            "registration check (iexact, before)", lambda e: User.objects.filter(email__iexact=e).exists(), samples
+        )
+        self._time("login user lookup", User.objects.get_by_natural_key, samples)
+        self._time(
+            "login incl. password check",
+            lambda e: authenticate(email=e, password=BENCHMARK_PASSWORD),
+            samples[: max(1, len(samples) // 10)],
+        )
+
+        self.stdout.write("Query plans:")
+        self.stdout.write(f"  by_email: {User.objects.by_email(samples[0]).explain()}")
+        self.stdout.write(f"  iexact:   {User.objects.filter(email__iexact=samples[0]).explain()}")
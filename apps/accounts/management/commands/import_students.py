@@ -0,0 +1,39 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.accounts.provisioning import IMPORT_CHUNK_SIZE, STUDENT_IMPORT_FORMATS, detect_format, import_students
+
+
+class Command(BaseCommand):
+    help = "Create student accounts from a CSV or JSONL roster (email, first_name, last_name, password)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file, or '-' for stdin.")
+        parser.add_argument("--format", choices=STUDENT_IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per bulk insert.")
+        parser.add_argument("--workers", type=int, help="Password hashing processes (default: one per core).")
+
+    def handle(self, *args, **options):
+        import_format = detect_format(options["path"], options["format"])
+        if import_format is None:
+            raise CommandError("Cannot tell the file format; pass --format csv or --format jsonl.")
+
+        try:
+            source = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8-sig", newline="")
+        except OSError as e:
+            raise CommandError(str(e))
+
+        with source:
+            summary = import_students(
+                source, import_format, chunk_size=options["chunk_size"], workers=options["workers"]
+            )
+
+        for result in summary["results"]:
+            if result["status"] != "created":
+                self.stderr.write(f"line {result['line']}: {result['status']} {result.get('errors', result['email'])}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {summary['created']} students from {summary['rows']} rows "
+                f"({summary['exists']} existing, {summary['duplicate']} duplicate, {summary['invalid']} invalid)."
+            )
+        )
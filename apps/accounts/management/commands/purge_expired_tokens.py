@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted refresh tokens in chunks (run from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, help="Tokens deleted per transaction (default 1000)."
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        started = time.monotonic()
+        now = timezone.now()
+        outstanding_removed = blacklisted_removed = 0
+        expired = OutstandingToken.objects.filter(expires_at__lt=now).order_by("id").values_list("id", flat=True)
+
+        while True:
+            # Short transactions keep locks brief while the API keeps blacklisting tokens
+            ids = list(expired[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                blacklisted_removed += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                outstanding_removed += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+
+        # Purged JTIs linger in the per-process Bloom filters as harmless false positives until their next rebuild
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {outstanding_removed} outstanding and {blacklisted_removed} blacklisted tokens "
+                f"in {time.monotonic() - started:.2f}s."
+            )
+        )
@@ -1,8 +1,21 @@
 from django.contrib.auth.models import BaseUserManager
+from django.db.models.functions import Lower
 
 
 class UserManager(BaseUserManager):
 
+    @classmethod
+    def normalize_email(cls, email):
+        # Emails are stored lowercased so they match the LOWER(email) unique index
+        return (email or "").strip().lower()
+
+    def by_email(self, email):
+        """Case-insensitive email lookup that can use the ``LOWER(email)`` index (``iexact`` cannot)."""
+        return self.alias(email_lower=Lower("email")).filter(email_lower=self.normalize_email(email))
+
+    def get_by_natural_key(self, email):
+        return self.by_email(email).get()
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError("The Email field must be set")
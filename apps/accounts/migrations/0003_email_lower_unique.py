@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:06
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    # Accounts created through createsuperuser only had their domain lowercased.
+    # Two addresses differing only in case make the constraint below fail and need merging by hand.
+    User = apps.get_model("accounts", "User")
+    User.objects.exclude(email=Lower("email")).update(email=Lower("email"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_user_token_version"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_email_4b85f2_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"), name="users_email_lower_uniq"
+            ),
+        ),
+    ]
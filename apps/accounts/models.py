@@ -1,6 +1,7 @@
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 from .managers import UserManager
 
@@ -22,6 +23,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
     last_login = models.DateTimeField(null=True, blank=True)
+    # Embedded in issued tokens; bumped when role or is_active changes so older tokens stop working
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager()
 
@@ -32,13 +35,52 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = "users"
         indexes = [
             models.Index(fields=["uuid"]),
-            models.Index(fields=["email"]),
             models.Index(fields=["role"]),
         ]
+        constraints = [
+            # Serves every login/registration lookup through UserManager.by_email
+            models.UniqueConstraint(Lower("email"), name="users_email_lower_uniq"),
+        ]
+
+    # Fields whose change revokes every token issued to the user
+    TOKEN_CLAIM_FIELDS = ("role", "is_active")
 
     def __str__(self):
         return f"{self.email} ({self.role})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = {
+            field: getattr(instance, field) for field in cls.TOKEN_CLAIM_FIELDS if field in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_claims", None)
+        if not self._state.adding and loaded and any(loaded[f] != getattr(self, f) for f in loaded):
+            self.token_version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_claims = {field: getattr(self, field) for field in self.TOKEN_CLAIM_FIELDS}
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Touching one deferred field loads all of them, so a user built from token claims costs one query
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+    def revoke_tokens(self):
+        """Invalidate every token issued to this user (e.g. after a bulk ``update()`` of role or is_active)."""
+        User.objects.filter(pk=self.pk).update(token_version=models.F("token_version") + 1)
+        self.refresh_from_db(fields=["token_version"])
+        from .tokens import TokenVersionCache
+
+        pk = self.pk
+        transaction.on_commit(lambda: TokenVersionCache.invalidate(pk))
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -15,6 +15,13 @@ class IsInstructor(BasePermission):
         return request.user and request.user.is_authenticated and request.user.role == "INSTRUCTOR"
 
 
+class IsAdmin(BasePermission):
+    """Only admins can access this endpoint."""
+
+    def has_permission(self, request, view):
+        return request.user and request.user.is_authenticated and request.user.role == "ADMIN"
+
+
 class IsOwner(BasePermission):
     """User can only access their own objects."""
 
@@ -0,0 +1,178 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from rest_framework import serializers
+from .models import User
+
+STUDENT_IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 500
+# Below this many passwords, starting worker processes costs more than it saves
+PARALLEL_HASH_THRESHOLD = 32
+
+
+class RosterTooLarge(Exception):
+    def __init__(self, rows: int, max_rows: int):
+        super().__init__(f"{rows} rows (limit {max_rows})")
+        self.rows = rows
+        self.max_rows = max_rows
+
+
+class StudentImportRowSerializer(serializers.Serializer):
+    """One CSV row or JSONL line of a student roster."""
+
+    email = serializers.EmailField(max_length=254)
+    first_name = serializers.CharField(max_length=50)
+    last_name = serializers.CharField(max_length=50)
+    password = serializers.CharField(min_length=8, write_only=True)
+
+    def validate_email(self, value):
+        return value.lower().strip()
+
+
+def detect_format(filename: str = "", import_format: str = None) -> Optional[str]:
+    """Explicit format if given, otherwise inferred from the file extension."""
+    if import_format:
+        import_format = import_format.lower()
+        return import_format if import_format in STUDENT_IMPORT_FORMATS else None
+    extension = os.path.splitext(filename or "")[1].lower()
+    return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension)
+
+
+def _decode(line) -> str:
+    return line.decode("utf-8-sig") if isinstance(line, bytes) else line
+
+
+def read_rows(lines: Iterable, import_format: str) -> Iterator[Tuple[int, Optional[Dict], Optional[Dict]]]:
+    """Yield ``(line number, payload, parse errors)`` for each non-empty row."""
+    text = (_decode(line) for line in lines)
+    if import_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {key.strip(): value for key, value in row.items() if key}, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, {"json": [str(e)]}
+            continue
+        if not isinstance(payload, dict):
+            yield line_number, None, {"json": ["Each line must be a JSON object."]}
+            continue
+        yield line_number, payload, None
+
+
+def hash_passwords(passwords: List[str], workers: int = None) -> List[str]:
+    """Hash passwords with the configured hasher, spread over a process pool sized to the cores."""
+    workers = workers or getattr(settings, "STUDENT_IMPORT_HASH_WORKERS", None) or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < PARALLEL_HASH_THRESHOLD:
+        return [make_password(password) for password in passwords]
+
+    workers = min(workers, len(passwords))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def _validate_rows(lines, import_format):
+    """Per-row results plus the valid, first-seen rows still to be created."""
+    results, pending, seen = [], [], set()
+    for line_number, payload, errors in read_rows(lines, import_format):
+        result = {"line": line_number, "email": (payload or {}).get("email"), "status": "invalid"}
+        results.append(result)
+        if errors is None:
+            serializer = StudentImportRowSerializer(data=payload)
+            if serializer.is_valid():
+                data = serializer.validated_data
+            else:
+                errors = serializer.errors
+        if errors:
+            result["errors"] = errors
+            continue
+
+        result["email"] = data["email"]
+        if data["email"] in seen:
+            result["status"] = "duplicate"
+            continue
+        seen.add(data["email"])
+        pending.append((result, data))
+    return results, pending
+
+
+def _insert_chunk(rows: List[Tuple[Dict, Dict]], users: List[User]) -> None:
+    """Insert one chunk of users and record which rows were created.
+
+    An account registered since the existing-email lookup would violate the
+    email constraint and fail the whole import, so conflicting rows are skipped
+    and then reported as existing; the uuids are generated here, so one query
+    tells which rows went in.
+    """
+    User.objects.bulk_create(users, ignore_conflicts=True)
+    created = set(User.objects.filter(uuid__in=[user.uuid for user in users]).values_list("uuid", flat=True))
+    for (result, _), user in zip(rows, users):
+        if user.uuid in created:
+            result.update({"status": "created", "id": str(user.uuid)})
+        else:
+            result["status"] = "exists"
+
+
+def import_students(
+    lines: Iterable,
+    import_format: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    workers: int = None,
+    max_rows: int = None,
+) -> Dict:
+    """Create student accounts from a CSV/JSONL roster; returns counts and a result per row.
+
+    Existing accounts are found with one query, passwords for the new ones are
+    hashed in parallel, and users are inserted with chunked ``bulk_create``.
+    Rows with existing, repeated or invalid emails are reported, not created.
+    Raises ``RosterTooLarge`` before hashing anything when the roster has more
+    than ``max_rows`` rows.
+    """
+    results, pending = _validate_rows(lines, import_format)
+    if max_rows is not None and len(results) > max_rows:
+        raise RosterTooLarge(len(results), max_rows)
+
+    emails = [data["email"] for _, data in pending]
+    existing = set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .values_list("email_lower", flat=True)
+    )
+    new_rows = []
+    for result, data in pending:
+        if data["email"] in existing:
+            result["status"] = "exists"
+        else:
+            new_rows.append((result, data))
+
+    hashed = hash_passwords([data["password"] for _, data in new_rows], workers)
+    users = [
+        User(
+            email=data["email"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            role="STUDENT",
+            password=password,
+        )
+        for (_, data), password in zip(new_rows, hashed)
+    ]
+    with transaction.atomic():
+        for start in range(0, len(users), chunk_size):
+            _insert_chunk(new_rows[start : start + chunk_size], users[start : start + chunk_size])
+
+    counts = {"rows": len(results), "created": 0, "exists": 0, "duplicate": 0, "invalid": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {**counts, "results": results}
@@ -24,9 +24,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ["email", "password", "password_confirm", "first_name", "last_name", "role"]
 
     def validate_email(self, value):
-        if User.objects.filter(email__iexact=value).exists():
+        if User.objects.by_email(value).exists():
             raise serializers.ValidationError("User with this email already exists.")
-        return value.lower().strip()
+        return User.objects.normalize_email(value)
 
     def validate(self, attrs):
         if attrs["password"] != attrs["password_confirm"]:
@@ -1,7 +1,9 @@
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
+from django.db import IntegrityError
 from apps.common.utils.response_builder import ResponseBuilder
 from .serializers import UserSerializer, RegisterSerializer, LoginSerializer
 from .models import User
+from .tokens import AuthRefreshToken, is_token_current
 
 
 class AuthService:
@@ -24,27 +26,27 @@ class AuthService:
             )
 
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = AuthRefreshToken.for_user(user)
 
             user_data = UserSerializer(user).data
             return ResponseBuilder.success(
                 "registration", data={"user": user_data, "access": str(refresh.access_token), "refresh": str(refresh)}
             )
+        except IntegrityError:
+            # Lost a race with a concurrent registration of the same address (the LOWER(email) constraint)
+            return ResponseBuilder.error("validation", errors={"email": ["User with this email already exists."]})
         except Exception as e:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
 
     @staticmethod
     def login_user(data, request=None):
 
-        from django.contrib.auth import authenticate
-
         serializer = LoginSerializer(data=data, context={"request": request})
         if not serializer.is_valid():
             return ResponseBuilder.error("validation", errors=serializer.errors)
 
-        validated_data = serializer.validated_data
-
-        user = authenticate(email=validated_data["email"], password=validated_data["password"])
+        # The serializer already authenticated; a second authenticate() would hash the password twice
+        user = serializer.validated_data.get("user")
 
         if not user:
             return ResponseBuilder.error("invalid_credentials")
@@ -53,7 +55,7 @@ class AuthService:
             return ResponseBuilder.error("account_deactivated")
 
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = AuthRefreshToken.for_user(user)
         user_data = UserSerializer(user).data
 
         return ResponseBuilder.success(
@@ -65,12 +67,52 @@ class AuthService:
         # If refresh token provided, blacklist it
         if refresh_token:
             try:
-                token = RefreshToken(refresh_token)
+                token = AuthRefreshToken(refresh_token)
                 token.blacklist()
             except Exception:
                 pass
         return ResponseBuilder.success("logout")
 
+    @staticmethod
+    def import_students(upload, import_format: str = None):
+        """Provision student accounts from an uploaded CSV or JSONL roster.
+
+        Every new account costs a full password hash, so uploads are limited to
+        ``STUDENT_IMPORT_MAX_ROWS`` rows hashed in the request's own process;
+        larger rosters go through the ``import_students`` management command.
+        """
+        from .provisioning import STUDENT_IMPORT_FORMATS, RosterTooLarge, detect_format, import_students
+
+        if upload is None:
+            return ResponseBuilder.error("validation", errors={"file": ["A CSV or JSONL file is required."]})
+
+        import_format = detect_format(upload.name, import_format)
+        if import_format is None:
+            return ResponseBuilder.error(
+                "validation", errors={"format": [f"Supported formats: {', '.join(STUDENT_IMPORT_FORMATS)}"]}
+            )
+
+        try:
+            # Iterating an UploadedFile yields lines without reading the whole upload into memory
+            summary = import_students(
+                upload, import_format, workers=1, max_rows=getattr(settings, "STUDENT_IMPORT_MAX_ROWS", 50)
+            )
+            return ResponseBuilder.success("students_imported", data=summary)
+        except RosterTooLarge as e:
+            return ResponseBuilder.error(
+                "validation",
+                errors={
+                    "file": [
+                        f"Rosters of more than {e.max_rows} rows must be imported with "
+                        "the import_students management command."
+                    ]
+                },
+            )
+        except UnicodeDecodeError:
+            return ResponseBuilder.error("validation", errors={"file": ["The file must be UTF-8 encoded."]})
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
     @staticmethod
     def get_user_profile(user):
         user_data = UserSerializer(user).data
@@ -81,7 +123,9 @@ class AuthService:
         try:
             from django.conf import settings
 
-            refresh = RefreshToken(refresh_token_string)
+            refresh = AuthRefreshToken(refresh_token_string)
+            if not is_token_current(refresh):
+                return ResponseBuilder.error("token_refresh_failed", errors={"detail": ["Token has been revoked"]})
             data = {"access": str(refresh.access_token)}
 
             # Handle rotation if enabled in settings
@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import CachedJWTAuthentication
+from .models import User
+from .tokens import TokenVersionCache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_token_version(sender, instance, **kwargs):
+    """Drop the cached token version once the write commits, so revoked tokens are refused."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: TokenVersionCache.invalidate(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    """Evict from this process's authentication cache; other processes rely on its TTL."""
+    CachedJWTAuthentication.evict(instance.pk)
@@ -0,0 +1,209 @@
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.common.utils.bloom import BloomFilter
+
+UUID_CLAIM = "uuid"
+ROLE_CLAIM = "role"
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+def shared_cache_configured() -> bool:
+    """Whether the default cache is shared between processes, so one worker's writes reach the others."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+class TokenBlacklistFilter:
+    """Per-process Bloom filter of blacklisted JTIs in front of the token_blacklist tables.
+
+    Most refresh tokens presented are not blacklisted, and the filter answers
+    that without a query; only possible hits are confirmed against the
+    database. Blacklisting bumps a generation counter in the shared cache on
+    commit, and a process that sees a new generation re-reads every row
+    blacklisted since its last rebuild (less ``SYNC_MARGIN``, for rows that
+    commit late). The filter is rebuilt every
+    ``TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS`` to shed purged tokens.
+
+    The generation only reaches other workers through a cache they share, so
+    the filter is off (every token is checked in the database) while the
+    default cache is process-local, unless ``TOKEN_BLACKLIST_FILTER_ENABLED``
+    says otherwise, e.g. for a single-process server.
+    """
+
+    GENERATION_KEY = "token_blacklist_generation"
+    SYNC_MARGIN = timedelta(minutes=5)
+    MIN_CAPACITY = 10_000
+
+    _bloom = None
+    _rebuilt_at = None
+    _generation = None
+    _built_at = 0.0
+    _lock = threading.RLock()
+
+    @staticmethod
+    def enabled() -> bool:
+        setting = getattr(settings, "TOKEN_BLACKLIST_FILTER_ENABLED", None)
+        if setting is not None:
+            return setting
+        return shared_cache_configured()
+
+    @classmethod
+    def _current_generation(cls):
+        return cache.get_or_set(cls.GENERATION_KEY, time.time_ns, timeout=None)
+
+    @classmethod
+    def _add_jtis(cls, jtis) -> None:
+        for jti in jtis:
+            if jti not in cls._bloom:
+                cls._bloom.add(jti)
+
+    @classmethod
+    def rebuild(cls) -> None:
+        with cls._lock:
+            # Read the generation first so writes made during the rebuild trigger a sync
+            generation = cls._current_generation()
+            rebuilt_at = timezone.now()
+            capacity = max(cls.MIN_CAPACITY, 2 * BlacklistedToken.objects.count())
+            cls._bloom = BloomFilter(capacity, getattr(settings, "TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.001))
+            cls._add_jtis(
+                BlacklistedToken.objects.order_by().values_list("token__jti", flat=True).iterator(chunk_size=5000)
+            )
+            cls._rebuilt_at = rebuilt_at
+            cls._generation = generation
+            cls._built_at = time.monotonic()
+
+    @classmethod
+    def _sync(cls) -> None:
+        generation = cls._current_generation()
+        if generation == cls._generation:
+            return
+        with cls._lock:
+            rows = BlacklistedToken.objects.filter(blacklisted_at__gte=cls._rebuilt_at - cls.SYNC_MARGIN)
+            cls._add_jtis(rows.values_list("token__jti", flat=True))
+            cls._generation = generation
+        if cls._bloom.is_full:
+            cls.rebuild()
+
+    @classmethod
+    def might_be_blacklisted(cls, jti: str) -> bool:
+        """False means definitely not blacklisted; True must be confirmed against the database."""
+        if not cls.enabled():
+            return True
+        max_age = getattr(settings, "TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS", 15 * 60)
+        if cls._bloom is None or time.monotonic() - cls._built_at > max_age:
+            cls.rebuild()
+        else:
+            cls._sync()
+        return jti in cls._bloom
+
+    @classmethod
+    def record(cls, jti: str) -> None:
+        """Note a JTI this process just blacklisted and tell other processes once it commits."""
+        with cls._lock:
+            if cls._bloom is not None:
+                cls._bloom.add(jti)
+        transaction.on_commit(cls.bump_generation)
+
+    @classmethod
+    def bump_generation(cls) -> None:
+        try:
+            cache.incr(cls.GENERATION_KEY)
+        except ValueError:
+            cache.set(cls.GENERATION_KEY, time.time_ns(), timeout=None)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._bloom = None
+            cls._rebuilt_at = None
+            cls._generation = None
+
+
+class AuthRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the claims StatelessJWTAuthentication trusts.
+
+    Blacklist checks go through TokenBlacklistFilter first.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[UUID_CLAIM] = str(user.uuid)
+        token[ROLE_CLAIM] = user.role
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+    def check_blacklist(self) -> None:
+        if TokenBlacklistFilter.might_be_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        TokenBlacklistFilter.record(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class TokenVersionCache:
+    """Current ``User.token_version`` per user id, read through from the users table.
+
+    Kept in the shared cache so checking a token costs a cache hit rather than
+    a query. User writes drop the entry on commit; the timeout bounds how long
+    a missed invalidation (e.g. a raw ``update()``) can go unnoticed.
+
+    A process-local cache would only be invalidated in the worker that made
+    the write, so while the default cache is process-local every check reads
+    the users table instead, unless ``TOKEN_VERSION_CACHE_ENABLED`` says
+    otherwise, e.g. for a single-process server.
+    """
+
+    KEY_PREFIX = "user_token_version"
+
+    @classmethod
+    def _key(cls, user_id) -> str:
+        return f"{cls.KEY_PREFIX}:{user_id}"
+
+    @staticmethod
+    def enabled() -> bool:
+        setting = getattr(settings, "TOKEN_VERSION_CACHE_ENABLED", None)
+        if setting is not None:
+            return setting
+        return shared_cache_configured()
+
+    @staticmethod
+    def _load(user_id):
+        from .models import User
+
+        return User.objects.filter(pk=user_id).values_list("token_version", flat=True).first()
+
+    @classmethod
+    def get(cls, user_id):
+        """Current version, or None when the user no longer exists."""
+        if not cls.enabled():
+            return cls._load(user_id)
+        version = cache.get(cls._key(user_id))
+        if version is None:
+            version = cls._load(user_id)
+            if version is not None:
+                cache.set(cls._key(user_id), version, getattr(settings, "TOKEN_VERSION_CACHE_TIMEOUT", 5 * 60))
+        return version
+
+    @classmethod
+    def invalidate(cls, user_id) -> None:
+        cache.delete(cls._key(user_id))
+
+
+def is_token_current(token) -> bool:
+    """False when the token predates a role change or deactivation; tokens without a version always pass."""
+    if TOKEN_VERSION_CLAIM not in token:
+        return True
+    user_id = token.get(settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id"))
+    return TokenVersionCache.get(user_id) == token[TOKEN_VERSION_CLAIM]
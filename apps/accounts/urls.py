@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import RegisterView, LoginView, LogoutView, ProfileView, RefreshTokenView
+from .views import RegisterView, LoginView, LogoutView, ProfileView, RefreshTokenView, StudentImportView
 
 app_name = "accounts"
 
@@ -9,4 +9,5 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="logout"),
     path("profile/", ProfileView.as_view(), name="profile"),
     path("refresh-token/", RefreshTokenView.as_view(), name="refresh-token"),
+    path("students/import/", StudentImportView.as_view(), name="student-import"),
 ]
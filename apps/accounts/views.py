@@ -1,8 +1,12 @@
 import traceback
 import logging
+from rest_framework.parsers import MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from apps.common.utils.response_utils import server_error_response
+from apps.common.utils.streaming import FileExportContentNegotiation
+from apps.common.utils.throttling import EmailRateThrottle, IPRateThrottle
+from .permissions import IsAdmin, IsInstructor
 from .services import AuthService
 from .serializers import RegisterSerializer, LoginSerializer
 
@@ -13,6 +17,8 @@ class RegisterView(APIView):
 
     permission_classes = [AllowAny]
     serializer_class = RegisterSerializer
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = "register"
 
     def post(self, request):
         try:
@@ -27,6 +33,8 @@ class LoginView(APIView):
 
     permission_classes = [AllowAny]
     serializer_class = LoginSerializer
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "login"
 
     def post(self, request):
         try:
@@ -81,3 +89,19 @@ class RefreshTokenView(APIView):
         except Exception:
             logger.error(f"Token refresh error: {traceback.format_exc()}")
             return server_error_response()
+
+
+class StudentImportView(APIView):
+
+    permission_classes = [IsAuthenticated, IsInstructor | IsAdmin]
+    parser_classes = [MultiPartParser]
+    content_negotiation_class = FileExportContentNegotiation
+    serializer_class = None
+
+    def post(self, request):
+        try:
+            result = AuthService.import_students(request.FILES.get("file"), request.query_params.get("format"))
+            return result.to_response()
+        except Exception:
+            logger.error(f"Student import error: {traceback.format_exc()}")
+            return server_error_response()
@@ -1,33 +1,58 @@
 import logging
+import random
 import time
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
 
 logger = logging.getLogger("apps")
 
 
+def _user_id(request):
+    user = getattr(request, "user", None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        # The view never looked at the session user; don't load it just to log it
+        return None
+    return getattr(user, "pk", None)
+
+
 class LoggingMiddleware:
-    """Middleware to log all requests and responses."""
+    """Log one structured record per request and response.
+
+    The message is %-formatted by the logging handlers, and only when the
+    record is emitted. Successful responses are logged for a
+    ``LOG_REQUEST_SAMPLE_RATE`` fraction of requests. Responses with a status
+    of 400 or above are always logged.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.sample_rate = getattr(settings, "LOG_REQUEST_SAMPLE_RATE", 1.0)
 
     def __call__(self, request):
-        start_time = time.time()
-
-        # Log request
-        logger.info(
-            f"Request: {request.method} {request.path} | " f"User: {getattr(request.user, 'email', 'Anonymous')}"
-        )
-
+        start_time = time.perf_counter()
         response = self.get_response(request)
 
-        # Calculate duration
-        duration = time.time() - start_time
+        if not logger.isEnabledFor(logging.INFO):
+            return response
+        status_code = response.status_code
+        if status_code < 400 and self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return response
 
-        # Log response
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        user_id = _user_id(request)
         logger.info(
-            f"Response: {request.method} {request.path} | "
-            f"Status: {response.status_code} | "
-            f"Duration: {duration:.3f}s"
+            "%s %s | Status: %s | Duration: %.1fms | User: %s",
+            request.method,
+            request.path,
+            status_code,
+            duration_ms,
+            user_id,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status_code": status_code,
+                "duration_ms": round(duration_ms, 1),
+                "user_id": user_id,
+            },
         )
-
         return response
@@ -0,0 +1,50 @@
+import time
+from django.db import connection
+from apps.common.utils.metrics import Metrics
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _route(request) -> str:
+    """The resolved URL name (or pattern), never the raw path, so label cardinality stays bounded."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match.route or "unnamed"
+
+
+class MetricsMiddleware:
+    """Record latency, status, in-flight and database query metrics per route.
+
+    Streamed responses are timed until the response object is returned, not
+    until the last chunk is sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        Metrics.inc("http_requests_in_flight")
+        queries = QueryCounter()
+        start_time = time.perf_counter()
+        status_code = 500
+        try:
+            with connection.execute_wrapper(queries):
+                response = self.get_response(request)
+            status_code = response.status_code
+            return response
+        finally:
+            duration = time.perf_counter() - start_time
+            route, method = _route(request), request.method
+            Metrics.inc("http_requests_in_flight", -1)
+            Metrics.inc("http_requests_total", route=route, method=method, status=status_code)
+            Metrics.observe("http_request_duration_seconds", duration, route=route, method=method)
+            Metrics.observe("http_request_db_queries", queries.count, route=route)
+            Metrics.maybe_flush()
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from apps.common.utils.query_budget import QueryBudget
+
+
+class QueryBudgetMiddleware:
+    """Hold every request to ``QUERY_BUDGET_MAX_QUERIES`` and flag repeated query shapes.
+
+    Enabled with ``QUERY_BUDGET_ENABLED`` (defaults to ``DEBUG``). Violations
+    are logged, or raised when ``QUERY_BUDGET_RAISE`` is set. Responses carry
+    ``X-DB-Query-Count`` and ``X-DB-Time-Ms`` headers.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_BUDGET_ENABLED", settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        budget = QueryBudget(
+            max_queries=getattr(settings, "QUERY_BUDGET_MAX_QUERIES", None),
+            n_plus_one_threshold=getattr(settings, "QUERY_BUDGET_N_PLUS_ONE_THRESHOLD", None),
+            label=f"{request.method} {request.path}",
+            raise_on_violation=getattr(settings, "QUERY_BUDGET_RAISE", False),
+        )
+        with budget:
+            response = self.get_response(request)
+        response["X-DB-Query-Count"] = str(budget.count)
+        response["X-DB-Time-Ms"] = f"{budget.duration * 1000:.1f}"
+        return response
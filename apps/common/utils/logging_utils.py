@@ -0,0 +1,91 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, ``extra`` fields and traceback."""
+
+    def format(self, record):
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """Hands records to a background thread that writes them to ``handlers``.
+
+    The request thread renders the message and traceback into a copy of the
+    record, as the stock QueueHandler does, so arguments are formatted before
+    they can change and model ``__str__`` queries run on the request's own
+    connection; file writes and rotation checks happen on the listener thread.
+    Configured from ``LOGGING`` with ``cfg://handlers.<name>`` references, which
+    resolve to the configured handlers as long as they sort before this one.
+    The listener is (re)started lazily per process, so it survives forking
+    servers that configure logging before forking workers.
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.Queue(-1))
+        # Indexing (not iterating) is what makes dictConfig's ConvertingList resolve cfg:// references
+        self.targets = [handlers[i] for i in range(len(handlers))]
+        self.respect_handler_level = respect_handler_level
+        self.listener = None
+        self._pid = None
+        atexit.register(self.stop)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid != os.getpid():
+                self.listener = logging.handlers.QueueListener(
+                    self.queue, *self.targets, respect_handler_level=self.respect_handler_level
+                )
+                self.listener.start()
+                self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Only msg % args is rendered, not the full format, so the targets keep their own
+        # formatters; the traceback goes to exc_text so the record does not keep the frames alive
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = record.msg = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self._pid = None
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,249 @@
+"""In-process request and grading metrics, exposed in Prometheus text format.
+
+Each process aggregates into memory and periodically writes a snapshot to
+``METRICS_DIR/metrics-<pid>-<start time>.json`` (atomically, like compiled
+grading plans); the start time keeps a process that reuses a PID from
+overwriting an exited one's totals. A scrape of ``/metrics`` merges every
+snapshot in the directory, so any gunicorn worker can answer for all of them:
+counters and histograms are summed, including those of workers that have
+exited, while gauges only count processes that are still alive. Snapshots of
+exited processes are deleted once ``METRICS_RETENTION_SECONDS`` old, so old
+deploys stop counting; Prometheus sees the drop as a counter reset.
+"""
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+GRADING_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# name -> (type, help, buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[Tuple]]] = {
+    "http_requests_total": ("counter", "Requests by route, method and status.", None),
+    "http_request_duration_seconds": ("histogram", "Request latency by route and method.", LATENCY_BUCKETS),
+    "http_requests_in_flight": ("gauge", "Requests currently being handled.", None),
+    "http_request_db_queries": ("histogram", "Database queries per request by route.", QUERY_COUNT_BUCKETS),
+    "grading_duration_seconds": ("histogram", "Time to grade one submission by grader.", GRADING_BUCKETS),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Metrics:
+    """Process-wide metric store; see the module docstring for how processes are combined."""
+
+    _values: Dict[str, Dict[Labels, object]] = {}
+    _lock = threading.Lock()
+    _last_flush = 0.0
+    _process: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def process(cls) -> Tuple[int, int]:
+        """``(pid, start time in ms)`` of this process, taken on first use after each fork."""
+        pid = os.getpid()
+        if cls._process is None or cls._process[0] != pid:
+            cls._process = (pid, time.time_ns() // 1_000_000)
+        return cls._process
+
+    @classmethod
+    def inc(cls, name: str, amount: float = 1, **labels):
+        key = _labels(labels)
+        with cls._lock:
+            series = cls._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels):
+        buckets = METRICS[name][2]
+        key = _labels(labels)
+        with cls._lock:
+            series = cls._values.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                # Per-bucket (not cumulative) counts with a trailing +Inf bucket, then sum
+                histogram = series[key] = [[0] * (len(buckets) + 1), 0.0]
+            histogram[0][bisect.bisect_left(buckets, value)] += 1
+            histogram[1] += value
+
+    @classmethod
+    @contextmanager
+    def timed(cls, name: str, **labels):
+        """Observe the duration of the block, labelled with its ``outcome`` (success or error)."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        finally:
+            cls.observe(name, time.perf_counter() - started, outcome=outcome, **labels)
+
+    @classmethod
+    def snapshot(cls) -> Dict:
+        with cls._lock:
+            return {
+                name: [
+                    [dict(key), [list(value[0]), value[1]] if isinstance(value, list) else value]
+                    for key, value in series.items()
+                ]
+                for name, series in cls._values.items()
+            }
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._values = {}
+            cls._last_flush = 0.0
+
+    @staticmethod
+    def directory() -> Optional[Path]:
+        directory = getattr(settings, "METRICS_DIR", None)
+        return Path(directory) if directory else None
+
+    @classmethod
+    def flush(cls):
+        """Write this process's snapshot for other workers' scrapes to pick up."""
+        directory = cls.directory()
+        cls._last_flush = time.monotonic()
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        pid, started = cls.process()
+        payload = {"pid": pid, "started": started, "metrics": cls.snapshot()}
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp_path, directory / f"metrics-{pid}-{started}.json")
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def maybe_flush(cls):
+        if time.monotonic() - cls._last_flush >= getattr(settings, "METRICS_FLUSH_INTERVAL", 5):
+            cls.flush()
+
+    @classmethod
+    def _stored_snapshots(cls) -> List[Dict]:
+        """Snapshots other processes wrote, without gauges for exited ones; expired ones are deleted."""
+        directory = cls.directory()
+        if directory is None or not directory.is_dir():
+            return []
+        own = cls.process()
+        retention = getattr(settings, "METRICS_RETENTION_SECONDS", 24 * 60 * 60)
+        stored = []
+        for path in directory.glob("metrics-*.json"):
+            try:
+                payload = json.loads(path.read_text())
+                stored.append((path, path.stat().st_mtime, (payload["pid"], payload.get("started", 0)), payload))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+
+        # Of the snapshots written under one PID, only the newest can belong to a running process
+        newest = {own[0]: own[1]}
+        for _, _, (pid, started), _ in stored:
+            newest[pid] = max(newest.get(pid, started), started)
+
+        snapshots = []
+        for path, modified, process, payload in stored:
+            if process == own:
+                continue
+            if newest[process[0]] == process[1] and _alive(process[0]):
+                snapshots.append(payload["metrics"])
+            elif time.time() - modified > retention:
+                path.unlink(missing_ok=True)
+            else:
+                snapshots.append(_without_gauges(payload["metrics"]))
+        return snapshots
+
+    @classmethod
+    def collect(cls) -> Dict[str, Dict[Labels, object]]:
+        """Merge the snapshots of every process (this one read live) into one set of series."""
+        snapshots = [cls.snapshot(), *cls._stored_snapshots()]
+
+        merged: Dict[str, Dict[Labels, object]] = {}
+        for snapshot in snapshots:
+            for name, series in snapshot.items():
+                if name not in METRICS:
+                    continue
+                target = merged.setdefault(name, {})
+                for labels, value in series:
+                    _merge(target, _labels(labels), value)
+        return merged
+
+
+def _alive(pid) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _without_gauges(snapshot: Dict) -> Dict:
+    return {name: series for name, series in snapshot.items() if METRICS.get(name, ("",))[0] != "gauge"}
+
+
+def _merge(target: Dict, key: Labels, value):
+    if not isinstance(value, list):
+        target[key] = target.get(key, 0) + value
+        return
+    counts, total = value
+    existing = target.get(key)
+    if existing is None:
+        target[key] = [list(counts), total]
+    else:
+        existing[0] = [a + b for a, b in zip(existing[0], counts)]
+        existing[1] += total
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(merged: Dict[str, Dict[Labels, object]]) -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = merged.get(name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series.items()):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip([*buckets, "+Inf"], counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
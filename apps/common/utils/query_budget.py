@@ -0,0 +1,98 @@
+import logging
+import re
+import time
+from collections import Counter
+from typing import List, Optional
+from django.db import connections
+
+logger = logging.getLogger("apps")
+
+_IN_LIST_RE = re.compile(r"\bIN \((?:%s, )*%s\)")
+_VALUES_RE = re.compile(r"VALUES (?:\((?:%s, )*%s\), )*\((?:%s, )*%s\)")
+
+
+def query_shape(sql: str) -> str:
+    """SQL with its variable-length parameter lists collapsed; parameters are already placeholders."""
+    return _VALUES_RE.sub("VALUES (...)", _IN_LIST_RE.sub("IN (...)", sql))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    """Count the queries and database time of a block and flag likely N+1 patterns.
+
+    Usable as a context manager or through ``QueryBudgetMiddleware``. A block
+    violates its budget when it runs more than ``max_queries`` queries, or
+    runs the same query shape ``n_plus_one_threshold`` times or more, which
+    is what a lazy relation loaded once per row looks like. Violations are
+    logged, or raised as ``QueryBudgetExceeded`` with ``raise_on_violation``.
+    """
+
+    def __init__(
+        self,
+        max_queries: Optional[int] = None,
+        n_plus_one_threshold: Optional[int] = None,
+        label: str = "block",
+        raise_on_violation: bool = False,
+        using: str = "default",
+    ):
+        self.max_queries = max_queries
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.label = label
+        self.raise_on_violation = raise_on_violation
+        self.using = using
+        self.count = 0
+        self.duration = 0.0
+        # Keyed by raw SQL; shapes are only computed when the block ends
+        self._statements = Counter()
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self._statements[sql] += 1
+
+    def __enter__(self):
+        self._wrapper = connections[self.using].execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._wrapper.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.check()
+        return False
+
+    def repeated_shapes(self) -> List[tuple]:
+        """``(count, shape)`` of every query shape at or above the N+1 threshold, most repeated first."""
+        if not self.n_plus_one_threshold:
+            return []
+        shapes = Counter()
+        for sql, count in self._statements.items():
+            shapes[query_shape(sql)] += count
+        return [(count, shape) for shape, count in shapes.most_common() if count >= self.n_plus_one_threshold]
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} queries (budget {self.max_queries})")
+        for count, shape in self.repeated_shapes():
+            problems.append(f"likely N+1, {count}x: {shape[:300]}")
+        return problems
+
+    def check(self):
+        problems = self.violations()
+        if not problems:
+            return
+        message = f"Query budget exceeded in {self.label} ({self.duration * 1000:.1f}ms in the database): " + "; ".join(
+            problems
+        )
+        if self.raise_on_violation:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
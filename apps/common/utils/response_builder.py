@@ -7,6 +7,7 @@ from .response_utils import (
     validation_error_response,
     authentication_error_response,
     not_found_response,
+    not_modified_response,
     permission_denied_response,
 )
 
@@ -14,16 +15,27 @@ from .response_utils import (
 class ServiceResponse:
     """Universal service response class for all services"""
 
-    def __init__(self, success: bool, message: str, code: str, data=None, errors=None):
+    def __init__(self, success: bool, message: str, code: str, data=None, errors=None, headers=None):
         self.success = success
         self.message = message
         self.code = code
         self.data = data
         self.errors = errors
+        self.headers = headers or {}
 
     def to_response(self, status_code=None):
-        """Convert to HTTP response - handles all conditional logic automatically"""
+        """Convert to HTTP response and attach any headers set by the service"""
+        response = self._build_response(status_code)
+        for header, value in self.headers.items():
+            response[header] = value
+        return response
+
+    def _build_response(self, status_code=None):
+        """Build the HTTP response - handles all conditional logic automatically"""
         if self.success:
+            if self.code == StandardResponseCodes.NOT_MODIFIED:
+                return not_modified_response()
+
             # Check for created responses (201 status) - case insensitive
             code_upper = self.code.upper()
             created_patterns = ["REGISTRATION", "CREATED", "SUBMISSION_CREATED"]
@@ -43,8 +55,8 @@ class ServiceResponse:
         if self.code == StandardResponseCodes.NOT_FOUND_ERROR or "NOT_FOUND" in self.code.upper():
             return not_found_response(message=self.message, response_code=self.code)
 
-        # Handle duplicate submission with 409 status
-        if self.code == StandardResponseCodes.DUPLICATE_SUBMISSION:
+        # Handle duplicate submission and stale exam versions with 409 status
+        if self.code in [StandardResponseCodes.DUPLICATE_SUBMISSION, StandardResponseCodes.EXAM_VERSION_MISMATCH]:
             return error_response(message=self.message, response_code=self.code, status_code=409)
 
         # Use custom status code if provided, otherwise use default
@@ -58,7 +70,7 @@ class ResponseBuilder:
     """Builder for creating standardized service responses."""
 
     @staticmethod
-    def success(response_type: str, data=None):
+    def success(response_type: str, data=None, headers=None):
         """Build success response using constants from response_utils.py"""
         type_mapping = {
             "registration": (
@@ -103,12 +115,29 @@ class ResponseBuilder:
                 StandardResponseMessages.RESULTS_RETRIEVED_SUCCESSFUL,
                 StandardResponseCodes.RESULTS_RETRIEVED_SUCCESSFUL,
             ),
+            "analytics_retrieved": (
+                StandardResponseMessages.ANALYTICS_RETRIEVED_SUCCESSFUL,
+                StandardResponseCodes.ANALYTICS_RETRIEVED_SUCCESSFUL,
+            ),
+            "questions_imported": (
+                StandardResponseMessages.QUESTIONS_IMPORTED_SUCCESSFUL,
+                StandardResponseCodes.QUESTIONS_IMPORTED_SUCCESSFUL,
+            ),
+            "search_results": (
+                StandardResponseMessages.SEARCH_RESULTS_RETRIEVED,
+                StandardResponseCodes.SEARCH_RESULTS_RETRIEVED,
+            ),
+            "students_imported": (
+                StandardResponseMessages.STUDENTS_IMPORTED_SUCCESSFUL,
+                StandardResponseCodes.STUDENTS_IMPORTED_SUCCESSFUL,
+            ),
             "token_refreshed": (StandardResponseMessages.TOKEN_REFRESHED, StandardResponseCodes.TOKEN_REFRESHED),
+            "not_modified": (StandardResponseMessages.NOT_MODIFIED, StandardResponseCodes.NOT_MODIFIED),
         }
         message, code = type_mapping.get(
             response_type, (StandardResponseMessages.SUCCESS_GENERIC, StandardResponseCodes.SUCCESS_GENERIC)
         )
-        return ServiceResponse(success=True, message=message, code=code, data=data)
+        return ServiceResponse(success=True, message=message, code=code, data=data, headers=headers)
 
     @staticmethod
     def error(response_type: str, errors=None):
@@ -147,6 +176,10 @@ class ResponseBuilder:
             ),
             "exam_ended": (StandardResponseMessages.EXAM_ENDED, StandardResponseCodes.EXAM_ENDED),
             "exam_not_started": (StandardResponseMessages.EXAM_NOT_STARTED, StandardResponseCodes.EXAM_NOT_STARTED),
+            "exam_version_mismatch": (
+                StandardResponseMessages.EXAM_VERSION_MISMATCH,
+                StandardResponseCodes.EXAM_VERSION_MISMATCH,
+            ),
             "token_refresh_failed": (
                 StandardResponseMessages.TOKEN_REFRESH_FAILED,
                 StandardResponseCodes.TOKEN_REFRESH_FAILED,
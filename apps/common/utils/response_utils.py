@@ -20,6 +20,11 @@ class StandardResponseCodes:
     SUBMISSION_RETRIEVED_SUCCESSFUL = "submission_retrieved_successful"
     SUBMISSIONS_RETRIEVED_SUCCESSFUL = "submissions_retrieved_successful"
     RESULTS_RETRIEVED_SUCCESSFUL = "results_retrieved_successful"
+    ANALYTICS_RETRIEVED_SUCCESSFUL = "analytics_retrieved_successful"
+    QUESTIONS_IMPORTED_SUCCESSFUL = "questions_imported_successful"
+    SEARCH_RESULTS_RETRIEVED = "search_results_retrieved"
+    STUDENTS_IMPORTED_SUCCESSFUL = "students_imported_successful"
+    NOT_MODIFIED = "not_modified"
 
     ERROR_GENERIC = "error_generic"
     VALIDATION_ERROR = "validation_error"
@@ -37,6 +42,7 @@ class StandardResponseCodes:
     EXAM_NOT_AVAILABLE = "exam_not_available"
     EXAM_ENDED = "exam_ended"
     EXAM_NOT_STARTED = "exam_not_started"
+    EXAM_VERSION_MISMATCH = "exam_version_mismatch"
 
     # Token refresh
     TOKEN_REFRESHED = "token_refreshed"
@@ -60,6 +66,11 @@ class StandardResponseMessages:
     SUBMISSION_RETRIEVED_SUCCESSFUL = "Submission retrieved successfully"
     SUBMISSIONS_RETRIEVED_SUCCESSFUL = "Submissions retrieved successfully"
     RESULTS_RETRIEVED_SUCCESSFUL = "Results retrieved successfully"
+    ANALYTICS_RETRIEVED_SUCCESSFUL = "Exam analytics retrieved successfully"
+    QUESTIONS_IMPORTED_SUCCESSFUL = "Questions imported successfully"
+    SEARCH_RESULTS_RETRIEVED = "Search results retrieved successfully"
+    STUDENTS_IMPORTED_SUCCESSFUL = "Students imported successfully"
+    NOT_MODIFIED = "Resource not modified"
 
     ERROR_GENERIC = "An error occurred"
     VALIDATION_ERROR = "Validation failed"
@@ -77,6 +88,7 @@ class StandardResponseMessages:
     EXAM_NOT_AVAILABLE = "Exam is not currently available"
     EXAM_ENDED = "Exam has ended"
     EXAM_NOT_STARTED = "Exam has not started yet"
+    EXAM_VERSION_MISMATCH = "The exam has changed since it was loaded; reload it and answer again"
 
     # Token refresh
     TOKEN_REFRESHED = "Token refreshed successfully"
@@ -133,6 +145,11 @@ def created_response(
     )
 
 
+def not_modified_response() -> Response:
+    """Create a not modified response (304) with an empty body."""
+    return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+
 def not_found_response(
     message: str = StandardResponseMessages.NOT_FOUND_ERROR, response_code: str = StandardResponseCodes.NOT_FOUND_ERROR
 ) -> Response:
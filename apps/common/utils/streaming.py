@@ -0,0 +1,21 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: ``write`` returns the row instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class FileExportContentNegotiation(DefaultContentNegotiation):
+    """Negotiation for file export (and import) views.
+
+    These views read ``?format=`` as the file format themselves, so the query
+    parameter must not be treated as a renderer override. Envelope
+    responses (errors) are always rendered with the first configured renderer.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer = renderers[0]
+        return renderer, renderer.media_type
@@ -0,0 +1,112 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Sliding-window counter kept in the ``THROTTLE_CACHE_ALIAS`` cache.
+
+    Each client gets one counter per fixed window; the previous window's count
+    is weighted by how much of it still overlaps the sliding window. That is two
+    cache reads and one increment per request, instead of the timestamp list
+    DRF's ``SimpleRateThrottle`` reads and rewrites. Rejected requests are not
+    counted, and the rate is read from ``DEFAULT_THROTTLE_RATES`` on every
+    request under ``"<view.throttle_scope>_<kind>"``; views without a scope,
+    or scopes without a rate, are not throttled.
+    """
+
+    kind = None
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request
+        pass
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError(".get_ident_key() must be overridden")
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request, view)
+        return None if ident is None else self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def _counts(self):
+        window = int(self.now // self.duration)
+        current_key, previous_key = f"{self.key}:{window}", f"{self.key}:{window - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+        return current_key, counts.get(current_key, 0), counts.get(previous_key, 0)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        self.scope = f"{scope}_{self.kind}"
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        current_key, self.current, self.previous = self._counts()
+        overlap = 1 - (self.now % self.duration) / self.duration
+        if self.previous * overlap + self.current >= self.num_requests:
+            return self.throttle_failure()
+
+        # Kept for two windows: one as the current window, one as the previous
+        if not self.cache.add(current_key, 1, timeout=self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Expired between add() and incr()
+                self.cache.set(current_key, 1, timeout=self.duration * 2)
+        return True
+
+    def wait(self):
+        """Seconds until the sliding-window estimate drops below the limit (at least one)."""
+        elapsed = self.now % self.duration
+        if self.current < self.num_requests:
+            # The previous window's share decays as this window advances
+            wait = (1 - (self.num_requests - self.current) / self.previous) * self.duration - elapsed
+        else:
+            # This window is full on its own: wait for it to become the previous window and decay
+            wait = self.duration - elapsed + (1 - self.num_requests / self.current) * self.duration
+        return max(1.0, wait)
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Per client IP (honours ``NUM_PROXIES`` for ``X-Forwarded-For``)."""
+
+    kind = "ip"
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UserRateThrottle(SlidingWindowThrottle):
+    """Per authenticated user; anonymous requests are left to the IP throttle."""
+
+    kind = "user"
+
+    def get_ident_key(self, request, view):
+        user = request.user
+        return user.pk if user and user.is_authenticated else None
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """Per submitted account email, so one account cannot be brute-forced from many IPs."""
+
+    kind = "email"
+
+    def get_ident_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
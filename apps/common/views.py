@@ -1,3 +1,20 @@
-from django.shortcuts import render
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from apps.common.utils.metrics import Metrics, render_prometheus
 
-# Create your views here.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint, merged across all worker processes.
+
+    When ``METRICS_AUTH_TOKEN`` is set, scrapers must send it as a bearer token.
+    """
+    token = getattr(settings, "METRICS_AUTH_TOKEN", "")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    Metrics.flush()
+    return HttpResponse(render_prometheus(Metrics.collect()), content_type=PROMETHEUS_CONTENT_TYPE)
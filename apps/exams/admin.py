@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import Course, Exam, Question
+from .models import Course, Exam, ExamVersion, Question
+from .search import FullTextSearchAdminMixin
+
+
+class ExamListFilter(admin.RelatedFieldListFilter):
+    """Exam choices with their course joined in, since Exam.__str__ reads course.code."""
+
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        return [(exam.pk, str(exam)) for exam in Exam.objects.select_related("course").order_by(*ordering)]
 
 
 @admin.register(Course)
@@ -7,6 +16,7 @@ class CourseAdmin(admin.ModelAdmin):
     list_display = ["uuid", "code", "name", "instructor", "is_active"]
     list_filter = ["is_active", "created_at"]
     search_fields = ["name", "code", "instructor__email"]
+    list_select_related = ["instructor"]
     readonly_fields = ["uuid"]
 
 
@@ -15,14 +25,36 @@ class ExamAdmin(admin.ModelAdmin):
     list_display = ["uuid", "title", "course", "total_marks", "is_active", "start_time", "end_time"]
     list_filter = ["is_active", "start_time", "end_time", "created_at"]
     search_fields = ["title", "course__code", "course__name"]
+    list_select_related = ["course"]
     readonly_fields = ["uuid"]
     filter_horizontal = []
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ["uuid", "exam", "question_type", "order", "marks"]
-    list_filter = ["question_type", "exam"]
-    search_fields = ["question_text", "exam__title"]
+    list_filter = ["question_type", ("exam", ExamListFilter)]
+    # question_text is matched through the full-text index; these exactly
+    search_fields = ["uuid"]
+    search_scope = "questions"
+    # Exam.__str__ reads course.code
+    list_select_related = ["exam__course"]
     readonly_fields = ["uuid"]
     ordering = ["exam", "order"]
+
+
+@admin.register(ExamVersion)
+class ExamVersionAdmin(admin.ModelAdmin):
+    list_display = ["exam", "version", "content_hash", "created_at"]
+    list_select_related = ["exam", "exam__course"]
+    search_fields = ["exam__title", "content_hash"]
+    readonly_fields = ["exam", "version", "content_hash", "snapshot", "created_at"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
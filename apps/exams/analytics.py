@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from apps.submissions.models import Answer
+
+HISTOGRAM_BINS = 10
+PERCENTILES = (10, 25, 50, 75, 90)
+DISCRIMINATION_GROUP = 0.27  # Kelley's upper/lower 27% groups
+COMMON_WRONG_ANSWERS = 3
+
+
+class ExamAnalyticsCache:
+    """Cache of computed exam analytics, dropped on every grading event for the exam."""
+
+    KEY_PREFIX = "exam_analytics"
+
+    @classmethod
+    def _key(cls, exam_id) -> str:
+        return f"{cls.KEY_PREFIX}:{exam_id}"
+
+    @classmethod
+    def get(cls, exam_id):
+        return cache.get(cls._key(exam_id))
+
+    @classmethod
+    def set(cls, exam_id, data) -> None:
+        timeout = getattr(settings, "EXAM_ANALYTICS_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(cls._key(exam_id), data, timeout)
+
+    @classmethod
+    def invalidate(cls, exam_id) -> None:
+        cache.delete(cls._key(exam_id))
+
+
+def _round(value) -> Optional[float]:
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), 4)
+
+
+def _load_marks_matrix(exam, question_ids: np.ndarray) -> np.ndarray:
+    """Pull graded marks for the exam in a single query into a (submissions x questions) matrix."""
+    rows = list(
+        Answer.objects.filter(submission__exam_id=exam.id, submission__status="COMPLETED").values_list(
+            "submission_id", "question_id", "marks_obtained"
+        )
+    )
+    if not rows:
+        return np.zeros((0, len(question_ids)))
+
+    # Ungraded answers (marks_obtained NULL) become NaN and are scored as zero
+    data = np.array(rows, dtype=np.float64)
+    _, submission_pos = np.unique(data[:, 0], return_inverse=True)
+    question_pos = np.searchsorted(question_ids, data[:, 1])
+
+    matrix = np.zeros((submission_pos.max() + 1, len(question_ids)))
+    matrix[submission_pos, question_pos] = np.nan_to_num(data[:, 2])
+    return matrix
+
+
+def _score_distribution(percentages: np.ndarray) -> Dict:
+    counts, edges = np.histogram(percentages, bins=HISTOGRAM_BINS, range=(0, 100))
+    histogram = [
+        {"min": float(edges[i]), "max": float(edges[i + 1]), "count": int(counts[i])} for i in range(len(counts))
+    ]
+    if not len(percentages):
+        return {
+            "mean": None,
+            "median": None,
+            "std": None,
+            "min": None,
+            "max": None,
+            "percentiles": {f"p{p}": None for p in PERCENTILES},
+            "histogram": histogram,
+        }
+
+    return {
+        "mean": _round(percentages.mean()),
+        "median": _round(np.median(percentages)),
+        "std": _round(percentages.std()),
+        "min": _round(percentages.min()),
+        "max": _round(percentages.max()),
+        "percentiles": {f"p{p}": _round(v) for p, v in zip(PERCENTILES, np.percentile(percentages, PERCENTILES))},
+        "histogram": histogram,
+    }
+
+
+def _item_statistics(matrix: np.ndarray, marks: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vectorized classical item analysis over every question at once."""
+    n_submissions, n_questions = matrix.shape
+    empty = np.full(n_questions, np.nan)
+    if n_submissions == 0:
+        return {"mean_marks": empty, "difficulty": empty, "discrimination": empty, "point_biserial": empty}
+
+    safe_marks = np.where(marks > 0, marks, np.nan)
+    totals = matrix.sum(axis=1)
+    mean_marks = matrix.mean(axis=0)
+    difficulty = mean_marks / safe_marks
+
+    # Discrimination index: mean item score of the top group minus the bottom group, scaled by marks
+    discrimination = empty
+    if n_submissions >= 2:
+        group = max(1, int(round(n_submissions * DISCRIMINATION_GROUP)))
+        order = np.argsort(totals, kind="stable")
+        lower = matrix[order[:group]].mean(axis=0)
+        upper = matrix[order[-group:]].mean(axis=0)
+        discrimination = (upper - lower) / safe_marks
+
+    # Point-biserial: correlation between getting the item right and the rest-of-test score
+    correct = (matrix >= marks).astype(np.float64)
+    rest = totals[:, None] - matrix
+    correct_c = correct - correct.mean(axis=0)
+    rest_c = rest - rest.mean(axis=0)
+    denominator = np.sqrt((correct_c**2).sum(axis=0) * (rest_c**2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        point_biserial = np.where(denominator > 0, (correct_c * rest_c).sum(axis=0) / denominator, np.nan)
+
+    return {
+        "mean_marks": mean_marks,
+        "difficulty": difficulty,
+        "discrimination": discrimination,
+        "point_biserial": point_biserial,
+    }
+
+
+def _common_wrong_answers(exam) -> Dict[int, List[Dict]]:
+    rows = (
+        Answer.objects.filter(
+            submission__exam_id=exam.id,
+            submission__status="COMPLETED",
+            question__question_type="MCQ",
+            is_correct=False,
+        )
+        .values("question_id", "answer_text")
+        .annotate(count=Count("id"))
+        .order_by("question_id", "-count", "answer_text")
+    )
+    result: Dict[int, List[Dict]] = {}
+    for row in rows:
+        answers = result.setdefault(row["question_id"], [])
+        if len(answers) < COMMON_WRONG_ANSWERS:
+            answers.append({"answer": row["answer_text"], "count": row["count"]})
+    return result
+
+
+def compute_exam_analytics(exam) -> Dict:
+    """Score distribution and item analysis for all graded submissions of an exam."""
+    questions = list(exam.questions.order_by("id").values("id", "uuid", "order", "question_type", "marks"))
+    question_ids = np.array([q["id"] for q in questions], dtype=np.float64)
+    marks = np.array([float(q["marks"]) for q in questions], dtype=np.float64)
+
+    matrix = _load_marks_matrix(exam, question_ids)
+    max_total = marks.sum()
+    totals = matrix.sum(axis=1)
+    percentages = totals / max_total * 100 if max_total > 0 else np.zeros(len(totals))
+
+    items = _item_statistics(matrix, marks)
+    wrong_answers = _common_wrong_answers(exam)
+
+    question_stats = []
+    for i, question in enumerate(questions):
+        question_stats.append(
+            {
+                "id": str(question["uuid"]),
+                "order": question["order"],
+                "question_type": question["question_type"],
+                "marks": float(question["marks"]),
+                "mean_marks": _round(items["mean_marks"][i]),
+                "difficulty": _round(items["difficulty"][i]),
+                "discrimination_index": _round(items["discrimination"][i]),
+                "point_biserial": _round(items["point_biserial"][i]),
+                "common_wrong_answers": wrong_answers.get(question["id"], []),
+            }
+        )
+    question_stats.sort(key=lambda q: q["order"])
+
+    return {
+        "exam": {"id": str(exam.uuid), "title": exam.title},
+        "submission_count": int(matrix.shape[0]),
+        "score_distribution": _score_distribution(percentages),
+        "questions": question_stats,
+    }
@@ -0,0 +1,108 @@
+import math
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.utils import timezone
+
+
+class ActiveExamListCache:
+    """Cache of the serialized active-exam listing shared by all students.
+
+    The listing only changes when an exam (or its course or questions) is
+    written, or when a ``start_time``/``end_time`` boundary passes. Entries
+    therefore expire exactly at the next boundary among active exams, and
+    writes bump a generation counter so a listing computed concurrently with
+    a write can never be stored under the current key.
+    """
+
+    KEY_PREFIX = "active_exam_list"
+    GENERATION_KEY = "active_exam_list_generation"
+
+    @classmethod
+    def generation(cls) -> int:
+        """Read before computing the listing and pass to ``get``/``set``."""
+        # Seeded from the clock so an evicted counter never resurrects an old generation's entry
+        return cache.get_or_set(cls.GENERATION_KEY, time.time_ns, timeout=None)
+
+    @classmethod
+    def _key(cls, generation: int) -> str:
+        return f"{cls.KEY_PREFIX}:{generation}"
+
+    @staticmethod
+    def seconds_until_next_boundary(now=None) -> int:
+        """Seconds until an active exam opens or closes, capped by EXAM_LIST_CACHE_MAX_TIMEOUT."""
+        from .models import Exam
+
+        now = now or timezone.now()
+        max_timeout = getattr(settings, "EXAM_LIST_CACHE_MAX_TIMEOUT", 60 * 60)
+        boundaries = Exam.objects.filter(is_active=True).aggregate(
+            next_start=Min("start_time", filter=Q(start_time__gt=now)),
+            next_end=Min("end_time", filter=Q(end_time__gte=now)),
+        )
+        upcoming = [boundary for boundary in boundaries.values() if boundary is not None]
+        if not upcoming:
+            return max_timeout
+        # An exam is listed while end_time >= now, so it drops out just after its end_time
+        seconds = (min(upcoming) - now).total_seconds()
+        return max(1, min(math.ceil(seconds) + 1, max_timeout))
+
+    @classmethod
+    def get(cls, generation: int):
+        return cache.get(cls._key(generation))
+
+    @classmethod
+    def set(cls, generation: int, data, computed_at=None) -> None:
+        """Store ``data``; ``computed_at`` (taken before querying) keeps the TTL conservative."""
+        cache.set(cls._key(generation), data, cls.seconds_until_next_boundary(computed_at))
+
+    @classmethod
+    def invalidate(cls) -> None:
+        try:
+            cache.incr(cls.GENERATION_KEY)
+        except ValueError:
+            cache.set(cls.GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+class ExamDetailCache:
+    """Serialized exam payloads keyed by uuid and ``updated_at``, built by one worker at a time.
+
+    When an exam opens, every student requests it within seconds. The first
+    request to miss takes a short lock with ``cache.add`` and builds the payload;
+    the others poll for the result instead of hitting the database, falling back
+    to building it themselves if the builder does not finish in time.
+    """
+
+    KEY_PREFIX = "exam_detail"
+    POLL_INTERVAL = 0.05
+
+    @classmethod
+    def _key(cls, exam_uuid, updated_at, variant=None) -> str:
+        key = f"{cls.KEY_PREFIX}:{exam_uuid}:{updated_at.timestamp()}"
+        return key if variant is None else f"{key}:{variant}"
+
+    @classmethod
+    def get_or_build(cls, exam_uuid, updated_at, build, variant=None):
+        """``variant`` separates payloads of the same exam, e.g. one per shuffle bucket."""
+        key = cls._key(exam_uuid, updated_at, variant)
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+        lock_key = f"{key}:lock"
+        wait = getattr(settings, "EXAM_DETAIL_BUILD_WAIT", 5)
+        if not cache.add(lock_key, 1, timeout=math.ceil(wait) + 1):
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                time.sleep(cls.POLL_INTERVAL)
+                data = cache.get(key)
+                if data is not None:
+                    return data
+            return build()
+
+        try:
+            data = build()
+            cache.set(key, data, getattr(settings, "EXAM_DETAIL_CACHE_TIMEOUT", 60 * 60))
+            return data
+        finally:
+            cache.delete(lock_key)
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from apps.exams.models import Exam, Question
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag exams whose total_marks differs from the sum of their question marks, "
+        "and exams whose denormalized question totals have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix", action="store_true", help="Recompute drifted question_count/question_marks_total values."
+        )
+
+    def handle(self, *args, **options):
+        questions = Question.objects.filter(exam=OuterRef("pk")).order_by().values("exam")
+        exams = (
+            Exam.objects.annotate(
+                actual_count=Coalesce(Subquery(questions.annotate(n=Count("id")).values("n")), Value(0)),
+                actual_marks=Coalesce(
+                    Subquery(questions.annotate(total=Sum("marks")).values("total")),
+                    Value(0),
+                    output_field=DecimalField(max_digits=8, decimal_places=2),
+                ),
+            )
+            .only("id", "uuid", "title", "total_marks", "question_count", "question_marks_total")
+            .order_by("id")
+        )
+
+        mismatched = drifted = 0
+        for exam in exams.iterator():
+            if exam.question_count != exam.actual_count or exam.question_marks_total != exam.actual_marks:
+                drifted += 1
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{exam.uuid} {exam.title!r}: stored totals {exam.question_count} questions / "
+                        f"{exam.question_marks_total:.2f} marks, actual {exam.actual_count} / {exam.actual_marks:.2f}"
+                    )
+                )
+                if options["fix"]:
+                    exam.refresh_question_totals()
+
+            if exam.total_marks != exam.actual_marks:
+                mismatched += 1
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"{exam.uuid} {exam.title!r}: total_marks {exam.total_marks:.2f} "
+                        f"!= sum of question marks {exam.actual_marks:.2f}"
+                    )
+                )
+
+        summary = f"{mismatched} exams with mismatched total_marks, {drifted} with drifted question totals"
+        if options["fix"] and drifted:
+            summary += " (fixed)"
+        self.stdout.write(self.style.SUCCESS(summary + "."))
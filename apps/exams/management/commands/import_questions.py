@@ -0,0 +1,45 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.exams.models import Exam
+from apps.exams.question_bank import IMPORT_CHUNK_SIZE
+from apps.exams.services import ExamService
+
+
+class Command(BaseCommand):
+    help = "Append questions from a JSONL file (one question object per line) to an exam."
+
+    def add_arguments(self, parser):
+        parser.add_argument("exam_uuid", help="Exam to import into.")
+        parser.add_argument("path", help="JSONL file, or '-' for stdin.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per bulk insert.")
+        parser.add_argument(
+            "--skip-invalid", action="store_true", help="Import valid lines even if some lines are invalid."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            exam = Exam.objects.get(uuid=options["exam_uuid"])
+        except (Exam.DoesNotExist, ValueError):
+            raise CommandError(f"Exam {options['exam_uuid']} not found")
+
+        try:
+            source = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8")
+        except OSError as e:
+            raise CommandError(str(e))
+
+        with source:
+            summary = ExamService.import_question_bank(
+                exam, source, skip_invalid=options["skip_invalid"], chunk_size=options["chunk_size"]
+            )
+
+        for error in summary["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        if summary["skipped"] and not options["skip_invalid"]:
+            raise CommandError(f"{summary['skipped']} invalid lines; nothing was imported.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {summary['created']} questions from {summary['lines']} lines "
+                f"({summary['skipped']} skipped)."
+            )
+        )
@@ -0,0 +1,37 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.exams.cache import ExamDetailCache
+from apps.exams.models import Exam
+from apps.exams.services import ExamService
+
+
+class Command(BaseCommand):
+    help = "Pre-build cached exam payloads for active exams starting in the next N minutes (run from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--minutes", type=int, default=15, help="Look-ahead window in minutes (default 15).")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        exams = Exam.objects.filter(
+            is_active=True, start_time__gte=now, start_time__lte=now + timedelta(minutes=options["minutes"])
+        ).values_list("uuid", "updated_at", "shuffle_questions", "shuffle_options")
+
+        warmed = 0
+        for exam_uuid, updated_at, *shuffle_flags in exams.iterator():
+            # Shuffled exams are cached once per seed bucket
+            buckets = range(getattr(settings, "EXAM_SHUFFLE_BUCKETS", 64)) if any(shuffle_flags) else [None]
+            for bucket in buckets:
+                ExamDetailCache.get_or_build(
+                    exam_uuid,
+                    updated_at,
+                    lambda: ExamService.build_exam_detail(exam_uuid, bucket),
+                    variant=bucket,
+                )
+            warmed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Warmed {warmed} exams starting in the next {options['minutes']} minutes.")
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0002_exam_grading_plan_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExamVersion",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("version", models.PositiveIntegerField()),
+                ("content_hash", models.CharField(max_length=64)),
+                ("snapshot", models.JSONField()),
+                (
+                    "exam",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="versions", to="exams.exam"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "exam_versions",
+                "ordering": ["exam", "-version"],
+                "unique_together": {("exam", "version")},
+            },
+        ),
+    ]
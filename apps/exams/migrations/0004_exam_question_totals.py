@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_question_totals(apps, schema_editor):
+    Exam = apps.get_model("exams", "Exam")
+    Question = apps.get_model("exams", "Question")
+    questions = Question.objects.filter(exam=OuterRef("pk")).order_by().values("exam")
+    Exam.objects.update(
+        question_count=Coalesce(Subquery(questions.annotate(n=Count("id")).values("n")), Value(0)),
+        question_marks_total=Coalesce(Subquery(questions.annotate(total=Sum("marks")).values("total")), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0003_exam_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exam",
+            name="question_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="exam",
+            name="question_marks_total",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=8),
+        ),
+        migrations.RunPython(backfill_question_totals, migrations.RunPython.noop),
+    ]
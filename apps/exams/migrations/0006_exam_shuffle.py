@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0005_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exam",
+            name="shuffle_options",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="exam",
+            name="shuffle_questions",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,5 +1,9 @@
+import hashlib
+import json
 import uuid
+from decimal import Decimal
 from django.db import models
+from django.db.models import Count, Sum
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.conf import settings
@@ -43,9 +47,17 @@ class Exam(TimestampMixin):
     end_time = models.DateTimeField(null=True, blank=True, db_index=True)
     is_active = models.BooleanField(default=True, db_index=True)
     instructions = models.TextField(blank=True)
+    # Per-student orderings are derived, never stored; see apps.exams.shuffle
+    shuffle_questions = models.BooleanField(default=False)
+    shuffle_options = models.BooleanField(default=False)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="created_exams"
     )
+    # Content hash of the compiled grading plan (see apps.submissions.grading.plan)
+    grading_plan_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+    # Denormalized from questions; see refresh_question_totals()
+    question_count = models.PositiveIntegerField(default=0, editable=False)
+    question_marks_total = models.DecimalField(max_digits=8, decimal_places=2, default=0, editable=False)
 
     class Meta:
         db_table = "exams"
@@ -71,6 +83,18 @@ class Exam(TimestampMixin):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    def refresh_question_totals(self, **fields):
+        """Recompute and persist question_count and question_marks_total from the questions table.
+
+        Extra ``fields`` are written in the same UPDATE.
+        """
+        totals = Question.objects.filter(exam_id=self.pk).aggregate(count=Count("id"), marks=Sum("marks"))
+        self.question_count = totals["count"]
+        self.question_marks_total = totals["marks"] or Decimal("0")
+        Exam.objects.filter(pk=self.pk).update(
+            question_count=self.question_count, question_marks_total=self.question_marks_total, **fields
+        )
+
     def __str__(self):
         return f"{self.title} - {self.course.code}"
 
@@ -118,3 +142,50 @@ class Question(TimestampMixin):
 
     def __str__(self):
         return f"Q{self.order}: {self.question_text[:50]}"
+
+
+class ExamVersion(TimestampMixin):
+    """Immutable snapshot of an exam's questions and rubrics, referenced by the submissions taken against it."""
+
+    SNAPSHOT_FIELDS = (
+        "id",
+        "uuid",
+        "order",
+        "question_text",
+        "question_type",
+        "marks",
+        "options",
+        "correct_answer",
+        "grading_rubric",
+        "case_sensitive",
+    )
+
+    id = models.AutoField(primary_key=True)
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="versions", db_index=True)
+    version = models.PositiveIntegerField()
+    content_hash = models.CharField(max_length=64)
+    snapshot = models.JSONField()
+
+    class Meta:
+        db_table = "exam_versions"
+        unique_together = [["exam", "version"]]
+        ordering = ["exam", "-version"]
+
+    @classmethod
+    def build_snapshot(cls, exam):
+        """Serialize the exam's current questions; returns ``(snapshot, content_hash)``."""
+        questions = [
+            {**row, "uuid": str(row["uuid"]), "marks": str(row["marks"])}
+            for row in exam.questions.order_by("order").values(*cls.SNAPSHOT_FIELDS)
+        ]
+        snapshot = {"questions": questions}
+        payload = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+        return snapshot, hashlib.sha256(payload.encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValidationError("Exam versions are immutable")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.exam.title} v{self.version}"
@@ -0,0 +1,150 @@
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from rest_framework import serializers
+from .models import Question
+
+QUESTION_BANK_FIELDS = [
+    "question_text",
+    "question_type",
+    "marks",
+    "order",
+    "options",
+    "correct_answer",
+    "grading_rubric",
+    "case_sensitive",
+]
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+
+class QuestionBankLineSerializer(serializers.ModelSerializer):
+    """One JSONL line of a question bank; ``order`` defaults to the next free position."""
+
+    order = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta:
+        model = Question
+        fields = QUESTION_BANK_FIELDS
+
+    def validate(self, attrs):
+        if attrs["question_type"] == "MCQ":
+            if not attrs.get("options"):
+                raise serializers.ValidationError({"options": ["MCQ questions must have options."]})
+            if not attrs.get("correct_answer"):
+                raise serializers.ValidationError({"correct_answer": ["MCQ questions must have a correct_answer."]})
+        return attrs
+
+
+def _decode(line) -> str:
+    return line.decode("utf-8") if isinstance(line, bytes) else line
+
+
+def _parse_line(text: str):
+    """``(payload, errors)`` for one non-blank JSONL line."""
+    try:
+        return json.loads(text), None
+    except ValueError as e:
+        return None, {"json": [str(e)]}
+
+
+class _QuestionImport:
+    """State of one import: the exam's used orders, the pending chunk and the summary."""
+
+    def __init__(self, exam, chunk_size: int, skip_invalid: bool):
+        self.exam = exam
+        self.chunk_size = chunk_size
+        self.skip_invalid = skip_invalid
+        self.summary = {"lines": 0, "created": 0, "skipped": 0, "errors": []}
+        self.used_orders = set(Question.objects.filter(exam=exam).values_list("order", flat=True))
+        self.highest_order = max(self.used_orders, default=0)
+        self.chunk = []
+
+    @property
+    def failed(self) -> bool:
+        """True once an invalid line means the whole import will be rolled back."""
+        return bool(self.summary["skipped"]) and not self.skip_invalid
+
+    def validate(self, payload):
+        """``(data, errors)``; valid data has its ``order`` resolved and reserved."""
+        serializer = QuestionBankLineSerializer(data=payload)
+        if not serializer.is_valid():
+            return None, serializer.errors
+        data = dict(serializer.validated_data)
+        order = data.pop("order", None) or self.highest_order + 1
+        if order in self.used_orders:
+            return None, {"order": [f"Order {order} is already used in this exam."]}
+        self.used_orders.add(order)
+        self.highest_order = max(self.highest_order, order)
+        data["order"] = order
+        return data, None
+
+    def reject(self, line_number: int, errors) -> None:
+        if not self.skip_invalid:
+            # The import will be rolled back, so stop inserting and only keep validating
+            self.chunk.clear()
+        self.summary["skipped"] += 1
+        if len(self.summary["errors"]) < MAX_REPORTED_ERRORS:
+            self.summary["errors"].append({"line": line_number, "errors": errors})
+
+    def insert(self, data) -> None:
+        if self.failed:
+            return
+        self.chunk.append(Question(exam=self.exam, **data))
+        if len(self.chunk) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        Question.objects.bulk_create(self.chunk)
+        self.summary["created"] += len(self.chunk)
+        self.chunk.clear()
+
+    def add_line(self, line_number: int, raw) -> None:
+        text = _decode(raw).strip()
+        if not text:
+            return
+        self.summary["lines"] += 1
+        payload, errors = _parse_line(text)
+        if errors is None:
+            data, errors = self.validate(payload)
+        if errors is not None:
+            self.reject(line_number, errors)
+        else:
+            self.insert(data)
+
+
+def import_question_lines(exam, lines: Iterable, chunk_size: int = IMPORT_CHUNK_SIZE, skip_invalid: bool = False):
+    """Validate JSONL question lines one at a time and insert them with chunked ``bulk_create``.
+
+    Only one chunk of Question objects is held in memory. Unless ``skip_invalid``
+    is set, any invalid line rolls back the whole import; either way every bad
+    line is reported (up to ``MAX_REPORTED_ERRORS``). Returns a summary dict.
+    """
+    state = _QuestionImport(exam, chunk_size, skip_invalid)
+    with transaction.atomic():
+        for line_number, raw in enumerate(lines, start=1):
+            state.add_line(line_number, raw)
+        if state.chunk:
+            state.flush()
+        if state.failed:
+            transaction.set_rollback(True)
+            state.summary["created"] = 0
+    return state.summary
+
+
+def iter_question_bank(exam, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[Dict]:
+    questions = Question.objects.filter(exam=exam).order_by("order").values("uuid", *QUESTION_BANK_FIELDS)
+    for row in questions.iterator(chunk_size=chunk_size):
+        yield {"id": str(row.pop("uuid")), **row}
+
+
+def stream_question_bank(exam, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the exam's questions as JSONL, batching lines to keep the number of writes low."""
+    rows = iter_question_bank(exam, chunk_size)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        yield "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in batch)
@@ -0,0 +1,268 @@
+"""Full-text search over question text and answers.
+
+SQLite databases get FTS5 external-content tables kept in sync by triggers;
+PostgreSQL gets GIN indexes over ``to_tsvector`` expressions. Which one is used
+follows the database configured through ``DB_ENGINE``. Other backends fall back
+to unranked ``icontains`` filtering.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+from django.core.exceptions import ValidationError
+from django.db import connection as default_connection
+from django.db.models import BooleanField, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+
+SEARCH_SCOPES: Dict[str, Dict] = {
+    "questions": {"table": "questions", "columns": ["question_text"]},
+    "answers": {"table": "answers", "columns": ["answer_text", "feedback"]},
+}
+
+# Joins from each searchable table to the owning course, for per-instructor filtering
+_OWNER_JOINS = {
+    "questions": 'JOIN "exams" e ON e.id = t.exam_id JOIN "courses" c ON c.id = e.course_id',
+    "answers": (
+        'JOIN "questions" q ON q.id = t.question_id '
+        'JOIN "exams" e ON e.id = q.exam_id JOIN "courses" c ON c.id = e.course_id'
+    ),
+}
+
+_TERM_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+
+class SearchBackend:
+    """Unindexed fallback: ``icontains`` on every searched column, unranked."""
+
+    vendor = None
+
+    def install(self, connection):
+        pass
+
+    def uninstall(self, connection):
+        pass
+
+    def condition(self, scope: str, query: str):
+        columns = SEARCH_SCOPES[scope]["columns"]
+        condition = Q()
+        for column in columns:
+            condition |= Q(**{f"{column}__icontains": query})
+        return condition
+
+    def ranked_ids(
+        self, scope: str, query: str, limit: int, offset: int, instructor_id: Optional[int] = None
+    ) -> Tuple[int, List[Tuple[int, float]]]:
+        """Return ``(total, [(row id, rank), ...])`` for one page, best match first."""
+        model = search_model(scope)
+        queryset = model.objects.filter(self.condition(scope, query))
+        if instructor_id is not None:
+            owner = "exam__course__instructor_id" if scope == "questions" else "question__exam__course__instructor_id"
+            queryset = queryset.filter(**{owner: instructor_id})
+        ids = queryset.order_by("-id").values_list("id", flat=True)
+        return ids.count(), [(row_id, 0.0) for row_id in ids[offset : offset + limit]]
+
+    def _ranked_sql(self, scope, rank_sql, rank_params, where_sql, where_params, limit, offset, instructor_id, join=""):
+        """Run the count query and one page of the ranked query against the raw tables."""
+        table = SEARCH_SCOPES[scope]["table"]
+        where_params = list(where_params)
+        if instructor_id is not None:
+            join = f"{join} {_OWNER_JOINS[scope]}"
+            where_sql = f"{where_sql} AND c.instructor_id = %s"
+            where_params.append(instructor_id)
+
+        base = f'FROM "{table}" t {join} WHERE {where_sql}'
+        with default_connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) {base}", where_params)
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT t.id, {rank_sql} AS search_rank {base} "
+                "ORDER BY search_rank DESC, t.id DESC LIMIT %s OFFSET %s",
+                [*rank_params, *where_params, limit, offset],
+            )
+            return total, [(row_id, float(rank)) for row_id, rank in cursor.fetchall()]
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    vendor = "sqlite"
+
+    @staticmethod
+    def fts_table(scope: str) -> str:
+        return f"{SEARCH_SCOPES[scope]['table']}_fts"
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        """Quote every term so user input can never be parsed as FTS5 syntax; "quoted phrases" stay phrases."""
+        terms = [phrase or word for phrase, word in _TERM_RE.findall(query)]
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            for scope, config in SEARCH_SCOPES.items():
+                table, fts, columns = config["table"], self.fts_table(scope), config["columns"]
+                column_list = ", ".join(columns)
+                new_values = ", ".join(f"new.{column}" for column in columns)
+                old_values = ", ".join(f"old.{column}" for column in columns)
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                    f"{column_list}, content='{table}', content_rowid='id', tokenize='porter unicode61')"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                    f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+                    f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+                )
+                # Index rows that existed before the table was created
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            for scope in SEARCH_SCOPES:
+                fts = self.fts_table(scope)
+                for suffix in ("ai", "ad", "au"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+    def condition(self, scope: str, query: str):
+        fts = self.fts_table(scope)
+        table = SEARCH_SCOPES[scope]["table"]
+        return RawSQL(
+            f'"{table}"."id" IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)',
+            [self.match_expression(query)],
+            output_field=BooleanField(),
+        )
+
+    def ranked_ids(self, scope, query, limit, offset, instructor_id=None):
+        fts = self.fts_table(scope)
+        match = self.match_expression(query)
+        if not match:
+            return 0, []
+        # bm25() is lower for better matches
+        return self._ranked_sql(
+            scope,
+            f"-bm25({fts})",
+            [],
+            f"{fts} MATCH %s",
+            [match],
+            limit,
+            offset,
+            instructor_id,
+            join=f"JOIN {fts} ON {fts}.rowid = t.id",
+        )
+
+
+class PostgresTsvectorBackend(SearchBackend):
+    vendor = "postgresql"
+    CONFIG = "english"
+
+    def _document(self, scope: str, alias: str) -> str:
+        columns = SEARCH_SCOPES[scope]["columns"]
+        text = " || ' ' || ".join(f"coalesce({alias}.{column}, '')" for column in columns)
+        return f"to_tsvector('{self.CONFIG}', {text})"
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            for scope, config in SEARCH_SCOPES.items():
+                table = config["table"]
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {table}_fts_idx ON "{table}" '
+                    f"USING GIN (({self._document(scope, table)}))"
+                )
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            for config in SEARCH_SCOPES.values():
+                cursor.execute(f"DROP INDEX IF EXISTS {config['table']}_fts_idx")
+
+    def condition(self, scope: str, query: str):
+        table = SEARCH_SCOPES[scope]["table"]
+        return RawSQL(
+            f"{self._document(scope, table)} @@ websearch_to_tsquery('{self.CONFIG}', %s)",
+            [query],
+            output_field=BooleanField(),
+        )
+
+    def ranked_ids(self, scope, query, limit, offset, instructor_id=None):
+        # Must match the indexed expression exactly for the GIN index to be used
+        document = self._document(scope, "t")
+        tsquery = f"websearch_to_tsquery('{self.CONFIG}', %s)"
+        return self._ranked_sql(
+            scope,
+            f"ts_rank({document}, {tsquery})",
+            [query],
+            f"{document} @@ {tsquery}",
+            [query],
+            limit,
+            offset,
+            instructor_id,
+        )
+
+
+_BACKENDS = {backend.vendor: backend for backend in (SQLiteFTS5Backend(), PostgresTsvectorBackend())}
+
+
+def get_backend(connection=None) -> SearchBackend:
+    connection = connection or default_connection
+    return _BACKENDS.get(connection.vendor, SearchBackend())
+
+
+def install(connection=None):
+    """Create the search index for the configured database (idempotent)."""
+    connection = connection or default_connection
+    get_backend(connection).install(connection)
+
+
+def uninstall(connection=None):
+    connection = connection or default_connection
+    get_backend(connection).uninstall(connection)
+
+
+def search_model(scope: str):
+    from apps.submissions.models import Answer
+    from .models import Question
+
+    return {"questions": Question, "answers": Answer}[scope]
+
+
+def _exact_value(model, path: str, term: str):
+    """``term`` as a value of the field at ``path``, or None when it cannot be one (e.g. not a uuid)."""
+    opts = model._meta
+    for name in path.split(LOOKUP_SEP):
+        field = opts.get_field(name)
+        if field.is_relation:
+            opts = field.related_model._meta
+    try:
+        return field.to_python(term)
+    except ValidationError:
+        return None
+
+
+class FullTextSearchAdminMixin:
+    """Admin search that matches ``search_scope`` through the full-text index.
+
+    Text is only ever matched through the index. ``search_fields`` name
+    indexed columns (``uuid``, a related user's ``email``) that are compared
+    exactly to the whole search term instead of with ``icontains``; rows
+    matching any of them are added to the results.
+    """
+
+    search_scope = None
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        condition = Q(get_backend().condition(self.search_scope, search_term))
+        for path in self.get_search_fields(request):
+            value = _exact_value(queryset.model, path, search_term)
+            if value is not None:
+                condition |= Q(**{path: value})
+        # Only forward relations are followed, so no row can match twice
+        return queryset.filter(condition), False
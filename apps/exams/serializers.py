@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Course, Exam, Question
+from .shuffle import shuffle_exam_payload
 
 
 class CourseSerializer(serializers.ModelSerializer):
@@ -13,18 +14,18 @@ class CourseSerializer(serializers.ModelSerializer):
 
 
 class QuestionSerializer(serializers.ModelSerializer):
-    id = serializers.UUIDField(source="uuid", read_only=True)
+    # Writable so exam updates can address existing questions; ignored on create
+    id = serializers.UUIDField(source="uuid", required=False)
 
     class Meta:
         model = Question
         fields = ["id", "question_text", "question_type", "marks", "order", "options", "grading_rubric"]
-        read_only_fields = ["id"]
 
 
 class ExamListSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source="uuid", read_only=True)
     course = CourseSerializer(read_only=True)
-    question_count = serializers.SerializerMethodField()
+    question_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Exam
@@ -42,9 +43,6 @@ class ExamListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id"]
 
-    def get_question_count(self, obj) -> int:
-        return obj.questions.count()
-
 
 class ExamDetailSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source="uuid", read_only=True)
@@ -67,10 +65,20 @@ class ExamDetailSerializer(serializers.ModelSerializer):
             "end_time",
             "instructions",
             "is_active",
+            "shuffle_questions",
+            "shuffle_options",
             "questions",
         ]
         read_only_fields = ["id", "course"]
 
+    def to_representation(self, instance):
+        """Apply the student's shuffle when the view passes a ``shuffle_seed`` in the context."""
+        data = super().to_representation(instance)
+        seed = self.context.get("shuffle_seed")
+        if seed is None:
+            return data
+        return shuffle_exam_payload(data, seed, instance.shuffle_questions, instance.shuffle_options)
+
     def validate(self, attrs):
         """Validate exam data."""
         if attrs.get("passing_marks") and attrs.get("total_marks"):
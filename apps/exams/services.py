@@ -1,8 +1,14 @@
-from django.db.models import Prefetch, Q
-from django.db import transaction
+from django.db.models import Max, Prefetch, Q
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from apps.common.utils.response_builder import ResponseBuilder
-from .models import Exam, Question, Course
+from .models import Exam, ExamVersion, Question, Course
+from apps.submissions.grading.plan import GradingPlanStore
+from .analytics import ExamAnalyticsCache, compute_exam_analytics
+from .cache import ActiveExamListCache, ExamDetailCache
+from .shuffle import seed_bucket, shuffle_seed
 from .serializers import ExamListSerializer, ExamDetailSerializer, CourseSerializer
+from .signals import PendingExamSync
 
 
 class CourseService:
@@ -33,6 +39,8 @@ class CourseService:
 
 
 class ExamService:
+    QUESTION_REQUIRED_FIELDS = ("question_text", "question_type", "marks", "order")
+
     @staticmethod
     def get_exam_by_uuid(exam_uuid: str):
         try:
@@ -43,10 +51,22 @@ class ExamService:
     @staticmethod
     def get_exam_with_questions(exam_uuid: str):
         try:
-            return Exam.objects.prefetch_related("questions").select_related("course", "created_by").get(uuid=exam_uuid)
+            return (
+                Exam.objects.prefetch_related("questions")
+                .select_related("course__instructor", "created_by")
+                .get(uuid=exam_uuid)
+            )
         except Exam.DoesNotExist:
             raise ValueError("Exam not found")
 
+    @staticmethod
+    def get_exam_for_instructor(exam_uuid: str, instructor):
+        """Get an exam owned by the instructor; raises PermissionError for other instructors' exams."""
+        exam = ExamService.get_exam_by_uuid(exam_uuid)
+        if exam.course.instructor_id != instructor.pk and instructor.role != "ADMIN":
+            raise PermissionError("Exam belongs to another instructor")
+        return exam
+
     @staticmethod
     def get_active_exams_for_student(student):
         """Get active exams available for students."""
@@ -58,28 +78,57 @@ class ExamService:
             .filter(
                 Q(start_time__isnull=True) | Q(start_time__lte=now), Q(end_time__isnull=True) | Q(end_time__gte=now)
             )
-            .select_related("course")
-            .prefetch_related("questions")
+            # CourseSerializer reads course.instructor.uuid
+            .select_related("course__instructor")
             .order_by("-created_at")
         )
 
     @staticmethod
     def list_exams(student):
         try:
-            exams = ExamService.get_active_exams_for_student(student)
-            serializer = ExamListSerializer(exams, many=True)
-            return ResponseBuilder.success(
-                "exams_retrieved", data={"count": len(serializer.data), "results": serializer.data}
-            )
+            # The listing is the same for every student, so one cached copy serves all
+            generation = ActiveExamListCache.generation()
+            results = ActiveExamListCache.get(generation)
+            if results is None:
+                computed_at = timezone.now()
+                exams = ExamService.get_active_exams_for_student(student)
+                results = ExamListSerializer(exams, many=True).data
+                ActiveExamListCache.set(generation, results, computed_at)
+            return ResponseBuilder.success("exams_retrieved", data={"count": len(results), "results": results})
         except Exception as e:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
 
     @staticmethod
-    def get_exam_detail(exam_uuid: str):
+    def build_exam_detail(exam_uuid: str, bucket: int = None):
+        """Serialized exam; with a shuffle ``bucket`` the questions are ordered for that bucket's students.
+
+        A shuffled payload carries the ``version`` it was shuffled with, which the
+        student sends back as ``exam_version`` so answers are mapped with the same permutation.
+        """
+        exam = ExamService.get_exam_with_questions(exam_uuid)
+        if bucket is None:
+            return ExamDetailSerializer(exam).data
+        version = ExamVersionService.current(exam)
+        context = {"shuffle_seed": shuffle_seed(exam.uuid, version.version, bucket)}
+        return {**ExamDetailSerializer(exam, context=context).data, "version": version.version}
+
+    @staticmethod
+    def get_exam_detail(exam_uuid: str, student=None):
         try:
-            exam = ExamService.get_exam_with_questions(exam_uuid)
-            serializer = ExamDetailSerializer(exam)
-            return ResponseBuilder.success("exam_retrieved", data=serializer.data)
+            row = (
+                Exam.objects.filter(uuid=exam_uuid)
+                .values_list("updated_at", "shuffle_questions", "shuffle_options")
+                .first()
+            )
+            if row is None:
+                return ResponseBuilder.error("exam_not_found")
+
+            updated_at, *shuffle_flags = row
+            bucket = seed_bucket(student.uuid) if student is not None and any(shuffle_flags) else None
+            data = ExamDetailCache.get_or_build(
+                exam_uuid, updated_at, lambda: ExamService.build_exam_detail(exam_uuid, bucket), variant=bucket
+            )
+            return ResponseBuilder.success("exam_retrieved", data=data)
         except ValueError:
             return ResponseBuilder.error("exam_not_found")
         except Exception as e:
@@ -114,10 +163,12 @@ class ExamService:
             # Bulk create questions
             question_objects = []
             for q_data in questions_data:
+                q_data.pop("uuid", None)
                 question_objects.append(Question(exam=exam, **q_data))
 
             if question_objects:
                 Question.objects.bulk_create(question_objects)
+            ExamService._on_questions_changed(exam)
 
             # Reload with questions
             exam.refresh_from_db()
@@ -127,6 +178,133 @@ class ExamService:
         except Exception as e:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
 
+    @staticmethod
+    def _on_questions_changed(exam):
+        """Refresh state derived from an exam's questions: totals, version snapshot, analytics and grading plan.
+
+        Bulk writes send no signals, so ``updated_at`` is bumped here to move cached detail payloads on.
+        """
+        exam.updated_at = timezone.now()
+        exam.refresh_question_totals(updated_at=exam.updated_at)
+        PendingExamSync.discard(exam.id)
+        ExamVersionService.publish(exam)
+        ExamAnalyticsCache.invalidate(exam.id)
+        transaction.on_commit(ActiveExamListCache.invalidate)
+        GradingPlanStore.compile(exam)
+
+    @staticmethod
+    def _match_questions(existing: list, questions_data: list):
+        """Pair incoming question payloads (by index) with existing questions, by uuid first and then by order."""
+        by_uuid = {question.uuid: question for question in existing}
+        matched = {}
+        claimed = set()
+        errors = {}
+
+        # Explicit uuids win over order so renumbering never rebinds a question
+        for index, item in enumerate(questions_data):
+            if item.get("uuid") is None:
+                continue
+            question = by_uuid.get(item["uuid"])
+            if question is None:
+                errors[index] = {"id": ["Question does not belong to this exam."]}
+            elif question.id in claimed:
+                errors[index] = {"id": ["Question is listed more than once."]}
+            else:
+                matched[index] = question
+                claimed.add(question.id)
+
+        by_order = {question.order: question for question in existing if question.id not in claimed}
+        for index, item in enumerate(questions_data):
+            if item.get("uuid") is None and item.get("order") in by_order:
+                matched[index] = by_order.pop(item["order"])
+
+        final_orders = [
+            item.get("order", getattr(matched.get(index), "order", None)) for index, item in enumerate(questions_data)
+        ]
+        final_orders = [order for order in final_orders if order is not None]
+        if len(final_orders) != len(set(final_orders)):
+            errors["order"] = ["Question orders must be unique."]
+        return matched, errors
+
+    @staticmethod
+    def _diff_questions(exam, questions_data: list) -> dict:
+        """Classify incoming questions against the exam's current ones without touching the database.
+
+        Returns ``{"create": [...], "update": [(question, changed_fields)], "delete": [...],
+        "unchanged": n, "errors": {...}}``.
+        """
+        existing = list(Question.objects.filter(exam=exam))
+        matched, errors = ExamService._match_questions(existing, questions_data)
+
+        create, update, unchanged = [], [], 0
+        for index, item in enumerate(questions_data):
+            if index in errors:
+                continue
+            fields = {key: value for key, value in item.items() if key != "uuid"}
+            question = matched.get(index)
+            if question is None:
+                missing = [name for name in ExamService.QUESTION_REQUIRED_FIELDS if name not in fields]
+                if missing:
+                    errors[index] = {name: ["This field is required."] for name in missing}
+                else:
+                    create.append(fields)
+                continue
+
+            changed = {key: value for key, value in fields.items() if getattr(question, key) != value}
+            if changed:
+                update.append((question, changed))
+            else:
+                unchanged += 1
+
+        matched_ids = {question.id for question in matched.values()}
+        delete = [question for question in existing if question.id not in matched_ids]
+        return {"create": create, "update": update, "delete": delete, "unchanged": unchanged, "errors": errors}
+
+    @staticmethod
+    def _reorder_questions(exam, moving: list):
+        """Write new orders for ``moving`` without tripping the per-row (exam, order) unique check."""
+        # Park moved questions above every current and target order before writing their final positions
+        current_max = Question.objects.filter(exam=exam).aggregate(Max("order"))["order__max"] or 0
+        offset = max([current_max] + [question.order for question in moving]) + 1
+        final_orders = {question.id: question.order for question in moving}
+        for position, question in enumerate(moving):
+            question.order = offset + position
+        Question.objects.bulk_update(moving, ["order"])
+        for question in moving:
+            question.order = final_orders[question.id]
+
+    @staticmethod
+    def _apply_question_diff(exam, diff: dict) -> dict:
+        """Write a question diff with bulk queries and return per-kind counts."""
+        if diff["delete"]:
+            Question.objects.filter(id__in=[question.id for question in diff["delete"]]).delete()
+
+        updated = [question for question, _ in diff["update"]]
+        moving = [question for question, changed in diff["update"] if "order" in changed]
+        changed_fields = set()
+        for question, changed in diff["update"]:
+            for key, value in changed.items():
+                setattr(question, key, value)
+            changed_fields.update(changed)
+
+        if moving:
+            ExamService._reorder_questions(exam, moving)
+
+        if updated:
+            Question.objects.bulk_update(updated, sorted(changed_fields))
+        if diff["create"]:
+            Question.objects.bulk_create([Question(exam=exam, **fields) for fields in diff["create"]])
+
+        changes = {
+            "created": len(diff["create"]),
+            "updated": len(updated),
+            "deleted": len(diff["delete"]),
+            "unchanged": diff["unchanged"],
+        }
+        if changes["created"] or changes["updated"] or changes["deleted"]:
+            ExamService._on_questions_changed(exam)
+        return changes
+
     @staticmethod
     @transaction.atomic
     def update_exam(exam_uuid: str, data: dict, updated_by):
@@ -155,33 +333,256 @@ class ExamService:
                 except Course.DoesNotExist:
                     return ResponseBuilder.error("not_found", errors={"course_uuid": ["Course not found."]})
 
-            # Handle questions update if provided
+            # Diff questions before writing anything so a bad payload leaves the exam untouched
             questions_data = serializer.validated_data.pop("questions", None)
+            question_diff = None
+            if questions_data is not None:
+                question_diff = ExamService._diff_questions(exam, questions_data)
+                if question_diff["errors"]:
+                    return ResponseBuilder.error("validation", errors={"questions": question_diff["errors"]})
 
             # Update exam fields
             for attr, value in serializer.validated_data.items():
                 setattr(exam, attr, value)
             exam.save()
 
-            # Update questions if provided
-            if questions_data is not None:
-                # Delete existing questions and recreate
-                Question.objects.filter(exam=exam).delete()
-                question_objects = []
-                for q_data in questions_data:
-                    question_objects.append(Question(exam=exam, **q_data))
-
-                if question_objects:
-                    Question.objects.bulk_create(question_objects)
+            question_changes = None
+            if question_diff is not None:
+                question_changes = ExamService._apply_question_diff(exam, question_diff)
 
             # Reload with questions
             exam.refresh_from_db()
-            serializer = ExamDetailSerializer(exam)
-            return ResponseBuilder.success("exam_updated", data=serializer.data)
+            data = ExamDetailSerializer(exam).data
+            if question_changes is not None:
+                data = {**data, "question_changes": question_changes}
+            return ResponseBuilder.success("exam_updated", data=data)
 
         except Exception as e:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
 
+    @staticmethod
+    def get_exam_analytics(exam_uuid: str, requesting_user):
+        """Score distribution and item analysis, cached until the next grading event."""
+        try:
+            exam = ExamService.get_exam_for_instructor(exam_uuid, requesting_user)
+        except ValueError:
+            return ResponseBuilder.error("exam_not_found")
+        except PermissionError:
+            return ResponseBuilder.error("forbidden")
+
+        try:
+            data = ExamAnalyticsCache.get(exam.id)
+            if data is None:
+                data = compute_exam_analytics(exam)
+                ExamAnalyticsCache.set(exam.id, data)
+            return ResponseBuilder.success("analytics_retrieved", data=data)
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
+    @staticmethod
+    def get_exam_stats(exam_uuid: str, requesting_user):
+        """Constant-time exam summary read from the incrementally maintained ExamStats row."""
+        from apps.submissions.models import ExamStats
+
+        try:
+            exam = ExamService.get_exam_for_instructor(exam_uuid, requesting_user)
+        except ValueError:
+            return ResponseBuilder.error("exam_not_found")
+        except PermissionError:
+            return ResponseBuilder.error("forbidden")
+
+        try:
+            stats = ExamStats.objects.prefetch_related("buckets").filter(exam=exam).first() or ExamStats(exam=exam)
+            data = {"exam": {"id": str(exam.uuid), "title": exam.title}, **stats.summary()}
+            return ResponseBuilder.success("analytics_retrieved", data=data)
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
+    @staticmethod
+    def get_leaderboard(exam_uuid: str, requesting_user, limit: int = 10):
+        """Top graded submissions with competition ranks, plus the requesting student's own standing."""
+        from apps.submissions.models import Submission
+        from apps.submissions.ranking import ExamRankingIndex
+
+        try:
+            exam = ExamService.get_exam_by_uuid(exam_uuid)
+        except ValueError:
+            return ResponseBuilder.error("exam_not_found")
+
+        graded = Submission.objects.filter(exam=exam, status="COMPLETED", percentage__isnull=False)
+        own = graded.filter(student=requesting_user).only("percentage", "score").first()
+        is_owner = exam.course.instructor_id == requesting_user.pk or requesting_user.role == "ADMIN"
+        if own is None and not is_owner:
+            return ResponseBuilder.error("forbidden")
+
+        try:
+            ranking = ExamRankingIndex.get(exam.id)
+            top = graded.select_related("student").order_by("-percentage", "submitted_at")[: max(1, min(limit, 100))]
+            entries = [
+                {
+                    "rank": ranking.rank(submission.percentage),
+                    "student": f"{submission.student.first_name} {submission.student.last_name[:1]}.".strip(),
+                    "score": float(submission.score) if submission.score is not None else None,
+                    "percentage": float(submission.percentage),
+                    "is_me": submission.student_id == requesting_user.pk,
+                }
+                for submission in top
+            ]
+            data = {
+                "exam": {"id": str(exam.uuid), "title": exam.title},
+                "ranked_submissions": ranking.count,
+                "entries": entries,
+                "me": None,
+            }
+            if own is not None:
+                data["me"] = {
+                    "rank": ranking.rank(own.percentage),
+                    "percentile_rank": ranking.percentile_rank(own.percentage),
+                    "percentage": float(own.percentage),
+                }
+            return ResponseBuilder.success("analytics_retrieved", data=data)
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
+    @staticmethod
+    def get_gradebook_export(exam_uuid: str, requesting_user, export_format: str = "csv"):
+        """Prepare a streamed gradebook (one row per submission, one column per question)."""
+        from apps.submissions.exports import GRADEBOOK_FORMATS, stream_gradebook
+
+        export_format = (export_format or "csv").lower()
+        if export_format not in GRADEBOOK_FORMATS:
+            return ResponseBuilder.error(
+                "validation", errors={"format": [f"Supported formats: {', '.join(GRADEBOOK_FORMATS)}"]}
+            )
+
+        try:
+            exam = ExamService.get_exam_for_instructor(exam_uuid, requesting_user)
+        except ValueError:
+            return ResponseBuilder.error("exam_not_found")
+        except PermissionError:
+            return ResponseBuilder.error("forbidden")
+
+        return ResponseBuilder.success(
+            "success",
+            data={
+                "stream": stream_gradebook(exam, export_format),
+                "content_type": GRADEBOOK_FORMATS[export_format],
+                "filename": f"gradebook-{exam.uuid}.{export_format}",
+            },
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def import_question_bank(exam, lines, skip_invalid: bool = False, chunk_size: int = None):
+        """Append JSONL questions to an exam; returns the per-line import summary."""
+        from .question_bank import IMPORT_CHUNK_SIZE, import_question_lines
+
+        summary = import_question_lines(
+            exam, lines, chunk_size=chunk_size or IMPORT_CHUNK_SIZE, skip_invalid=skip_invalid
+        )
+        if summary["created"]:
+            ExamService._on_questions_changed(exam)
+        return summary
+
+    @staticmethod
+    def import_questions(exam_uuid: str, upload, requesting_user, skip_invalid: bool = False):
+        """Import an uploaded JSONL question bank into an instructor's exam."""
+        if upload is None:
+            return ResponseBuilder.error("validation", errors={"file": ["A JSONL file is required."]})
+
+        try:
+            exam = ExamService.get_exam_for_instructor(exam_uuid, requesting_user)
+        except ValueError:
+            return ResponseBuilder.error("exam_not_found")
+        except PermissionError:
+            return ResponseBuilder.error("forbidden")
+
+        try:
+            # Iterating an UploadedFile yields lines without reading the whole upload into memory
+            summary = ExamService.import_question_bank(exam, upload, skip_invalid=skip_invalid)
+            if summary["skipped"] and not skip_invalid:
+                return ResponseBuilder.error("validation", errors={"lines": summary["errors"]})
+            return ResponseBuilder.success("questions_imported", data=summary)
+        except UnicodeDecodeError:
+            return ResponseBuilder.error("validation", errors={"file": ["The file must be UTF-8 encoded JSONL."]})
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
+    @staticmethod
+    def get_question_bank_export(exam_uuid: str, requesting_user):
+        """Prepare a streamed JSONL export of an exam's questions, answers and rubrics included."""
+        from .question_bank import stream_question_bank
+
+        try:
+            exam = ExamService.get_exam_for_instructor(exam_uuid, requesting_user)
+        except ValueError:
+            return ResponseBuilder.error("exam_not_found")
+        except PermissionError:
+            return ResponseBuilder.error("forbidden")
+
+        return ResponseBuilder.success(
+            "success",
+            data={
+                "stream": stream_question_bank(exam),
+                "content_type": "application/x-ndjson",
+                "filename": f"questions-{exam.uuid}.jsonl",
+            },
+        )
+
+    @staticmethod
+    def _search_result(scope: str, obj, rank: float) -> dict:
+        question = obj if scope == "questions" else obj.question
+        result = {
+            "type": scope[:-1],
+            "id": str(obj.uuid),
+            "rank": rank,
+            "exam": {"id": str(question.exam.uuid), "title": question.exam.title},
+        }
+        if scope == "questions":
+            result.update({"question_text": obj.question_text, "question_type": obj.question_type})
+        else:
+            result.update(
+                {
+                    "question_id": str(question.uuid),
+                    "submission_id": str(obj.submission.uuid),
+                    "answer_text": obj.answer_text,
+                    "feedback": obj.feedback,
+                }
+            )
+        return result
+
+    @staticmethod
+    def search(query: str, requesting_user, scope: str = "questions", page: int = 1, page_size: int = 20):
+        """Ranked full-text search over question text or answers, limited to the instructor's courses."""
+        from .search import SEARCH_SCOPES, get_backend, search_model
+
+        query = (query or "").strip()
+        errors = {}
+        if not query:
+            errors["q"] = ["A search query is required."]
+        if scope not in SEARCH_SCOPES:
+            errors["scope"] = [f"Supported scopes: {', '.join(SEARCH_SCOPES)}"]
+        if errors:
+            return ResponseBuilder.error("validation", errors=errors)
+
+        page = max(1, page)
+        page_size = max(1, min(page_size, 100))
+        try:
+            instructor_id = None if requesting_user.role == "ADMIN" else requesting_user.pk
+            total, ranked = get_backend().ranked_ids(
+                scope, query, limit=page_size, offset=(page - 1) * page_size, instructor_id=instructor_id
+            )
+
+            related = ["exam"] if scope == "questions" else ["question__exam", "submission"]
+            objects = search_model(scope).objects.select_related(*related).in_bulk([row_id for row_id, _ in ranked])
+            results = [
+                ExamService._search_result(scope, objects[row_id], rank) for row_id, rank in ranked if row_id in objects
+            ]
+            data = {"query": query, "scope": scope, "count": total, "page": page, "page_size": page_size}
+            return ResponseBuilder.success("search_results", data={**data, "results": results})
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
     @staticmethod
     def delete_exam(exam_uuid: str, deleted_by):
         try:
@@ -194,3 +595,38 @@ class ExamService:
             return ResponseBuilder.success("exam_deleted")
         except Exception as e:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
+
+class ExamVersionService:
+    @staticmethod
+    def publish(exam) -> ExamVersion:
+        """Snapshot the exam's questions as a new version unless the latest one already matches."""
+        snapshot, content_hash = ExamVersion.build_snapshot(exam)
+        latest = exam.versions.defer("snapshot").first()
+        if latest is not None and latest.content_hash == content_hash:
+            return latest
+
+        try:
+            with transaction.atomic():
+                return ExamVersion.objects.create(
+                    exam=exam,
+                    version=latest.version + 1 if latest else 1,
+                    content_hash=content_hash,
+                    snapshot=snapshot,
+                )
+        except IntegrityError:
+            # A concurrent publish took this version number
+            return exam.versions.defer("snapshot").first()
+
+    @staticmethod
+    def current(exam) -> ExamVersion:
+        """Version new submissions are taken against.
+
+        An empty ``grading_plan_hash`` means questions were edited outside
+        ExamService (see ``apps.exams.signals``), so a fresh snapshot is published first.
+        """
+        latest = exam.versions.defer("snapshot").first() if exam.grading_plan_hash else None
+        if latest is None:
+            latest = ExamVersionService.publish(exam)
+            GradingPlanStore.compile(exam)
+        return latest
@@ -0,0 +1,80 @@
+"""Deterministic per-student shuffling of question order and MCQ options.
+
+Nothing is stored per student: a permutation is a pure function of the exam,
+its published version and the student's seed bucket. Students are spread over
+``EXAM_SHUFFLE_BUCKETS`` buckets so shuffled payloads can be cached per bucket
+instead of per student, and a submitted option label is mapped back to the
+stored label with the same permutation.
+"""
+
+import hashlib
+import random
+from typing import Dict, List
+from django.conf import settings
+
+
+def _digest(*parts) -> int:
+    return int.from_bytes(hashlib.sha256(":".join(map(str, parts)).encode()).digest()[:8], "big")
+
+
+def seed_bucket(student_uuid) -> int:
+    return _digest(student_uuid) % getattr(settings, "EXAM_SHUFFLE_BUCKETS", 64)
+
+
+def shuffle_seed(exam_uuid, version: int, bucket: int) -> str:
+    return f"{exam_uuid}:{version}:{bucket}"
+
+
+def permutation(seed: str, size: int, salt="") -> List[int]:
+    """Indices into the original sequence, in display order."""
+    indices = list(range(size))
+    random.Random(_digest(seed, salt)).shuffle(indices)
+    return indices
+
+
+def shuffle_options(options, seed: str, question_uuid):
+    """Shuffle a list of options, or the texts behind fixed labels for ``{"A": ..., "B": ...}`` options."""
+    if isinstance(options, list):
+        return [options[i] for i in permutation(seed, len(options), question_uuid)]
+    if isinstance(options, dict):
+        labels = list(options)
+        order = permutation(seed, len(labels), question_uuid)
+        return {label: options[labels[i]] for label, i in zip(labels, order)}
+    return options
+
+
+def unshuffle_answer(options, answer_text: str, seed: str, question_uuid, case_sensitive: bool = True) -> str:
+    """Map a label chosen from shuffled ``{"A": ...}`` options back to the stored label.
+
+    List options are answered with the option text itself, so those answers
+    (and anything that is not a label) are returned unchanged. Unless
+    ``case_sensitive``, labels match in any case, as they do when graded.
+    """
+    if not isinstance(options, dict) or not isinstance(answer_text, str):
+        return answer_text
+    labels = list(options)
+    chosen = answer_text.strip()
+    if not case_sensitive:
+        chosen = next((label for label in labels if label.lower() == chosen.lower()), chosen)
+    if chosen not in options:
+        return answer_text
+    order = permutation(seed, len(labels), question_uuid)
+    return labels[order[labels.index(chosen)]]
+
+
+def shuffle_exam_payload(data: Dict, seed: str, questions: bool = True, options: bool = True) -> Dict:
+    """Reorder (and renumber) serialized questions and shuffle MCQ options."""
+    items = list(data.get("questions") or [])
+    if questions:
+        items = [items[i] for i in permutation(seed, len(items))]
+        items = [{**item, "order": position} for position, item in enumerate(items, start=1)]
+    if options:
+        items = [
+            (
+                {**item, "options": shuffle_options(item["options"], seed, item["id"])}
+                if item.get("question_type") == "MCQ" and item.get("options")
+                else item
+            )
+            for item in items
+        ]
+    return {**data, "questions": items}
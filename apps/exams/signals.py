@@ -0,0 +1,66 @@
+import threading
+from django.db import transaction
+from django.utils import timezone
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import ActiveExamListCache
+from .models import Course, Exam, Question
+
+
+class PendingExamSync:
+    """Exams whose questions were edited outside ExamService (admin, shell) in the current transaction.
+
+    A bulk or cascading delete sends one signal per question, so the exams are
+    collected and each is synced once when the transaction commits: totals are
+    recomputed, the grading plan is expired so the next grading run recompiles
+    it, and ``updated_at`` is bumped so cached payloads keyed on it are not
+    served. ExamService refreshes exams itself and deleted exams need nothing,
+    so both are discarded. Every signal registers a commit callback, since a
+    rolled back savepoint drops its callbacks; all but the first find nothing to do.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def _exam_ids(cls) -> set:
+        if not hasattr(cls._local, "exam_ids"):
+            cls._local.exam_ids = set()
+        return cls._local.exam_ids
+
+    @classmethod
+    def add(cls, exam_id) -> None:
+        cls._exam_ids().add(exam_id)
+        transaction.on_commit(cls.flush)
+
+    @classmethod
+    def discard(cls, exam_id) -> None:
+        cls._exam_ids().discard(exam_id)
+
+    @classmethod
+    def flush(cls) -> None:
+        exam_ids, cls._local.exam_ids = cls._exam_ids(), set()
+        for exam_id in exam_ids:
+            Exam(pk=exam_id).refresh_question_totals(grading_plan_hash="", updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def sync_exam_with_questions(sender, instance, **kwargs):
+    """Keep an exam consistent with questions edited outside ExamService; see PendingExamSync."""
+    PendingExamSync.add(instance.exam_id)
+
+
+@receiver(post_delete, sender=Exam)
+def skip_sync_of_deleted_exam(sender, instance, **kwargs):
+    PendingExamSync.discard(instance.pk)
+
+
+@receiver(post_save, sender=Exam)
+@receiver(post_delete, sender=Exam)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_active_exam_list(sender, instance, **kwargs):
+    """Any write that can change the student exam listing drops it once the transaction commits."""
+    transaction.on_commit(ActiveExamListCache.invalidate)
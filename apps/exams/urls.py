@@ -7,6 +7,13 @@ from .views import (
     ExamCreateView,
     ExamUpdateView,
     ExamDeleteView,
+    ExamAnalyticsView,
+    ExamStatsView,
+    ExamGradebookView,
+    ExamLeaderboardView,
+    ExamSearchView,
+    QuestionImportView,
+    QuestionExportView,
 )
 
 app_name = "exams"
@@ -15,8 +22,15 @@ urlpatterns = [
     path("courses/", CourseListView.as_view(), name="course-list"),
     path("courses/create/", CourseCreateView.as_view(), name="course-create"),
     path("", ExamListView.as_view(), name="exam-list"),
+    path("search/", ExamSearchView.as_view(), name="exam-search"),
     path("<uuid:uuid>/", ExamDetailView.as_view(), name="exam-detail"),
     path("create/", ExamCreateView.as_view(), name="exam-create"),
     path("<uuid:uuid>/update/", ExamUpdateView.as_view(), name="exam-update"),
     path("<uuid:uuid>/delete/", ExamDeleteView.as_view(), name="exam-delete"),
+    path("<uuid:uuid>/analytics/", ExamAnalyticsView.as_view(), name="exam-analytics"),
+    path("<uuid:uuid>/stats/", ExamStatsView.as_view(), name="exam-stats"),
+    path("<uuid:uuid>/gradebook/", ExamGradebookView.as_view(), name="exam-gradebook"),
+    path("<uuid:uuid>/leaderboard/", ExamLeaderboardView.as_view(), name="exam-leaderboard"),
+    path("<uuid:uuid>/questions/import/", QuestionImportView.as_view(), name="question-import"),
+    path("<uuid:uuid>/questions/export/", QuestionExportView.as_view(), name="question-export"),
 ]
@@ -1,8 +1,11 @@
 import traceback
 import logging
+from django.http import StreamingHttpResponse
+from rest_framework.parsers import MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from apps.common.utils.response_utils import server_error_response
+from apps.common.utils.streaming import FileExportContentNegotiation
 from apps.accounts.permissions import IsStudent, IsInstructor
 from .services import ExamService, CourseService
 from .serializers import ExamListSerializer, ExamDetailSerializer, CourseSerializer
@@ -56,13 +59,131 @@ class ExamDetailView(APIView):
 
     def get(self, request, uuid):
         try:
-            result = ExamService.get_exam_detail(str(uuid))
+            result = ExamService.get_exam_detail(str(uuid), request.user)
             return result.to_response()
         except Exception:
             logger.error(f"Exam detail error: {traceback.format_exc()}")
             return server_error_response()
 
 
+class ExamAnalyticsView(APIView):
+    permission_classes = [IsAuthenticated, IsInstructor]
+    serializer_class = None
+
+    def get(self, request, uuid):
+        try:
+            result = ExamService.get_exam_analytics(str(uuid), request.user)
+            return result.to_response()
+        except Exception:
+            logger.error(f"Exam analytics error: {traceback.format_exc()}")
+            return server_error_response()
+
+
+class ExamStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsInstructor]
+    serializer_class = None
+
+    def get(self, request, uuid):
+        try:
+            result = ExamService.get_exam_stats(str(uuid), request.user)
+            return result.to_response()
+        except Exception:
+            logger.error(f"Exam stats error: {traceback.format_exc()}")
+            return server_error_response()
+
+
+class ExamLeaderboardView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get(self, request, uuid):
+        try:
+            limit = request.query_params.get("limit", "10")
+            limit = int(limit) if limit.isdigit() else 10
+            result = ExamService.get_leaderboard(str(uuid), request.user, limit)
+            return result.to_response()
+        except Exception:
+            logger.error(f"Exam leaderboard error: {traceback.format_exc()}")
+            return server_error_response()
+
+
+class ExamGradebookView(APIView):
+    permission_classes = [IsAuthenticated, IsInstructor]
+    content_negotiation_class = FileExportContentNegotiation
+    serializer_class = None
+
+    def get(self, request, uuid):
+        try:
+            result = ExamService.get_gradebook_export(str(uuid), request.user, request.query_params.get("format"))
+            if not result.success:
+                return result.to_response()
+
+            response = StreamingHttpResponse(result.data["stream"], content_type=result.data["content_type"])
+            response["Content-Disposition"] = f'attachment; filename="{result.data["filename"]}"'
+            return response
+        except Exception:
+            logger.error(f"Gradebook export error: {traceback.format_exc()}")
+            return server_error_response()
+
+
+class QuestionImportView(APIView):
+    permission_classes = [IsAuthenticated, IsInstructor]
+    parser_classes = [MultiPartParser]
+    serializer_class = None
+
+    def post(self, request, uuid):
+        try:
+            result = ExamService.import_questions(
+                str(uuid),
+                request.FILES.get("file"),
+                request.user,
+                skip_invalid=request.query_params.get("skip_invalid", "").lower() in ("1", "true", "yes"),
+            )
+            return result.to_response()
+        except Exception:
+            logger.error(f"Question import error: {traceback.format_exc()}")
+            return server_error_response()
+
+
+class QuestionExportView(APIView):
+    permission_classes = [IsAuthenticated, IsInstructor]
+    content_negotiation_class = FileExportContentNegotiation
+    serializer_class = None
+
+    def get(self, request, uuid):
+        try:
+            result = ExamService.get_question_bank_export(str(uuid), request.user)
+            if not result.success:
+                return result.to_response()
+
+            response = StreamingHttpResponse(result.data["stream"], content_type=result.data["content_type"])
+            response["Content-Disposition"] = f'attachment; filename="{result.data["filename"]}"'
+            return response
+        except Exception:
+            logger.error(f"Question export error: {traceback.format_exc()}")
+            return server_error_response()
+
+
+class ExamSearchView(APIView):
+    permission_classes = [IsAuthenticated, IsInstructor]
+    serializer_class = None
+
+    def get(self, request):
+        try:
+            params = request.query_params
+            page = params.get("page", "")
+            page_size = params.get("page_size", "")
+            page = int(page) if page.isdigit() else 1
+            page_size = int(page_size) if page_size.isdigit() else 20
+            result = ExamService.search(
+                params.get("q"), request.user, scope=params.get("scope", "questions"), page=page, page_size=page_size
+            )
+            return result.to_response()
+        except Exception:
+            logger.error(f"Exam search error: {traceback.format_exc()}")
+            return server_error_response()
+
+
 class ExamCreateView(APIView):
     permission_classes = [IsAuthenticated, IsInstructor]
     serializer_class = ExamDetailSerializer
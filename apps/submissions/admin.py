@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Submission, Answer
+from apps.exams.search import FullTextSearchAdminMixin
+from .models import Submission, Answer, ExamStats, ExamStatsBucket
 
 
 @admin.register(Submission)
@@ -7,14 +8,36 @@ class SubmissionAdmin(admin.ModelAdmin):
     list_display = ["uuid", "student", "exam", "status", "score", "percentage", "submitted_at"]
     list_filter = ["status", "submitted_at", "graded_at"]
     search_fields = ["student__email", "exam__title"]
+    # Exam.__str__ reads course.code; name every relation so rows don't load them one by one
+    list_select_related = ["student", "exam__course"]
     readonly_fields = ["uuid", "submitted_at", "graded_at", "percentage"]
     ordering = ["-submitted_at"]
 
 
 @admin.register(Answer)
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ["uuid", "submission", "question", "marks_obtained", "is_correct", "graded_at"]
     list_filter = ["is_correct", "graded_by_service", "graded_at"]
-    search_fields = ["submission__student__email", "question__question_text"]
+    # answer_text and feedback are matched through the full-text index; these exactly
+    search_fields = ["uuid", "submission__uuid", "submission__student__email"]
+    search_scope = "answers"
+    # Submission.__str__ reads student.email and exam.title
+    list_select_related = ["submission__student", "submission__exam", "question"]
     readonly_fields = ["uuid", "graded_at"]
     ordering = ["-created_at"]
+
+
+class ExamStatsBucketInline(admin.TabularInline):
+    model = ExamStatsBucket
+    extra = 0
+    readonly_fields = ["bucket", "count"]
+    can_delete = False
+
+
+@admin.register(ExamStats)
+class ExamStatsAdmin(admin.ModelAdmin):
+    list_display = ["exam", "submission_count", "score_min", "score_max", "pass_count", "updated_at"]
+    search_fields = ["exam__title"]
+    readonly_fields = ["submission_count", "score_sum", "score_sum_squares", "score_min", "score_max", "pass_count"]
+    list_select_related = ["exam", "exam__course"]
+    inlines = [ExamStatsBucketInline]
@@ -0,0 +1,53 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+
+
+class SubmissionDetailCache:
+    """Cache of serialized detail payloads for graded submissions.
+
+    A COMPLETED submission only changes when it is regraded, so its payload is
+    stored under the submission uuid together with a strong ETag derived from
+    its ``updated_at`` and that of its exam, which question edits bump since
+    the payload embeds the questions. A stale entry is never served: the stored ETag must match
+    the one computed from the current row.
+    """
+
+    KEY_PREFIX = "submission_detail"
+
+    @classmethod
+    def _key(cls, submission_uuid) -> str:
+        return f"{cls.KEY_PREFIX}:{submission_uuid}"
+
+    @staticmethod
+    def etag_for(submission_uuid, updated_at, exam_updated_at, *versions) -> str:
+        """Strong ETag for a submission; ``versions`` mix in state served alongside the cached payload."""
+        raw = ":".join([str(submission_uuid), updated_at.isoformat(), exam_updated_at.isoformat(), *map(str, versions)])
+        return quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+    @staticmethod
+    def matches(etag: str, if_none_match: str = None) -> bool:
+        """Weak comparison of an If-None-Match header against ``etag`` (RFC 9110)."""
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        if "*" in etags:
+            return True
+        return etag in {tag.removeprefix("W/") for tag in etags}
+
+    @classmethod
+    def get(cls, submission_uuid, etag: str):
+        entry = cache.get(cls._key(submission_uuid))
+        if entry is None or entry["etag"] != etag:
+            return None
+        return entry["data"]
+
+    @classmethod
+    def set(cls, submission_uuid, etag: str, data) -> None:
+        timeout = getattr(settings, "SUBMISSION_DETAIL_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(cls._key(submission_uuid), {"etag": etag, "data": data}, timeout)
+
+    @classmethod
+    def invalidate(cls, submission_uuid) -> None:
+        cache.delete(cls._key(submission_uuid))
@@ -0,0 +1,228 @@
+import csv
+import json
+import logging
+import uuid
+from itertools import groupby
+from typing import Dict, Iterator
+from apps.common.utils.streaming import Echo
+from apps.submissions.models import Answer, Submission
+
+logger = logging.getLogger("apps")
+
+GRADEBOOK_CHUNK_SIZE = 2000
+GRADEBOOK_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+GRADEBOOK_FIELDS = [
+    "submission_id",
+    "student_id",
+    "student_email",
+    "student_name",
+    "status",
+    "submitted_at",
+    "score",
+    "percentage",
+    "passed",
+]
+
+
+def _number(value):
+    return float(value) if value is not None else None
+
+
+def question_columns(exam) -> Dict[int, str]:
+    """Gradebook column name per question id, in question order."""
+    return {q_id: f"Q{order}" for q_id, order in exam.questions.order_by("order").values_list("id", "order")}
+
+
+def iter_gradebook_rows(exam, columns: Dict[int, str] = None, chunk_size: int = GRADEBOOK_CHUNK_SIZE) -> Iterator[Dict]:
+    """Yield one gradebook row per submission, pivoting answer rows on the fly.
+
+    Submissions and their answers are read through two chunked iterators, both
+    ordered by submission, and merged, so only one submission's answers are
+    held in memory at a time. Submissions without answers get empty marks.
+    """
+    columns = columns if columns is not None else question_columns(exam)
+    submissions = (
+        Submission.objects.filter(exam_id=exam.id)
+        .order_by("id")
+        .values_list(
+            "id",
+            "uuid",
+            "student__uuid",
+            "student__email",
+            "student__first_name",
+            "student__last_name",
+            "status",
+            "submitted_at",
+            "score",
+            "percentage",
+            "passed",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    answers = (
+        Answer.objects.filter(submission__exam_id=exam.id)
+        .order_by("submission_id")
+        .values_list("submission_id", "question_id", "marks_obtained")
+        .iterator(chunk_size=chunk_size)
+    )
+    answers_by_submission = groupby(answers, key=lambda row: row[0])
+    pending = next(answers_by_submission, None)
+
+    for submission in submissions:
+        marks = {column: None for column in columns.values()}
+        # Answers can only belong to submissions of this exam, so the answer stream never runs ahead
+        if pending is not None and pending[0] == submission[0]:
+            for _, question_id, marks_obtained in pending[1]:
+                if question_id in columns:
+                    marks[columns[question_id]] = _number(marks_obtained)
+            pending = next(answers_by_submission, None)
+        yield {
+            "submission_id": str(submission[1]),
+            "student_id": str(submission[2]),
+            "student_email": submission[3],
+            "student_name": f"{submission[4]} {submission[5]}".strip(),
+            "status": submission[6],
+            "submitted_at": submission[7].isoformat() if submission[7] else None,
+            "score": _number(submission[8]),
+            "percentage": _number(submission[9]),
+            "passed": submission[10],
+            "marks": marks,
+        }
+
+
+def stream_gradebook_csv(exam) -> Iterator[str]:
+    columns = question_columns(exam)
+    writer = csv.writer(Echo())
+    yield writer.writerow(GRADEBOOK_FIELDS + list(columns.values()))
+    for record in iter_gradebook_rows(exam, columns):
+        yield writer.writerow(
+            [record[field] for field in GRADEBOOK_FIELDS] + [record["marks"][column] for column in columns.values()]
+        )
+
+
+def stream_gradebook_jsonl(exam) -> Iterator[str]:
+    for record in iter_gradebook_rows(exam):
+        yield json.dumps(record) + "\n"
+
+
+def stream_gradebook(exam, export_format: str) -> Iterator[str]:
+    if export_format == "csv":
+        return stream_gradebook_csv(exam)
+    return stream_gradebook_jsonl(exam)
+
+
+# Columnar answer export (Parquet / Arrow IPC)
+
+COLUMNAR_CHUNK_SIZE = 10000
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# (column, source lookup, arrow type name); "dictionary" columns are dictionary-encoded strings
+COLUMNAR_COLUMNS = [
+    ("answer_id", "uuid", "string"),
+    ("submission_id", "submission__uuid", "string"),
+    ("student_id", "submission__student__uuid", "string"),
+    ("exam_id", "submission__exam__uuid", "dictionary"),
+    ("course_code", "submission__exam__course__code", "dictionary"),
+    ("submission_status", "submission__status", "dictionary"),
+    ("submission_score", "submission__score", "float64"),
+    ("question_id", "question__uuid", "dictionary"),
+    ("question_order", "question__order", "int32"),
+    ("question_type", "question__question_type", "dictionary"),
+    ("question_marks", "question__marks", "float64"),
+    ("answer_text", "answer_text", "string"),
+    ("marks_obtained", "marks_obtained", "float64"),
+    ("is_correct", "is_correct", "bool"),
+    ("similarity_score", "similarity_score", "float64"),
+    ("graded_by_service", "graded_by_service", "dictionary"),
+    ("graded_at", "graded_at", "timestamp"),
+]
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+
+        return pyarrow
+    except ImportError:
+        logger.warning("pyarrow package not installed. Install with: pip install pyarrow")
+        raise ImportError("pyarrow package required for Parquet/Arrow exports")
+
+
+def _arrow_schema(pa):
+    types = {
+        "string": pa.string(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "float64": pa.float64(),
+        "int32": pa.int32(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, _, kind in COLUMNAR_COLUMNS])
+
+
+def _record_batch(pa, schema, rows):
+    arrays = []
+    for index, (_, _, kind) in enumerate(COLUMNAR_COLUMNS):
+        values = [row[index] for row in rows]
+        if kind in ("string", "dictionary"):
+            values = [str(value) if value is not None else None for value in values]
+        elif kind == "float64":
+            values = [float(value) if value is not None else None for value in values]
+        array = pa.array(values, type=pa.string() if kind == "dictionary" else schema.field(index).type)
+        arrays.append(array.dictionary_encode() if kind == "dictionary" else array)
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def answers_for_scope(exam_uuid=None, course=None):
+    """Answers of one exam, or of every exam in a course (matched by uuid or code)."""
+    answers = Answer.objects.all()
+    if exam_uuid:
+        answers = answers.filter(submission__exam__uuid=uuid.UUID(str(exam_uuid)))
+    if course:
+        try:
+            answers = answers.filter(submission__exam__course__uuid=uuid.UUID(str(course)))
+        except ValueError:
+            answers = answers.filter(submission__exam__course__code=course)
+    return answers
+
+
+def write_answers_columnar(answers, sink, export_format: str = "parquet", chunk_size: int = COLUMNAR_CHUNK_SIZE):
+    """Write answers joined with questions/submissions to ``sink`` as Parquet or an Arrow IPC stream.
+
+    Rows are read through a chunked (server-side on PostgreSQL) cursor and written
+    one record batch per chunk, so memory is bounded by ``chunk_size``.
+    Returns the number of rows written.
+    """
+    pa = _import_pyarrow()
+    schema = _arrow_schema(pa)
+    rows = answers.order_by("id").values_list(*[lookup for _, lookup, _ in COLUMNAR_COLUMNS]).iterator(chunk_size)
+
+    if export_format == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+
+    written = 0
+    try:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                write(_record_batch(pa, schema, chunk))
+                written += len(chunk)
+                chunk = []
+        if chunk or not written:
+            write(_record_batch(pa, schema, chunk))
+            written += len(chunk)
+    finally:
+        writer.close()
+    return written
@@ -188,7 +188,7 @@ Be fair but rigorous. Consider:
         total_possible_marks = Decimal("0.0")
         grading_details = []
 
-        answers = submission.answers.select_related("question").all()
+        answers = list(submission.answers.select_related("question"))
 
         for answer in answers:
             question = answer.question
@@ -196,13 +196,7 @@ Be fair but rigorous. Consider:
             try:
                 marks, feedback = self.grade_answer(question, answer.answer_text, question.grading_rubric)
 
-                # Update answer object
-                answer.marks_obtained = Decimal(str(marks))
-                answer.feedback = feedback
-                answer.is_correct = marks >= float(question.marks) * 0.8  # 80% threshold for correctness
-                answer.graded_by_service = "llm"
-                answer.graded_at = timezone.now()
-                answer.save()
+                answer.apply_grade(marks, feedback, "llm", question.marks)
 
                 total_marks_obtained += Decimal(str(marks))
                 total_possible_marks += question.marks
@@ -220,8 +214,9 @@ Be fair but rigorous. Consider:
                 # Mark as failed but continue
                 answer.graded_by_service = "llm"
                 answer.marks_obtained = Decimal("0.0")
+                answer.is_correct = False
                 answer.feedback = f"Grading failed: {str(e)}"
-                answer.save()
+                answer.updated_at = timezone.now()
 
                 total_possible_marks += question.marks
                 grading_details.append(
@@ -233,6 +228,9 @@ Be fair but rigorous. Consider:
                     }
                 )
 
+        # One UPDATE for the whole submission instead of a validated save() per answer
+        Answer.objects.bulk_update(answers, Answer.GRADED_FIELDS)
+
         percentage = (total_marks_obtained / total_possible_marks * 100) if total_possible_marks > 0 else 0
 
         return {
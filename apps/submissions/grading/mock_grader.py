@@ -1,9 +1,8 @@
-import re
 from typing import Tuple, Dict, List
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from django.utils import timezone
 from .base_grader import BaseGrader
+from .plan import GradingPlanStore, compile_question, extract_keywords
 
 
 class MockGrader(BaseGrader):
@@ -12,71 +11,65 @@ class MockGrader(BaseGrader):
         self.vectorizer = TfidfVectorizer(lowercase=True, stop_words="english", ngram_range=(1, 2))
 
     def grade_answer(self, question: "Question", answer_text: str, rubric: Dict = None) -> Tuple[float, str]:
+        row = {field: getattr(question, field) for field in ("uuid", "question_type", "marks", "case_sensitive")}
+        row["correct_answer"] = question.correct_answer
+        entry = compile_question(row, rubric or question.grading_rubric)
+        return self.execute(entry, answer_text)
 
+    def execute(self, entry: Dict, answer_text: str) -> Tuple[float, str]:
+        """Grade an answer against a compiled grading plan entry."""
         if not self._validate_answer(answer_text):
             return 0.0, "No answer provided"
 
-        question_type = question.question_type
+        question_type = entry["type"]
 
         if question_type == "MCQ":
-            return self._grade_mcq(question, answer_text)
+            return self._grade_mcq(entry, answer_text)
         elif question_type == "SHORT_ANSWER":
-            return self._grade_short_answer(question, answer_text, rubric)
+            return self._grade_short_answer(entry, answer_text)
         elif question_type == "ESSAY":
-            return self._grade_essay(question, answer_text, rubric)
+            return self._grade_essay(entry, answer_text)
         else:
             return 0.0, "Unknown question type"
 
-    def _grade_mcq(self, question, answer_text: str) -> Tuple[float, str]:
-        expected = question.correct_answer.strip()
+    def _grade_mcq(self, entry: Dict, answer_text: str) -> Tuple[float, str]:
         provided = answer_text.strip()
+        if not entry["case_sensitive"]:
+            provided = provided.lower()
 
-        if question.case_sensitive:
-            is_correct = expected == provided
+        if provided == entry["match"]:
+            return entry["marks"], "Correct answer"
         else:
-            is_correct = expected.lower() == provided.lower()
+            return 0.0, f"Incorrect. Expected: {entry['expected']}"
 
-        if is_correct:
-            return float(question.marks), "Correct answer"
-        else:
-            return 0.0, f"Incorrect. Expected: {expected}"
-
-    def _grade_short_answer(self, question, answer_text: str, rubric: Dict = None) -> Tuple[float, str]:
-
-        rubric = rubric or question.grading_rubric or {}
-        expected = question.correct_answer
+    def _grade_short_answer(self, entry: Dict, answer_text: str) -> Tuple[float, str]:
+        expected = entry["expected"]
 
         if not expected:
-            return float(question.marks), "Manual grading required"
+            return entry["marks"], "Manual grading required"
 
-        # Extract keywords from rubric or expected answer
-        keywords = rubric.get("keywords", [])
-        if not keywords:
-            keywords = self._extract_keywords(expected)
+        keywords = entry["keywords"]
 
         # Calculate keyword score
-        keyword_score = self._calculate_keyword_score(answer_text, keywords, weight=rubric.get("keyword_weight", 0.4))
+        keyword_score = self._calculate_keyword_score(
+            answer_text, keywords, weight=entry["keyword_weight"], keywords_lower=entry["keywords_lower"]
+        )
 
         # Calculate similarity score
-        similarity_score = self._calculate_similarity_score(
-            answer_text, expected, weight=rubric.get("similarity_weight", 0.6)
-        )
+        similarity_score = self._calculate_similarity_score(answer_text, expected, weight=entry["similarity_weight"])
 
         # Combined score
         total_score = keyword_score + similarity_score
-        marks_obtained = total_score * float(question.marks)
+        marks_obtained = total_score * entry["marks"]
 
         # Generate feedback
         feedback = self._generate_feedback(total_score, keyword_score, similarity_score, keywords, answer_text)
 
         return round(marks_obtained, 2), feedback
 
-    def _grade_essay(self, question, answer_text: str, rubric: Dict = None) -> Tuple[float, str]:
-
-        rubric = rubric or question.grading_rubric or {}
-
+    def _grade_essay(self, entry: Dict, answer_text: str) -> Tuple[float, str]:
         # Check minimum length requirement
-        min_length = rubric.get("min_length", 100)
+        min_length = entry["min_length"]
         word_count = len(answer_text.split())
 
         if word_count < min_length:
@@ -87,35 +80,40 @@ class MockGrader(BaseGrader):
             feedback = "Length requirement met. "
 
         # Keyword-based scoring
-        keywords = rubric.get("keywords", [])
+        keywords = entry["keywords"]
         if keywords:
-            keyword_score = self._calculate_keyword_score(answer_text, keywords, weight=1.0)
+            keyword_score = self._calculate_keyword_score(
+                answer_text, keywords, weight=1.0, keywords_lower=entry["keywords_lower"]
+            )
 
-            marks_obtained = keyword_score * float(question.marks) * (1 - penalty)
+            marks_obtained = keyword_score * entry["marks"] * (1 - penalty)
 
             matched_keywords = self._find_matched_keywords(answer_text, keywords)
             feedback += f"Covered {len(matched_keywords)}/{len(keywords)} key concepts: {', '.join(matched_keywords)}"
         else:
             # No rubric - give full marks with note
-            marks_obtained = float(question.marks)
+            marks_obtained = entry["marks"]
             feedback = "Manual grading recommended - no rubric provided"
 
         return round(marks_obtained, 2), feedback
 
-    def _calculate_keyword_score(self, text: str, keywords: List[str], weight: float) -> float:
+    def _calculate_keyword_score(
+        self, text: str, keywords: List[str], weight: float, keywords_lower: List[str] = None
+    ) -> float:
         """Calculate score based on keyword presence and density."""
         if not keywords:
             return 0.0
 
         text_lower = text.lower()
-        matched_keywords = [kw for kw in keywords if kw.lower() in text_lower]
+        keywords_lower = keywords_lower or [kw.lower() for kw in keywords]
+        matched_keywords = [kw for kw in keywords_lower if kw in text_lower]
 
         # Basic presence score
         presence_score = len(matched_keywords) / len(keywords)
 
         # Keyword density bonus
         total_words = len(text.split())
-        keyword_density = sum(text_lower.count(kw.lower()) for kw in matched_keywords) / max(total_words, 1)
+        keyword_density = sum(text_lower.count(kw) for kw in matched_keywords) / max(total_words, 1)
 
         # Combined score with diminishing returns on density
         combined = (presence_score * 0.8) + min(keyword_density * 5, 0.2)
@@ -129,7 +127,7 @@ class MockGrader(BaseGrader):
             tfidf_matrix = self.vectorizer.fit_transform([text1, text2])
 
             # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+            similarity = float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0])
 
             return similarity * weight
         except Exception:
@@ -141,10 +139,7 @@ class MockGrader(BaseGrader):
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract important keywords from text."""
-        # Simple extraction - remove common words
-        words = re.findall(r"\b[a-z]{4,}\b", text.lower())
-        # Return unique words
-        return list(set(words))[:10]
+        return extract_keywords(text)
 
     def _find_matched_keywords(self, text: str, keywords: List[str]) -> List[str]:
         """Find which keywords are present in text."""
@@ -172,39 +167,41 @@ class MockGrader(BaseGrader):
         return " | ".join(feedback_parts)
 
     def grade_submission(self, submission: "Submission") -> Dict:
-        """Grade all answers in a submission."""
+        """Grade all answers in a submission by executing the exam's compiled grading plan."""
         from apps.submissions.models import Answer
 
+        plan = GradingPlanStore.for_submission(submission)
+
         total_marks_obtained = 0.0
         total_possible_marks = 0.0
         grading_details = []
 
-        answers = submission.answers.select_related("question").all()
+        answers = list(submission.answers.all())
+        if any(answer.question_id not in plan["questions"] for answer in answers):
+            # Questions changed without a new version being published
+            plan = GradingPlanStore.compile(submission.exam)
 
         for answer in answers:
-            question = answer.question
-            marks, feedback = self.grade_answer(question, answer.answer_text, question.grading_rubric)
+            entry = plan["questions"][answer.question_id]
+            marks, feedback = self.execute(entry, answer.answer_text)
 
-            # Update answer object
-            answer.marks_obtained = marks
-            answer.feedback = feedback
-            answer.is_correct = marks >= float(question.marks)
-            answer.graded_by_service = "mock"
-            answer.graded_at = timezone.now()
-            answer.save()
+            answer.apply_grade(marks, feedback, "mock", entry["marks"])
 
             total_marks_obtained += marks
-            total_possible_marks += float(question.marks)
+            total_possible_marks += entry["marks"]
 
             grading_details.append(
                 {
-                    "question_uuid": str(question.uuid),
+                    "question_uuid": entry["uuid"],
                     "marks_obtained": marks,
-                    "marks_possible": float(question.marks),
+                    "marks_possible": entry["marks"],
                     "feedback": feedback,
                 }
             )
 
+        # One UPDATE for the whole submission instead of a validated save() per answer
+        Answer.objects.bulk_update(answers, Answer.GRADED_FIELDS)
+
         return {
             "total_score": total_marks_obtained,
             "total_possible": total_possible_marks,
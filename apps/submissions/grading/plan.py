@@ -0,0 +1,353 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from django.conf import settings
+from apps.common.utils.ttl_cache import TTLCache
+
+# Bump when the compiled entry layout changes so stale plan files are never reused
+PLAN_FORMAT_VERSION = 3
+
+PLAN_SOURCE_FIELDS = (
+    "id",
+    "uuid",
+    "question_type",
+    "marks",
+    "correct_answer",
+    "grading_rubric",
+    "case_sensitive",
+)
+
+DEFAULT_KEYWORD_WEIGHT = 0.4
+DEFAULT_SIMILARITY_WEIGHT = 0.6
+DEFAULT_MIN_LENGTH = 100
+MAX_EXTRACTED_KEYWORDS = 10
+
+
+def extract_keywords(text: str) -> List[str]:
+    """Extract important keywords from text, in order of first appearance."""
+    words = re.findall(r"\b[a-z]{4,}\b", text.lower())
+    return list(dict.fromkeys(words))[:MAX_EXTRACTED_KEYWORDS]
+
+
+def compile_question(row: Dict, rubric: Dict = None) -> Dict:
+    """Resolve everything the mock grader derives from a question into a flat entry."""
+    rubric = rubric or row.get("grading_rubric") or {}
+    question_type = row["question_type"]
+    entry = {"uuid": str(row["uuid"]), "type": question_type, "marks": float(row["marks"])}
+
+    if question_type == "MCQ":
+        expected = (row["correct_answer"] or "").strip()
+        entry.update(
+            {
+                "expected": expected,
+                "case_sensitive": row["case_sensitive"],
+                "match": expected if row["case_sensitive"] else expected.lower(),
+            }
+        )
+    elif question_type == "SHORT_ANSWER":
+        expected = row["correct_answer"]
+        keywords = (rubric.get("keywords") or extract_keywords(expected)) if expected else []
+        entry.update(
+            {
+                "expected": expected,
+                "keywords": keywords,
+                "keywords_lower": [kw.lower() for kw in keywords],
+                "keyword_weight": rubric.get("keyword_weight", DEFAULT_KEYWORD_WEIGHT),
+                "similarity_weight": rubric.get("similarity_weight", DEFAULT_SIMILARITY_WEIGHT),
+            }
+        )
+    elif question_type == "ESSAY":
+        keywords = rubric.get("keywords", [])
+        entry.update(
+            {
+                "min_length": rubric.get("min_length", DEFAULT_MIN_LENGTH),
+                "keywords": keywords,
+                "keywords_lower": [kw.lower() for kw in keywords],
+            }
+        )
+    return entry
+
+
+def plan_hash(rows: List[Dict]) -> str:
+    """Content hash of the question fields a plan is compiled from."""
+    payload = json.dumps([PLAN_FORMAT_VERSION, rows], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def compile_grading_plan(rows: List[Dict]) -> Dict:
+    """Compile question rows (``PLAN_SOURCE_FIELDS``) into a plan keyed by question id."""
+    rows = sorted(rows, key=lambda row: row["id"])
+    return {
+        "hash": plan_hash(rows),
+        "questions": {row["id"]: compile_question(row) for row in rows},
+    }
+
+
+# Plan file layout, little-endian: a header, one fixed-size record per question
+# sorted by id, then a pool of UTF-8 strings and string lists the records point into.
+# Strings are (offset, length) pairs, with NO_VALUE as the length of None; lists are
+# (offset, count) pairs pointing at ``count`` string pairs in the pool.
+PLAN_MAGIC = b"AGPL"
+_HEADER = struct.Struct("<4sHHI64s")
+_RECORD = struct.Struct("<I16s10IB3x4d")
+_REF = struct.Struct("<II")
+NO_VALUE = 0xFFFFFFFF
+CASE_SENSITIVE = 1
+
+# Entry keys each question type compiles to, besides uuid, type and marks
+ENTRY_FIELDS = {
+    "MCQ": ("expected", "case_sensitive", "match"),
+    "SHORT_ANSWER": ("expected", "keywords", "keywords_lower", "keyword_weight", "similarity_weight"),
+    "ESSAY": ("min_length", "keywords", "keywords_lower"),
+}
+
+
+class _Pool:
+    def __init__(self, start: int):
+        self.start = start
+        self.data = bytearray()
+
+    def string(self, value: Optional[str]):
+        if value is None:
+            return 0, NO_VALUE
+        encoded = str(value).encode()
+        offset = self.start + len(self.data)
+        self.data += encoded
+        return offset, len(encoded)
+
+    def strings(self, values: List[str]):
+        refs = [self.string(value) for value in values or []]
+        offset = self.start + len(self.data)
+        for ref in refs:
+            self.data += _REF.pack(*ref)
+        return offset, len(refs)
+
+
+def encode_plan(plan: Dict) -> bytes:
+    """Serialize a compiled plan into the memory-mappable layout described above."""
+    entries = sorted(plan["questions"].items())
+    pool = _Pool(_HEADER.size + _RECORD.size * len(entries))
+    records = bytearray(_HEADER.pack(PLAN_MAGIC, PLAN_FORMAT_VERSION, 0, len(entries), plan["hash"].encode()))
+    for question_id, entry in entries:
+        records += _RECORD.pack(
+            question_id,
+            uuid.UUID(str(entry["uuid"])).bytes,
+            *pool.string(entry["type"]),
+            *pool.string(entry.get("expected")),
+            *pool.string(entry.get("match")),
+            *pool.strings(entry.get("keywords")),
+            *pool.strings(entry.get("keywords_lower")),
+            CASE_SENSITIVE if entry.get("case_sensitive") else 0,
+            entry["marks"],
+            entry.get("keyword_weight", 0),
+            entry.get("similarity_weight", 0),
+            entry.get("min_length", 0),
+        )
+    return bytes(records + pool.data)
+
+
+class MappedQuestions(Mapping):
+    """Read-only ``{question id: entry}`` view over a plan buffer; entries are decoded on lookup."""
+
+    def __init__(self, buffer, count: int):
+        self._buffer = buffer
+        self._count = count
+
+    def _id_at(self, index: int) -> int:
+        return struct.unpack_from("<I", self._buffer, _HEADER.size + index * _RECORD.size)[0]
+
+    def _index(self, question_id) -> Optional[int]:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id_at(middle) < question_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self._count and self._id_at(low) == question_id else None
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        return None if length == NO_VALUE else bytes(self._buffer[offset : offset + length]).decode()
+
+    def _strings(self, offset: int, count: int) -> List[str]:
+        return [self._string(*_REF.unpack_from(self._buffer, offset + i * _REF.size)) for i in range(count)]
+
+    def _entry(self, index: int) -> Dict:
+        fields = _RECORD.unpack_from(self._buffer, _HEADER.size + index * _RECORD.size)
+        _, uuid_bytes, *refs, flags, marks, keyword_weight, similarity_weight, min_length = fields
+        values = {
+            "expected": self._string(refs[2], refs[3]),
+            "match": self._string(refs[4], refs[5]),
+            "keywords": self._strings(refs[6], refs[7]),
+            "keywords_lower": self._strings(refs[8], refs[9]),
+            "case_sensitive": bool(flags & CASE_SENSITIVE),
+            "keyword_weight": keyword_weight,
+            "similarity_weight": similarity_weight,
+            "min_length": int(min_length) if min_length.is_integer() else min_length,
+        }
+        question_type = self._string(refs[0], refs[1])
+        entry = {"uuid": str(uuid.UUID(bytes=uuid_bytes)), "type": question_type, "marks": marks}
+        entry.update({key: values[key] for key in ENTRY_FIELDS.get(question_type, ())})
+        return entry
+
+    def __getitem__(self, question_id) -> Dict:
+        index = self._index(question_id) if isinstance(question_id, int) else None
+        if index is None:
+            raise KeyError(question_id)
+        return self._entry(index)
+
+    def __contains__(self, question_id) -> bool:
+        return isinstance(question_id, int) and self._index(question_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (self._id_at(index) for index in range(self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def decode_plan(buffer) -> Optional[Dict]:
+    """``{"hash", "questions"}`` over a plan buffer, or None if it is not a complete plan of this format."""
+    if len(buffer) < _HEADER.size:
+        return None
+    magic, version, _, count, content_hash = _HEADER.unpack_from(buffer)
+    if magic != PLAN_MAGIC or version != PLAN_FORMAT_VERSION or len(buffer) < _HEADER.size + count * _RECORD.size:
+        return None
+    return {"hash": content_hash.decode(), "questions": MappedQuestions(buffer, count)}
+
+
+class GradingPlanStore:
+    """Compiled grading plans as memory-mapped binary files, with a bounded per-process cache of mappings.
+
+    Plan files are content addressed (``<exam uuid>-<hash>.plan`` for the live
+    questions, ``version-<id>-<hash>.plan`` for an ExamVersion snapshot) and
+    written atomically, so any number of workers can compile or read the same
+    plan without coordination. ``Exam.grading_plan_hash`` points at the live one.
+    Workers map the files read-only, so every worker on a host shares the pages
+    of one copy and only decodes the entries it grades with. Files hold data only,
+    so a plan directory writable by others cannot run code. Each process keeps the
+    ``GRADING_PLAN_CACHE_SIZE`` most recently used mappings open.
+    """
+
+    _plans: Optional[TTLCache] = None
+
+    @classmethod
+    def plan_cache(cls) -> TTLCache:
+        if cls._plans is None:
+            # Plans are immutable once written; the TTL only closes mappings nobody grades with
+            cls._plans = TTLCache(
+                maxsize=getattr(settings, "GRADING_PLAN_CACHE_SIZE", 256),
+                ttl=getattr(settings, "GRADING_PLAN_CACHE_TTL", 60 * 60),
+            )
+        return cls._plans
+
+    @staticmethod
+    def directory() -> Path:
+        return Path(getattr(settings, "GRADING_PLAN_DIR", Path(tempfile.gettempdir()) / "acad_ai_grading_plans"))
+
+    @classmethod
+    def path_for(cls, key: str) -> Path:
+        return cls.directory() / f"{key}.plan"
+
+    @staticmethod
+    def live_key(exam_uuid, content_hash: str) -> str:
+        return f"{exam_uuid}-{content_hash}"
+
+    @staticmethod
+    def version_key(exam_version) -> str:
+        return f"version-{exam_version.id}-{exam_version.content_hash}"
+
+    @staticmethod
+    def source_rows(exam) -> List[Dict]:
+        return list(exam.questions.order_by("id").values(*PLAN_SOURCE_FIELDS))
+
+    @classmethod
+    def write(cls, key: str, plan: Dict) -> Path:
+        path = cls.path_for(key)
+        if path.exists():
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(encode_plan(plan))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return path
+
+    @classmethod
+    def read(cls, key: str) -> Optional[Dict]:
+        plans = cls.plan_cache()
+        plan = plans.get(key)
+        if plan is not None:
+            return plan
+
+        path = cls.path_for(key)
+        try:
+            with open(path, "rb") as handle:
+                # The mapping stays valid after the file is closed
+                plan = decode_plan(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError):
+            plan = None
+        if plan is None:
+            # Files are written atomically, so this one is damaged; let the caller's recompile replace it
+            path.unlink(missing_ok=True)
+            return None
+
+        plans.set(key, plan)
+        return plan
+
+    @classmethod
+    def compile(cls, exam) -> Dict:
+        """Compile and store the exam's plan, recording its hash on the exam."""
+        from apps.exams.models import Exam
+
+        plan = compile_grading_plan(cls.source_rows(exam))
+        cls.write(cls.live_key(exam.uuid, plan["hash"]), plan)
+        if exam.grading_plan_hash != plan["hash"]:
+            exam.grading_plan_hash = plan["hash"]
+            Exam.objects.filter(pk=exam.pk).update(grading_plan_hash=plan["hash"])
+        return plan
+
+    @classmethod
+    def get(cls, exam) -> Dict:
+        """Plan for the exam, compiling it when missing (new worker host, exam edited outside the API)."""
+        plan = cls.read(cls.live_key(exam.uuid, exam.grading_plan_hash)) if exam.grading_plan_hash else None
+        return plan if plan is not None else cls.compile(exam)
+
+    @classmethod
+    def for_version(cls, exam_version) -> Dict:
+        """Plan compiled from an immutable ExamVersion snapshot; the snapshot is only read on a miss."""
+        key = cls.version_key(exam_version)
+        plan = cls.read(key)
+        if plan is None:
+            rows = [
+                {field: question[field] for field in PLAN_SOURCE_FIELDS}
+                for question in exam_version.snapshot["questions"]
+            ]
+            plan = compile_grading_plan(rows)
+            cls.write(key, plan)
+        return plan
+
+    @classmethod
+    def for_submission(cls, submission) -> Dict:
+        """Plan a submission is graded with: its exam version, or the live questions for legacy rows."""
+        if submission.exam_version_id is not None:
+            return cls.for_version(submission.exam_version)
+        return cls.get(submission.exam)
+
+    @classmethod
+    def clear(cls):
+        cls._plans = None
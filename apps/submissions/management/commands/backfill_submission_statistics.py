@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from apps.submissions.models import Submission, Answer
+
+
+class Command(BaseCommand):
+    help = "Populate denormalized grading statistics (questions_answered, correct_count, accuracy, passed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Submissions processed per batch.")
+        parser.add_argument(
+            "--all", action="store_true", help="Recompute every graded submission, not only missing rows."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Submission.objects.filter(status="COMPLETED").select_related("exam").order_by("id")
+        if not options["all"]:
+            queryset = queryset.filter(accuracy__isnull=True)
+
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            # One grouped query per batch instead of one aggregate per submission
+            counts = {
+                row["submission_id"]: row
+                for row in Answer.objects.filter(submission_id__in=[s.id for s in batch])
+                .values("submission_id")
+                .annotate(answered=Count("id"), correct=Count("id", filter=Q(is_correct=True)))
+            }
+            now = timezone.now()
+            for submission in batch:
+                row = counts.get(submission.id, {"answered": 0, "correct": 0})
+                submission.apply_statistics(row["answered"], row["correct"])
+                # bulk_update skips auto_now; bump it so cached detail ETags rotate
+                submission.updated_at = now
+
+            with transaction.atomic():
+                Submission.objects.bulk_update(
+                    batch,
+                    ["questions_answered", "correct_count", "accuracy", "passed", "updated_at"],
+                    batch_size=batch_size,
+                )
+            updated += len(batch)
+            self.stdout.write(f"Backfilled {updated} submissions...")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled statistics for {updated} submissions."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.exams.models import Exam
+from apps.submissions.grading.plan import GradingPlanStore
+
+
+class Command(BaseCommand):
+    help = "Compile grading plans to GRADING_PLAN_DIR, e.g. when deploying to a new host."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", dest="exam_uuid", help="Only compile the exam with this uuid.")
+
+    def handle(self, *args, **options):
+        exams = Exam.objects.only("id", "uuid", "grading_plan_hash").order_by("id")
+        if options["exam_uuid"]:
+            exams = exams.filter(uuid=options["exam_uuid"])
+            if not exams.exists():
+                raise CommandError(f"Exam {options['exam_uuid']} not found")
+
+        compiled = 0
+        for exam in exams.iterator():
+            GradingPlanStore.compile(exam)
+            compiled += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Compiled grading plans for {compiled} exams."))
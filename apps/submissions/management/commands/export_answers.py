@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.submissions.exports import COLUMNAR_CHUNK_SIZE, COLUMNAR_FORMATS, answers_for_scope, write_answers_columnar
+
+
+class Command(BaseCommand):
+    help = "Export answers joined with questions and submissions to Parquet or an Arrow IPC stream."
+
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group(required=True)
+        scope.add_argument("--exam", dest="exam_uuid", help="Export answers of the exam with this uuid.")
+        scope.add_argument("--course", help="Export answers of every exam in the course (uuid or code).")
+        parser.add_argument("--format", choices=list(COLUMNAR_FORMATS), default="parquet")
+        parser.add_argument("--output", required=True, help="Destination file path.")
+        parser.add_argument("--chunk-size", type=int, default=COLUMNAR_CHUNK_SIZE, help="Rows per record batch.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        answers = answers_for_scope(options["exam_uuid"], options["course"])
+        try:
+            with open(options["output"], "wb") as sink:
+                rows = write_answers_columnar(answers, sink, options["format"], options["chunk_size"])
+        except ImportError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} answers to {options['output']} in {elapsed:.2f}s."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.exams.models import Exam
+from apps.submissions.services import ExamStatsService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the incrementally maintained ExamStats aggregates from graded submissions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", dest="exam_uuid", help="Only rebuild the exam with this uuid.")
+
+    def handle(self, *args, **options):
+        exams = Exam.objects.order_by("id")
+        if options["exam_uuid"]:
+            exams = exams.filter(uuid=options["exam_uuid"])
+            if not exams.exists():
+                raise CommandError(f"Exam {options['exam_uuid']} not found")
+
+        rebuilt = 0
+        for exam_id in exams.values_list("id", flat=True).iterator():
+            ExamStatsService.rebuild(exam_id)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {rebuilt} exams."))
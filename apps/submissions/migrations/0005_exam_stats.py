@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0001_initial"),
+        ("submissions", "0004_submission_statistics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExamStats",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("submission_count", models.PositiveIntegerField(default=0)),
+                ("score_sum", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("score_sum_squares", models.DecimalField(decimal_places=4, default=0, max_digits=20)),
+                ("score_min", models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ("score_max", models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ("pass_count", models.PositiveIntegerField(default=0)),
+                (
+                    "exam",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="stats", to="exams.exam"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "exam_stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="ExamStatsBucket",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("bucket", models.PositiveSmallIntegerField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "stats",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="buckets", to="submissions.examstats"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "exam_stats_buckets",
+                "ordering": ["bucket"],
+                "unique_together": {("stats", "bucket")},
+            },
+        ),
+    ]
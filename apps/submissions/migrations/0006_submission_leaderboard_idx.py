@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0001_initial"),
+        ("submissions", "0005_exam_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(fields=["exam", "status", "-percentage"], name="submission_leaderboard_idx"),
+        ),
+    ]
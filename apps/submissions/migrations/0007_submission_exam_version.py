@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0003_exam_version"),
+        ("submissions", "0006_submission_leaderboard_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="exam_version",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="submissions",
+                to="exams.examversion",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submissions", "0007_submission_exam_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="examstats",
+            name="ranking_version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
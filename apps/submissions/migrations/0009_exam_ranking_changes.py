@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submissions", "0008_exam_stats_ranking_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExamRankingChange",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("version", models.PositiveBigIntegerField()),
+                ("percentage", models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ("delta", models.SmallIntegerField(default=0)),
+                (
+                    "stats",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranking_changes",
+                        to="submissions.examstats",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "exam_ranking_changes",
+                "unique_together": {("stats", "version")},
+            },
+        ),
+    ]
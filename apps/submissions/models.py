@@ -1,10 +1,12 @@
 import uuid
+from decimal import Decimal
 from django.db import models
+from django.db.models import Count, Q
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.conf import settings
 from apps.common.mixins.timestamp_mixin import TimestampMixin
-from apps.exams.models import Exam, Question
+from apps.exams.models import Exam, ExamVersion, Question
 
 
 class Submission(TimestampMixin):
@@ -22,6 +24,10 @@ class Submission(TimestampMixin):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="submissions", db_index=True
     )
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="submissions", db_index=True)
+    # Question snapshot the submission was taken and is graded against (NULL for legacy rows)
+    exam_version = models.ForeignKey(
+        ExamVersion, on_delete=models.SET_NULL, null=True, blank=True, related_name="submissions"
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING", db_index=True)
     started_at = models.DateTimeField(null=True, blank=True, db_index=True)
     submitted_at = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -31,6 +37,12 @@ class Submission(TimestampMixin):
     time_taken_minutes = models.PositiveIntegerField()
     ip_address = models.GenericIPAddressField(null=True, blank=True)
 
+    # Grading statistics, denormalized when grading completes
+    questions_answered = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    accuracy = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    passed = models.BooleanField(null=True, blank=True)
+
     class Meta:
         db_table = "submissions"
         indexes = [
@@ -40,6 +52,7 @@ class Submission(TimestampMixin):
             models.Index(fields=["status"]),
             models.Index(fields=["submitted_at"]),
             models.Index(fields=["student", "exam", "status"], name="student_submission_idx"),
+            models.Index(fields=["exam", "status", "-percentage"], name="submission_leaderboard_idx"),
         ]
         unique_together = [["student", "exam"]]
 
@@ -59,12 +72,45 @@ class Submission(TimestampMixin):
                 self.percentage = (self.score / self.exam.total_marks) * 100
 
     def save(self, *args, **kwargs):
-        """Override save to call clean validation."""
+        """Override save to call clean validation.
+
+        With ``update_fields`` only those fields are validated, so grading saves
+        skip the foreign key and uniqueness queries for columns they do not write.
+        """
         if self.score is not None and self.exam and self.exam.total_marks > 0:
             self.percentage = (self.score / self.exam.total_marks) * 100
-        self.full_clean()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.full_clean()
+        else:
+            self.full_clean(exclude=[field.name for field in self._meta.fields if field.name not in update_fields])
         super().save(*args, **kwargs)
 
+    # Written by grade_submission once grading completes
+    GRADED_FIELDS = [
+        "status",
+        "score",
+        "percentage",
+        "passed",
+        "graded_at",
+        "questions_answered",
+        "correct_count",
+        "accuracy",
+        "updated_at",
+    ]
+
+    def refresh_statistics(self):
+        """Recompute the denormalized grading statistics from the answers table (does not save)."""
+        totals = self.answers.aggregate(answered=Count("id"), correct=Count("id", filter=Q(is_correct=True)))
+        self.apply_statistics(totals["answered"], totals["correct"])
+
+    def apply_statistics(self, answered: int, correct: int):
+        """Set the denormalized statistics from answer counts and the current score (does not save)."""
+        self.questions_answered = answered
+        self.correct_count = correct
+        self.accuracy = round(Decimal(correct * 100) / answered, 2) if answered else Decimal("0")
+        self.passed = None if self.score is None else self.score >= self.exam.passing_marks
+
     def __str__(self):
         return f"{self.student.email} - {self.exam.title} - {self.status}"
 
@@ -110,5 +156,109 @@ class Answer(TimestampMixin):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    # Written by graders in one bulk_update per submission
+    GRADED_FIELDS = ["marks_obtained", "feedback", "is_correct", "graded_by_service", "graded_at", "updated_at"]
+
+    def apply_grade(self, marks, feedback: str, service: str, marks_possible):
+        """Set the grading fields as save() would, without its per-row validation queries."""
+        self.marks_obtained = Decimal(str(marks))
+        self.feedback = feedback
+        self.is_correct = self.marks_obtained >= Decimal(str(marks_possible))
+        self.graded_by_service = service
+        self.graded_at = self.updated_at = timezone.now()
+
     def __str__(self):
         return f"Answer to Q{self.question.order} - {self.answer_text[:50]}"
+
+
+class ExamStats(TimestampMixin):
+    """Running aggregate of graded submission scores for an exam.
+
+    Updated atomically with F() expressions whenever a submission is graded,
+    regraded or deleted, so exam-level statistics are O(1) reads.
+    ``ranking_version`` numbers the ExamRankingChange log of scores recorded
+    and retracted, which every process replays onto its in-memory ranking.
+    """
+
+    HISTOGRAM_BUCKETS = 10
+
+    id = models.AutoField(primary_key=True)
+    exam = models.OneToOneField(Exam, on_delete=models.CASCADE, related_name="stats")
+    submission_count = models.PositiveIntegerField(default=0)
+    score_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    score_sum_squares = models.DecimalField(max_digits=20, decimal_places=4, default=0)
+    score_min = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    score_max = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    pass_count = models.PositiveIntegerField(default=0)
+    ranking_version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = "exam_stats"
+
+    @classmethod
+    def bucket_for(cls, percentage) -> int:
+        """Histogram bucket (equal-width percentage ranges) for a submission percentage."""
+        if percentage is None:
+            return 0
+        return max(0, min(int(percentage * cls.HISTOGRAM_BUCKETS // 100), cls.HISTOGRAM_BUCKETS - 1))
+
+    def summary(self) -> dict:
+        """Derived statistics computed from the stored running sums."""
+        count = self.submission_count
+        mean = float(self.score_sum) / count if count else None
+        variance = max(float(self.score_sum_squares) / count - mean**2, 0.0) if count else None
+        width = 100 // self.HISTOGRAM_BUCKETS
+        counts = {bucket.bucket: bucket.count for bucket in self.buckets.all()}
+        return {
+            "submission_count": count,
+            "mean_score": round(mean, 2) if mean is not None else None,
+            "std_score": round(variance**0.5, 2) if variance is not None else None,
+            "min_score": float(self.score_min) if self.score_min is not None else None,
+            "max_score": float(self.score_max) if self.score_max is not None else None,
+            "pass_count": self.pass_count,
+            "pass_rate": round(self.pass_count / count * 100, 2) if count else None,
+            "histogram": [
+                {"min": i * width, "max": (i + 1) * width, "count": counts.get(i, 0)}
+                for i in range(self.HISTOGRAM_BUCKETS)
+            ],
+        }
+
+    def __str__(self):
+        return f"Stats for {self.exam_id} ({self.submission_count} submissions)"
+
+
+class ExamStatsBucket(models.Model):
+    """Fixed-width percentage histogram bucket of an ExamStats row."""
+
+    id = models.AutoField(primary_key=True)
+    stats = models.ForeignKey(ExamStats, on_delete=models.CASCADE, related_name="buckets")
+    bucket = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "exam_stats_buckets"
+        unique_together = [["stats", "bucket"]]
+        ordering = ["bucket"]
+
+    def __str__(self):
+        return f"Bucket {self.bucket}: {self.count}"
+
+
+class ExamRankingChange(models.Model):
+    """One score entering (``delta`` 1) or leaving (-1) an exam's ranking, numbered by ``ExamStats.ranking_version``.
+
+    A row without a percentage marks a rebuild of the stats, after which rankings are rebuilt too.
+    """
+
+    id = models.AutoField(primary_key=True)
+    stats = models.ForeignKey(ExamStats, on_delete=models.CASCADE, related_name="ranking_changes")
+    version = models.PositiveBigIntegerField()
+    percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    delta = models.SmallIntegerField(default=0)
+
+    class Meta:
+        db_table = "exam_ranking_changes"
+        unique_together = [["stats", "version"]]
+
+    def __str__(self):
+        return f"Ranking change {self.version} of stats {self.stats_id}"
@@ -0,0 +1,147 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+# Percentages are bucketed at 0.01 resolution: 0.00 .. 100.00
+RANKING_BUCKETS = 10001
+
+
+class FenwickTree:
+    """Binary indexed tree over integer counts with O(log n) point updates and prefix sums."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+
+    def add(self, index: int, delta: int = 1):
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """Sum of counts in buckets [0, index]."""
+        result = 0
+        i = min(index, self.size - 1) + 1
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+
+class ExamRanking:
+    """Order-statistics index of graded percentages for one exam."""
+
+    def __init__(self, version: int = 0):
+        self.version = version
+        self.tree = FenwickTree(RANKING_BUCKETS)
+
+    @staticmethod
+    def bucket(percentage) -> int:
+        return max(0, min(int(round(float(percentage) * 100)), RANKING_BUCKETS - 1))
+
+    @property
+    def count(self) -> int:
+        return self.tree.total
+
+    def add(self, percentage):
+        self.tree.add(self.bucket(percentage), 1)
+
+    def remove(self, percentage):
+        self.tree.add(self.bucket(percentage), -1)
+
+    def rank(self, percentage) -> int:
+        """1-based competition rank: one more than the number of strictly higher scores."""
+        return self.count - self.tree.prefix_sum(self.bucket(percentage)) + 1
+
+    def percentile_rank(self, percentage) -> Optional[float]:
+        """Percentage of scores below, counting ties as half ((B + 0.5E) / N * 100)."""
+        if not self.count:
+            return None
+        bucket = self.bucket(percentage)
+        below = self.tree.prefix_sum(bucket - 1) if bucket else 0
+        equal = self.tree.prefix_sum(bucket) - below
+        return round((below + 0.5 * equal) / self.count * 100, 2)
+
+
+class ExamRankingIndex:
+    """Per-process registry of ExamRanking trees kept in step through the ExamRankingChange log.
+
+    Every score recorded in or retracted from an exam's stats is logged in the
+    grading transaction under the next ``ExamStats.ranking_version``. A read
+    replays the changes committed since its tree's version, O(log n) each, so
+    every process stays current without rebuilding. A tree is built from the
+    submissions only on its first read, after the stats are rebuilt, or when
+    the changes it is missing were pruned. Each exam has its own lock, so a
+    build only holds up readers of that exam.
+    """
+
+    _rankings: Dict[int, ExamRanking] = {}
+    _locks: Dict[int, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _exam_lock(cls, exam_id) -> threading.Lock:
+        with cls._lock:
+            return cls._locks.setdefault(exam_id, threading.Lock())
+
+    @staticmethod
+    def current_version(exam_id) -> int:
+        from .models import ExamStats
+
+        return ExamStats.objects.filter(exam_id=exam_id).values_list("ranking_version", flat=True).first() or 0
+
+    @staticmethod
+    def _catch_up(exam_id, ranking: ExamRanking) -> bool:
+        """Apply the changes logged since the tree's version; False when only a rebuild can bring it up to date."""
+        from .models import ExamRankingChange
+
+        changes = (
+            ExamRankingChange.objects.filter(stats__exam_id=exam_id, version__gt=ranking.version)
+            .order_by("version")
+            .values_list("version", "percentage", "delta")
+        )
+        for version, percentage, delta in changes:
+            if version != ranking.version + 1 or percentage is None:
+                return False
+            if delta > 0:
+                ranking.add(percentage)
+            else:
+                ranking.remove(percentage)
+            ranking.version = version
+        return True
+
+    @classmethod
+    def _build(cls, exam_id) -> Tuple[ExamRanking, bool]:
+        """A tree of the graded submissions, and whether no grading committed while it was built."""
+        from .models import Submission
+
+        version = cls.current_version(exam_id)
+        ranking = ExamRanking(version)
+        percentages = Submission.objects.filter(
+            exam_id=exam_id, status="COMPLETED", percentage__isnull=False
+        ).values_list("percentage", flat=True)
+        for percentage in percentages.iterator():
+            ranking.add(percentage)
+        return ranking, cls.current_version(exam_id) == version
+
+    @classmethod
+    def get(cls, exam_id) -> ExamRanking:
+        with cls._exam_lock(exam_id):
+            ranking = cls._rankings.get(exam_id)
+            if ranking is not None and cls._catch_up(exam_id, ranking):
+                return ranking
+            ranking, consistent = cls._build(exam_id)
+            if consistent:
+                cls._rankings[exam_id] = ranking
+            else:
+                # A grading committed during the build may or may not be counted, and replaying
+                # it could count it twice; serve this tree once and rebuild on the next read
+                cls._rankings.pop(exam_id, None)
+            return ranking
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._rankings.clear()
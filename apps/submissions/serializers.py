@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict
 from rest_framework import serializers
 from apps.exams.models import Exam, Question
 from apps.submissions.models import Submission, Answer
@@ -49,8 +49,24 @@ class SubmissionSerializer(serializers.ModelSerializer):
             "score",
             "percentage",
             "time_taken_minutes",
+            "questions_answered",
+            "correct_count",
+            "accuracy",
+            "passed",
+        ]
+        read_only_fields = [
+            "id",
+            "status",
+            "started_at",
+            "submitted_at",
+            "graded_at",
+            "score",
+            "percentage",
+            "questions_answered",
+            "correct_count",
+            "accuracy",
+            "passed",
         ]
-        read_only_fields = ["id", "status", "started_at", "submitted_at", "graded_at", "score", "percentage"]
 
 
 class SubmissionListQuerySerializer(serializers.Serializer):
@@ -61,12 +77,14 @@ class SubmissionListQuerySerializer(serializers.Serializer):
 class SubmissionCreateSerializer(serializers.Serializer):
     exam_uuid = serializers.UUIDField(required=True)
     started_at = serializers.DateTimeField(required=False, allow_null=True)
+    # The ``version`` of the exam payload the student answered; required when options are shuffled
+    exam_version = serializers.IntegerField(required=False, min_value=1)
     answers = serializers.ListField(child=serializers.DictField(), min_length=1, required=True)
 
     def validate_exam_uuid(self, value):
         """Validate exam exists and is active."""
         try:
-            exam = Exam.objects.get(uuid=value, is_active=True)
+            exam = Exam.objects.select_related("course").get(uuid=value, is_active=True)
             from django.utils import timezone
 
             now = timezone.now()
@@ -74,10 +92,16 @@ class SubmissionCreateSerializer(serializers.Serializer):
                 raise serializers.ValidationError("Exam has not started yet")
             if exam.end_time and now > exam.end_time:
                 raise serializers.ValidationError("Exam has ended")
+            # Handed to the service through validated_data so it is not fetched twice
+            self.exam = exam
             return value
         except Exam.DoesNotExist:
             raise serializers.ValidationError("Exam not found or not active")
 
+    def validate(self, attrs):
+        attrs["exam"] = self.exam
+        return attrs
+
     def validate_answers(self, value):
         """Validate answer structure."""
         for answer in value:
@@ -94,7 +118,6 @@ class SubmissionDetailSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source="uuid", read_only=True)
     exam = serializers.SerializerMethodField()
     answers = AnswerSerializer(many=True, read_only=True)
-    passed = serializers.SerializerMethodField()
 
     class Meta:
         model = Submission
@@ -110,6 +133,7 @@ class SubmissionDetailSerializer(serializers.ModelSerializer):
             "passed",
             "answers",
         ]
+        read_only_fields = ["passed"]
 
     def get_exam(self, obj) -> Dict:
         """Get exam details."""
@@ -119,9 +143,3 @@ class SubmissionDetailSerializer(serializers.ModelSerializer):
             "total_marks": float(obj.exam.total_marks),
             "passing_marks": float(obj.exam.passing_marks),
         }
-
-    def get_passed(self, obj) -> Optional[bool]:
-        """Check if student passed."""
-        if obj.score is None:
-            return None
-        return float(obj.score) >= float(obj.exam.passing_marks)
@@ -1,14 +1,143 @@
+import logging
 from decimal import Decimal
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
 from django.utils import timezone
+from apps.common.utils.metrics import Metrics
 from apps.common.utils.response_builder import ResponseBuilder
-from apps.exams.models import Exam, Question
-from apps.submissions.models import Submission, Answer
+from apps.exams.models import Question
+from apps.exams.services import ExamVersionService
+from apps.exams.shuffle import seed_bucket, shuffle_seed, unshuffle_answer
+from apps.exams.analytics import ExamAnalyticsCache
+from apps.submissions.models import Submission, Answer, ExamRankingChange, ExamStats, ExamStatsBucket
+from apps.submissions.cache import SubmissionDetailCache
+from apps.submissions.ranking import ExamRankingIndex
 from apps.submissions.grading.grader_factory import GraderFactory
 from apps.submissions.serializers import SubmissionSerializer, SubmissionDetailSerializer, SubmissionCreateSerializer
 
+logger = logging.getLogger("apps")
+
+
+class ExamStatsService:
+    """Maintains the per-exam ExamStats aggregate incrementally."""
+
+    @staticmethod
+    def _get_or_create(exam_id):
+        # Locked until commit, so ranking changes of an exam commit in version order
+        stats, created = ExamStats.objects.select_for_update().get_or_create(exam_id=exam_id)
+        if created:
+            ExamStatsBucket.objects.bulk_create(
+                [ExamStatsBucket(stats=stats, bucket=i) for i in range(ExamStats.HISTOGRAM_BUCKETS)]
+            )
+        return stats
+
+    @staticmethod
+    def _log_ranking_change(stats, percentage=None, delta=0):
+        """Log the change numbered by the ``ranking_version`` bump of the caller's stats UPDATE."""
+        version = stats.ranking_version + 1
+        ExamRankingChange.objects.create(stats=stats, version=version, percentage=percentage, delta=delta)
+        retention = getattr(settings, "RANKING_CHANGE_RETENTION", 1000)
+        if version % retention == 0:
+            ExamRankingChange.objects.filter(stats=stats, version__lte=version - retention).delete()
+
+    @staticmethod
+    @transaction.atomic
+    def record(exam_id, score, percentage, passed):
+        """Add a graded score to the exam aggregate."""
+        stats = ExamStatsService._get_or_create(exam_id)
+        score_value = Value(score, output_field=DecimalField(max_digits=6, decimal_places=2))
+        ExamStats.objects.filter(pk=stats.pk).update(
+            submission_count=F("submission_count") + 1,
+            score_sum=F("score_sum") + score,
+            score_sum_squares=F("score_sum_squares") + score * score,
+            score_min=Coalesce(Least(F("score_min"), score_value), score_value),
+            score_max=Coalesce(Greatest(F("score_max"), score_value), score_value),
+            pass_count=F("pass_count") + (1 if passed else 0),
+            ranking_version=F("ranking_version") + 1,
+            updated_at=timezone.now(),
+        )
+        ExamStatsBucket.objects.filter(stats=stats, bucket=ExamStats.bucket_for(percentage)).update(
+            count=F("count") + 1
+        )
+        ExamStatsService._log_ranking_change(stats, percentage, 1)
+
+    @staticmethod
+    @transaction.atomic
+    def remove(exam_id, score, percentage, passed):
+        """Retract a previously recorded score (regrade or deletion)."""
+        stats = ExamStats.objects.select_for_update().filter(exam_id=exam_id).first()
+        if stats is None:
+            return
+        ExamStats.objects.filter(pk=stats.pk).update(
+            submission_count=F("submission_count") - 1,
+            score_sum=F("score_sum") - score,
+            score_sum_squares=F("score_sum_squares") - score * score,
+            pass_count=F("pass_count") - (1 if passed else 0),
+            ranking_version=F("ranking_version") + 1,
+            updated_at=timezone.now(),
+        )
+        ExamStatsBucket.objects.filter(stats=stats, bucket=ExamStats.bucket_for(percentage)).update(
+            count=F("count") - 1
+        )
+        ExamStatsService._log_ranking_change(stats, percentage, -1)
+
+        # Min/max cannot be decremented; rescan only when the retracted score was an extreme
+        if score in (stats.score_min, stats.score_max):
+            extremes = Submission.objects.filter(exam_id=exam_id, status="COMPLETED", score__isnull=False).aggregate(
+                score_min=Min("score"), score_max=Max("score")
+            )
+            ExamStats.objects.filter(pk=stats.pk).update(**extremes)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(exam_id):
+        """Recompute the aggregate for an exam from scratch."""
+        graded = Submission.objects.filter(exam_id=exam_id, status="COMPLETED", score__isnull=False)
+        totals = graded.aggregate(
+            submission_count=Count("id"),
+            score_sum=Sum("score"),
+            score_sum_squares=Sum(F("score") * F("score")),
+            score_min=Min("score"),
+            score_max=Max("score"),
+            pass_count=Count("id", filter=Q(passed=True)),
+        )
+        totals["score_sum"] = totals["score_sum"] or 0
+        totals["score_sum_squares"] = totals["score_sum_squares"] or 0
+
+        stats = ExamStatsService._get_or_create(exam_id)
+        ExamStats.objects.filter(pk=stats.pk).update(
+            ranking_version=F("ranking_version") + 1, updated_at=timezone.now(), **totals
+        )
+        # Also makes every process rebuild its ranking of the exam
+        ExamStatsService._log_ranking_change(stats)
+
+        counts = [0] * ExamStats.HISTOGRAM_BUCKETS
+        for percentage in graded.values_list("percentage", flat=True).iterator():
+            counts[ExamStats.bucket_for(percentage)] += 1
+        buckets = list(stats.buckets.all())
+        for bucket in buckets:
+            bucket.count = counts[bucket.bucket]
+        ExamStatsBucket.objects.bulk_update(buckets, ["count"])
+        return stats
+
 
 class SubmissionService:
+    @staticmethod
+    def _unshuffle_mcq_answers(answers, exam, exam_version, student):
+        """MCQ labels were chosen from the student's shuffled options; store them as the exam defines them."""
+        seed = shuffle_seed(exam.uuid, exam_version.version, seed_bucket(student.uuid))
+        for answer in answers:
+            if answer.question.question_type == "MCQ":
+                answer.answer_text = unshuffle_answer(
+                    answer.question.options,
+                    answer.answer_text,
+                    seed,
+                    answer.question.uuid,
+                    case_sensitive=answer.question.case_sensitive,
+                )
+
     @staticmethod
     @transaction.atomic
     def create_submission(data, student, request=None):
@@ -17,7 +146,6 @@ class SubmissionService:
             return ResponseBuilder.error("validation", errors=serializer.errors)
 
         validated_data = serializer.validated_data
-        exam_uuid = str(validated_data["exam_uuid"])
         answers_data = validated_data["answers"]
         started_at = validated_data.get("started_at")  # Optional: when student started the exam
 
@@ -30,18 +158,8 @@ class SubmissionService:
             else:
                 ip_address = request.META.get("REMOTE_ADDR")
 
-        # Get exam
-        try:
-            exam = Exam.objects.select_related("course").get(uuid=exam_uuid, is_active=True)
-        except Exam.DoesNotExist:
-            return ResponseBuilder.error("exam_not_found")
-
-        # Validate exam availability
-        now = timezone.now()
-        if exam.start_time and now < exam.start_time:
-            return ResponseBuilder.error("exam_not_started")
-        if exam.end_time and now > exam.end_time:
-            return ResponseBuilder.error("exam_ended")
+        # Exam (with its course) was loaded and checked for availability by the serializer
+        exam = validated_data["exam"]
 
         # Check for duplicate submission
         if Submission.objects.filter(student=student, exam=exam).exists():
@@ -72,13 +190,25 @@ class SubmissionService:
             time_taken = exam.duration_minutes
 
         # Create submission
+        exam_version = ExamVersionService.current(exam)
+        if exam.shuffle_options:
+            # Option labels only map back with the permutation of the version the student was served
+            served_version = validated_data.get("exam_version")
+            if served_version is None:
+                return ResponseBuilder.error(
+                    "validation", errors={"exam_version": ["Required for exams with shuffled options."]}
+                )
+            if served_version != exam_version.version:
+                return ResponseBuilder.error("exam_version_mismatch")
         submission = Submission.objects.create(
             student=student,
             exam=exam,
+            exam_version=exam_version,
             started_at=started_at,
             status="PENDING",
             time_taken_minutes=time_taken,
             ip_address=ip_address,
+            questions_answered=len(answers_data),
         )
 
         # Bulk create answers
@@ -90,17 +220,16 @@ class SubmissionService:
             )
             for ans in answers_data
         ]
+        if exam.shuffle_options:
+            SubmissionService._unshuffle_mcq_answers(answer_objects, exam, exam_version, student)
 
         Answer.objects.bulk_create(answer_objects)
 
         # Grade the submission
         grading_result = SubmissionService.grade_submission(str(submission.uuid))
-        if not grading_result.success:
-            # If grading fails, return error but submission is created
-            submission.refresh_from_db()
 
-        # Reload submission to get updated data
-        submission.refresh_from_db()
+        # Reload the graded (or failed) submission with the relations SubmissionSerializer reads
+        submission = Submission.objects.select_related("exam__course").get(pk=submission.pk)
         submission_data = SubmissionSerializer(submission).data
         submission_data["total_questions"] = len(answers_data)
 
@@ -112,29 +241,49 @@ class SubmissionService:
     @staticmethod
     @transaction.atomic
     def grade_submission(submission_uuid: str):
+        submission = None
+        previous = None
         try:
             submission = (
-                Submission.objects.select_related("exam")
-                .prefetch_related("answers__question")
+                Submission.objects.select_related("exam", "exam_version")
+                .defer("exam_version__snapshot")
+                .prefetch_related("answers")
                 .get(uuid=submission_uuid)
             )
 
-            # Update status to GRADING
-            submission.status = "GRADING"
-            submission.save()
+            # Remember a previous grade so a regrade can retract it from the exam aggregate
+            if submission.status == "COMPLETED" and submission.score is not None:
+                previous = (submission.score, submission.percentage, submission.passed)
+
+            # Grading and the aggregate changes share a savepoint: on failure none of them
+            # stick, so the exam aggregate still counts exactly the previous grade
+            with transaction.atomic():
+                # Update status to GRADING
+                submission.status = "GRADING"
+                submission.save(update_fields=["status", "updated_at"])
+
+                # Create grader based on configuration
+                grader = GraderFactory.create_grader()
+
+                # Grade the submission
+                with Metrics.timed("grading_duration_seconds", grader=type(grader).__name__):
+                    result = grader.grade_submission(submission)
 
-            # Create grader based on configuration
-            grader = GraderFactory.create_grader()
+                # Update submission with results
+                submission.score = Decimal(str(result["total_score"]))
+                submission.percentage = Decimal(str(result["percentage"]))
+                submission.status = "COMPLETED"
+                submission.graded_at = timezone.now()
+                submission.refresh_statistics()
+                submission.save(update_fields=Submission.GRADED_FIELDS)
 
-            # Grade the submission
-            result = grader.grade_submission(submission)
+                if previous:
+                    ExamStatsService.remove(submission.exam_id, *previous)
+                ExamStatsService.record(submission.exam_id, submission.score, submission.percentage, submission.passed)
 
-            # Update submission with results
-            submission.score = Decimal(str(result["total_score"]))
-            submission.percentage = Decimal(str(result["percentage"]))
-            submission.status = "COMPLETED"
-            submission.graded_at = timezone.now()
-            submission.save()
+            # A regrade changes the payload; drop any cached detail view and exam analytics
+            SubmissionDetailCache.invalidate(submission.uuid)
+            ExamAnalyticsCache.invalidate(submission.exam_id)
 
             return ResponseBuilder.success(
                 "success",
@@ -149,13 +298,34 @@ class SubmissionService:
         except Submission.DoesNotExist:
             return ResponseBuilder.error("submission_not_found")
         except Exception as e:
-            try:
-                submission.status = "FAILED"
-                submission.save()
-            except:
-                pass
+            if submission is not None:
+                SubmissionService._mark_failed(submission, previous)
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
 
+    @staticmethod
+    def _mark_failed(submission, previous):
+        """Mark a submission whose grading failed and retract its previous grade, which no longer stands."""
+        try:
+            with transaction.atomic():
+                # Only the status: grading fields set in memory by the failed attempt were rolled back
+                submission.status = "FAILED"
+                submission.save(update_fields=["status", "updated_at"])
+                if previous:
+                    ExamStatsService.remove(submission.exam_id, *previous)
+        except Exception:
+            logger.exception(f"Could not mark submission {submission.uuid} as failed")
+        SubmissionDetailCache.invalidate(submission.uuid)
+        ExamAnalyticsCache.invalidate(submission.exam_id)
+
+    @staticmethod
+    def build_statistics(submission) -> dict:
+        """Statistics block for a submission, read from its denormalized columns."""
+        return {
+            "questions_answered": submission.questions_answered,
+            "correct_answers": submission.correct_count,
+            "accuracy": float(submission.accuracy) if submission.accuracy is not None else 0,
+        }
+
     @staticmethod
     def get_student_submissions(student, query_params=None):
         from .serializers import SubmissionListQuerySerializer, SubmissionSerializer
@@ -194,11 +364,52 @@ class SubmissionService:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
 
     @staticmethod
-    def get_submission_detail(submission_uuid: str, requesting_user):
-        """Get detailed submission results including answers and statistics."""
+    def get_submission_detail(submission_uuid: str, requesting_user, if_none_match: str = None):
+        """Get detailed submission results including answers and statistics.
+
+        Graded submissions are immutable until regraded, so their payload is cached
+        and served with a strong ETag; a matching If-None-Match yields a 304 without
+        touching the answers table.
+        """
         from django.db.models import Prefetch
 
         try:
+            header = (
+                Submission.objects.select_related("exam")
+                .only("id", "uuid", "student_id", "exam_id", "status", "percentage", "updated_at", "exam__updated_at")
+                .get(uuid=submission_uuid)
+            )
+
+            # Authorization check
+            if header.student_id != requesting_user.pk:
+                return ResponseBuilder.error("forbidden")
+
+            headers = None
+            payload_etag = None
+            ranking_stats = {}
+            if header.status == "COMPLETED":
+                # Rank moves as classmates are graded, so it is merged per request and the
+                # response ETag also covers the exam ranking version
+                ranking = ExamRankingIndex.get(header.exam_id)
+                if header.percentage is not None:
+                    ranking_stats = {
+                        "rank": ranking.rank(header.percentage),
+                        "ranked_submissions": ranking.count,
+                        "percentile_rank": ranking.percentile_rank(header.percentage),
+                    }
+                payload_etag = SubmissionDetailCache.etag_for(header.uuid, header.updated_at, header.exam.updated_at)
+                etag = SubmissionDetailCache.etag_for(
+                    header.uuid, header.updated_at, header.exam.updated_at, ranking.version
+                )
+                headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+                if SubmissionDetailCache.matches(etag, if_none_match):
+                    return ResponseBuilder.success("not_modified", headers=headers)
+
+                cached = SubmissionDetailCache.get(header.uuid, payload_etag)
+                if cached is not None:
+                    data = {**cached, "statistics": {**cached["statistics"], **ranking_stats}}
+                    return ResponseBuilder.success("submission_retrieved", data=data, headers=headers)
+
             # Optimized prefetch for answers and questions
             answers_with_questions = Prefetch(
                 "answers", queryset=Answer.objects.select_related("question").order_by("question__order")
@@ -207,32 +418,57 @@ class SubmissionService:
             submission = (
                 Submission.objects.select_related("student", "exam", "exam__course")
                 .prefetch_related(answers_with_questions)
-                .get(uuid=submission_uuid)
+                .get(pk=header.pk)
             )
 
-            # Authorization check
-            if submission.student != requesting_user:
-                return ResponseBuilder.error("forbidden")
-
             serializer = SubmissionDetailSerializer(submission)
-            submission_data = serializer.data
 
-            # Calculate statistics
-            answers = list(submission.answers.all())
-            correct_count = sum(1 for ans in answers if ans.is_correct)
+            data = {
+                "submission": serializer.data,
+                "statistics": SubmissionService.build_statistics(submission),
+            }
+            if payload_etag:
+                SubmissionDetailCache.set(header.uuid, payload_etag, data)
+                data = {**data, "statistics": {**data["statistics"], **ranking_stats}}
 
+            return ResponseBuilder.success("submission_retrieved", data=data, headers=headers)
+        except Submission.DoesNotExist:
+            return ResponseBuilder.error("submission_not_found")
+        except Exception as e:
+            return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
+
+
+class AnswerExportService:
+    @staticmethod
+    def export_answers(exam_uuid=None, course=None, export_format: str = "parquet"):
+        """Write the answers of an exam or course to a spooled temporary file in a columnar format."""
+        import tempfile
+        from apps.submissions.exports import COLUMNAR_FORMATS, answers_for_scope, write_answers_columnar
+
+        export_format = (export_format or "parquet").lower()
+        if export_format not in COLUMNAR_FORMATS:
+            return ResponseBuilder.error(
+                "validation", errors={"format": [f"Supported formats: {', '.join(COLUMNAR_FORMATS)}"]}
+            )
+        if not exam_uuid and not course:
+            return ResponseBuilder.error("validation", errors={"detail": ["Provide an exam or a course."]})
+
+        try:
+            sink = tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024)
+            rows = write_answers_columnar(answers_for_scope(exam_uuid, course), sink, export_format)
+            sink.seek(0)
+            content_type, extension = COLUMNAR_FORMATS[export_format]
+            scope = f"exam-{exam_uuid}" if exam_uuid else f"course-{course}"
             return ResponseBuilder.success(
-                "submission_retrieved",
+                "success",
                 data={
-                    "submission": submission_data,
-                    "statistics": {
-                        "questions_answered": len(answers),
-                        "correct_answers": correct_count,
-                        "accuracy": round((correct_count / len(answers) * 100), 2) if answers else 0,
-                    },
+                    "file": sink,
+                    "rows": rows,
+                    "content_type": content_type,
+                    "filename": f"answers-{scope}.{extension}",
                 },
             )
-        except Submission.DoesNotExist:
-            return ResponseBuilder.error("submission_not_found")
+        except ValueError:
+            return ResponseBuilder.error("validation", errors={"exam": ["Must be a valid UUID."]})
         except Exception as e:
             return ResponseBuilder.error("server_error", errors={"detail": [str(e)]})
@@ -0,0 +1,22 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from apps.exams.models import Course, Exam
+from .models import Submission
+
+
+def _deletes_exam(origin) -> bool:
+    """Whether the deletion started at an exam or course, which takes the exam's stats with it."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (Exam, Course))
+
+
+@receiver(post_delete, sender=Submission)
+def retract_deleted_submission(sender, instance, origin=None, **kwargs):
+    """Keep ExamStats and the ranking index in step when a graded submission is deleted."""
+    from .services import ExamStatsService
+
+    if _deletes_exam(origin):
+        return
+    if instance.status == "COMPLETED" and instance.score is not None:
+        ExamStatsService.remove(instance.exam_id, instance.score, instance.percentage, instance.passed)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import SubmissionCreateView, SubmissionListView, SubmissionDetailView
+from .views import SubmissionCreateView, SubmissionListView, SubmissionDetailView, AnswerExportView
 
 app_name = "submissions"
 
@@ -7,4 +7,5 @@ urlpatterns = [
     path("", SubmissionCreateView.as_view(), name="submission-create"),
     path("list/", SubmissionListView.as_view(), name="submission-list"),
     path("<uuid:uuid>/", SubmissionDetailView.as_view(), name="submission-detail"),
+    path("answers/export/", AnswerExportView.as_view(), name="answer-export"),
 ]
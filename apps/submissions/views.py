@@ -1,10 +1,13 @@
 import traceback
 import logging
+from django.http import FileResponse
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from apps.common.utils.response_utils import server_error_response
-from apps.accounts.permissions import IsStudent
-from .services import SubmissionService
+from apps.common.utils.streaming import FileExportContentNegotiation
+from apps.common.utils.throttling import IPRateThrottle, UserRateThrottle
+from apps.accounts.permissions import IsStudent, IsAdmin
+from .services import SubmissionService, AnswerExportService
 from .serializers import SubmissionCreateSerializer, SubmissionSerializer, SubmissionDetailSerializer
 
 logger = logging.getLogger("apps")
@@ -13,6 +16,8 @@ logger = logging.getLogger("apps")
 class SubmissionCreateView(APIView):
     permission_classes = [IsAuthenticated, IsStudent]
     serializer_class = SubmissionCreateSerializer
+    throttle_classes = [UserRateThrottle, IPRateThrottle]
+    throttle_scope = "submission"
 
     def post(self, request):
         try:
@@ -42,8 +47,38 @@ class SubmissionDetailView(APIView):
 
     def get(self, request, uuid):
         try:
-            result = SubmissionService.get_submission_detail(str(uuid), request.user)
+            result = SubmissionService.get_submission_detail(
+                str(uuid), request.user, if_none_match=request.headers.get("If-None-Match")
+            )
             return result.to_response()
         except Exception:
             logger.error(f"Submission detail error: {traceback.format_exc()}")
             return server_error_response()
+
+
+class AnswerExportView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    content_negotiation_class = FileExportContentNegotiation
+    serializer_class = None
+
+    def get(self, request):
+        try:
+            result = AnswerExportService.export_answers(
+                exam_uuid=request.query_params.get("exam"),
+                course=request.query_params.get("course"),
+                export_format=request.query_params.get("format"),
+            )
+            if not result.success:
+                return result.to_response()
+
+            response = FileResponse(
+                result.data["file"],
+                as_attachment=True,
+                filename=result.data["filename"],
+                content_type=result.data["content_type"],
+            )
+            response["X-Row-Count"] = str(result.data["rows"])
+            return response
+        except Exception:
+            logger.error(f"Answer export error: {traceback.format_exc()}")
+            return server_error_response()
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.common.middleware.metrics_middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -53,6 +54,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "apps.common.middleware.logging_middleware.LoggingMiddleware",
+    "apps.common.middleware.query_budget_middleware.QueryBudgetMiddleware",
     "apps.common.middleware.security_middleware.SecurityHeadersMiddleware",
 ]
 
@@ -89,6 +91,14 @@ DATABASES = {
     }
 }
 
+# Cache
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    # Request throttling counters; point at a shared store (e.g. Redis) so limits hold across workers
+    "throttle": env.cache("THROTTLE_CACHE_URL", default="locmemcache://throttle"),
+}
+THROTTLE_CACHE_ALIAS = "throttle"
+
 # Custom User Model
 AUTH_USER_MODEL = "accounts.User"
 
@@ -125,7 +135,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -136,6 +146,14 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Sliding-window limits (apps.common.utils.throttling), keyed "<view throttle_scope>_<ip|user|email>"
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": env("THROTTLE_LOGIN_IP", default="30/min"),
+        "login_email": env("THROTTLE_LOGIN_EMAIL", default="10/min"),
+        "register_ip": env("THROTTLE_REGISTER_IP", default="20/hour"),
+        "submission_user": env("THROTTLE_SUBMISSION_USER", default="10/min"),
+        "submission_ip": env("THROTTLE_SUBMISSION_IP", default="300/min"),
+    },
 }
 
 # JWT Settings
@@ -156,6 +174,26 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
 }
+# Upper bound on how long a revoked token can still pass if a token_version change was not invalidated
+TOKEN_VERSION_CACHE_TIMEOUT = env.int("TOKEN_VERSION_CACHE_TIMEOUT", default=5 * 60)
+# Token versions are only cached in a cache shared by every process; unset, caching is on only when the
+# default cache is not process-local. Set True for a single-process server, False to always read the database
+TOKEN_VERSION_CACHE_ENABLED = env.bool("TOKEN_VERSION_CACHE_ENABLED", default=None)
+# Per-process cache of authenticated users (CachedJWTAuthentication, and tokens without claims);
+# the TTL bounds how long another process can serve a user after it was changed
+AUTH_USER_CACHE_SIZE = env.int("AUTH_USER_CACHE_SIZE", default=10_000)
+AUTH_USER_CACHE_TTL = env.float("AUTH_USER_CACHE_TTL", default=30)
+# Per-process Bloom filter of blacklisted refresh tokens (see apps.accounts.tokens.TokenBlacklistFilter)
+TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS = env.int("TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS", default=15 * 60)
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = env.float("TOKEN_BLACKLIST_FILTER_ERROR_RATE", default=0.001)
+# The filter needs a cache shared by every process; unset, it is on only when the default cache is not
+# process-local. Set True for a single-process server, False to always check the database
+TOKEN_BLACKLIST_FILTER_ENABLED = env.bool("TOKEN_BLACKLIST_FILTER_ENABLED", default=None)
+# Processes used to hash passwords during bulk student imports; 0 means one per core
+STUDENT_IMPORT_HASH_WORKERS = env.int("STUDENT_IMPORT_HASH_WORKERS", default=0)
+# Largest roster the upload endpoint accepts; each row is hashed inside the request, so keep it well
+# under the worker timeout and use the import_students command for anything bigger
+STUDENT_IMPORT_MAX_ROWS = env.int("STUDENT_IMPORT_MAX_ROWS", default=50)
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Mini Assessment Engine API",
@@ -265,6 +303,12 @@ SPECTACULAR_SETTINGS = {
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
 
 # Logging
+# "verbose" (text) or "json" (one object per line, including structured ``extra`` fields)
+LOG_FORMAT = env("LOG_FORMAT", default="verbose")
+# Fraction of successful (< 400) requests LoggingMiddleware logs; errors are always logged
+LOG_REQUEST_SAMPLE_RATE = env.float("LOG_REQUEST_SAMPLE_RATE", default=1.0)
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+os.makedirs(LOG_DIR, exist_ok=True)
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -273,38 +317,47 @@ LOGGING = {
             "format": "{levelname} {asctime} {module} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "apps.common.utils.logging_utils.JSONFormatter",
+        },
     },
     "handlers": {
         "file": {
             "level": "INFO",
             "class": "logging.handlers.RotatingFileHandler",
-            "filename": os.path.join(BASE_DIR, "logs", "app.log"),
+            "filename": os.path.join(LOG_DIR, "app.log"),
             "maxBytes": 1024 * 1024 * 10,  # 10 MB
             "backupCount": 5,
-            "formatter": "verbose",
+            "formatter": LOG_FORMAT,
         },
         "error_file": {
             "level": "ERROR",
             "class": "logging.handlers.RotatingFileHandler",
-            "filename": os.path.join(BASE_DIR, "logs", "error.log"),
+            "filename": os.path.join(LOG_DIR, "error.log"),
             "maxBytes": 1024 * 1024 * 10,
             "backupCount": 5,
-            "formatter": "verbose",
+            "formatter": LOG_FORMAT,
         },
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": LOG_FORMAT,
+        },
+        # Requests only enqueue records; a background thread writes them to the handlers above.
+        # Must sort after the handlers it references.
+        "queue": {
+            "()": "apps.common.utils.logging_utils.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console", "cfg://handlers.file", "cfg://handlers.error_file"],
         },
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "apps": {
-            "handlers": ["console", "file", "error_file"],
+            "handlers": ["queue"],
             "level": env("LOG_LEVEL", default="INFO"),
             "propagate": False,
         },
@@ -320,3 +373,40 @@ LOGGING = {
 GRADING_SERVICE = env("GRADING_SERVICE", default="mock")
 LLM_API_KEY = env("LLM_API_KEY", default="")
 LLM_MODEL = env("LLM_MODEL", default="gemini-1.5-flash")
+
+# Response caching
+SUBMISSION_DETAIL_CACHE_TIMEOUT = env.int("SUBMISSION_DETAIL_CACHE_TIMEOUT", default=60 * 60 * 24)
+EXAM_ANALYTICS_CACHE_TIMEOUT = env.int("EXAM_ANALYTICS_CACHE_TIMEOUT", default=60 * 60 * 24)
+# Upper bound; the listing otherwise expires at the next exam start/end boundary
+EXAM_LIST_CACHE_MAX_TIMEOUT = env.int("EXAM_LIST_CACHE_MAX_TIMEOUT", default=60 * 60)
+EXAM_DETAIL_CACHE_TIMEOUT = env.int("EXAM_DETAIL_CACHE_TIMEOUT", default=60 * 60)
+# Seconds a request waits for another worker to build an exam payload before building it itself
+EXAM_DETAIL_BUILD_WAIT = env.float("EXAM_DETAIL_BUILD_WAIT", default=5)
+# Students share one of this many question/option orderings per exam version (and cached payload)
+EXAM_SHUFFLE_BUCKETS = env.int("EXAM_SHUFFLE_BUCKETS", default=64)
+
+# Per-process metric snapshots, merged by GET /metrics (see apps.common.utils.metrics)
+METRICS_DIR = env("METRICS_DIR", default=os.path.join(BASE_DIR, "var", "metrics"))
+# Seconds between snapshot writes; bounds how stale other workers' numbers can be in a scrape
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=5)
+# Seconds an exited process's snapshot keeps counting before it is deleted
+METRICS_RETENTION_SECONDS = env.int("METRICS_RETENTION_SECONDS", default=24 * 60 * 60)
+# Bearer token required to scrape /metrics (empty: no authentication)
+METRICS_AUTH_TOKEN = env("METRICS_AUTH_TOKEN", default="")
+
+# Per-request query budget and N+1 detection (QueryBudgetMiddleware); development turns it on
+QUERY_BUDGET_ENABLED = env.bool("QUERY_BUDGET_ENABLED", default=False)
+QUERY_BUDGET_MAX_QUERIES = env.int("QUERY_BUDGET_MAX_QUERIES", default=50)
+# A query shape repeated this many times in one request is reported as a likely N+1
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = env.int("QUERY_BUDGET_N_PLUS_ONE_THRESHOLD", default=10)
+# Raise instead of logging a warning
+QUERY_BUDGET_RAISE = env.bool("QUERY_BUDGET_RAISE", default=False)
+
+# Ranking changes kept per exam; a process further behind rebuilds its ranking from the submissions
+RANKING_CHANGE_RETENTION = env.int("RANKING_CHANGE_RETENTION", default=1000)
+
+# Compiled grading plans, shared by every worker on the host
+GRADING_PLAN_DIR = env("GRADING_PLAN_DIR", default=os.path.join(BASE_DIR, "var", "grading_plans"))
+# Plan files each process keeps mapped (least recently used are dropped first), and for how many seconds
+GRADING_PLAN_CACHE_SIZE = env.int("GRADING_PLAN_CACHE_SIZE", default=256)
+GRADING_PLAN_CACHE_TTL = env.int("GRADING_PLAN_CACHE_TTL", default=60 * 60)
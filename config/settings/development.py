@@ -47,3 +47,6 @@ CSRF_TRUSTED_ORIGINS = [
 
 # Email backend for development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+
+# Log requests that exceed the query budget or repeat a query shape (likely N+1)
+QUERY_BUDGET_ENABLED = env.bool("QUERY_BUDGET_ENABLED", default=True)
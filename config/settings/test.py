@@ -27,3 +27,7 @@ PASSWORD_HASHERS = [
 
 # Disable logging during tests
 LOGGING_CONFIG = None
+
+# Fail requests that exceed the query budget or repeat a query shape (likely N+1)
+QUERY_BUDGET_ENABLED = True
+QUERY_BUDGET_RAISE = True
@@ -19,6 +19,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import HttpResponse
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from apps.common.views import metrics_view
 
 urlpatterns = [
     path('', lambda request: HttpResponse("Welcome to ACAD_AI API"), name='home'),
@@ -26,6 +27,7 @@ urlpatterns = [
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path("metrics", metrics_view, name="metrics"),
     path("auth/", include("apps.accounts.urls")),
     path("exams/", include("apps.exams.urls")),
     path("submissions/", include("apps.submissions.urls")),
@@ -5,6 +5,63 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache, caches
+    from apps.accounts.authentication import CachedJWTAuthentication
+    from apps.accounts.tokens import TokenBlacklistFilter
+    from apps.submissions.ranking import ExamRankingIndex
+
+    cache.clear()
+    caches["throttle"].clear()
+    ExamRankingIndex.clear()
+    CachedJWTAuthentication.user_cache().clear()
+    TokenBlacklistFilter.reset()
+    yield
+    cache.clear()
+    caches["throttle"].clear()
+    ExamRankingIndex.clear()
+    CachedJWTAuthentication.user_cache().clear()
+    TokenBlacklistFilter.reset()
+
+
+@pytest.fixture(autouse=True)
+def grading_plan_dir(settings, tmp_path):
+    from apps.submissions.grading.plan import GradingPlanStore
+
+    settings.GRADING_PLAN_DIR = tmp_path / "grading_plans"
+    GradingPlanStore.clear()
+    yield settings.GRADING_PLAN_DIR
+    GradingPlanStore.clear()
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    from apps.common.utils.metrics import Metrics
+
+    settings.METRICS_DIR = tmp_path / "metrics"
+    Metrics.reset()
+    yield settings.METRICS_DIR
+    Metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budget(settings):
+    # Requests over QUERY_BUDGET_MAX_QUERIES or repeating a query shape fail the test
+    settings.QUERY_BUDGET_RAISE = True
+
+
+@pytest.fixture
+def query_budget():
+    """``with query_budget(8): client.get(...)`` fails when the block runs more than 8 queries or an N+1 pattern."""
+    from apps.common.utils.query_budget import QueryBudget
+
+    def budget(max_queries=None, n_plus_one_threshold=5):
+        return QueryBudget(max_queries, n_plus_one_threshold, label="test", raise_on_violation=True)
+
+    return budget
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
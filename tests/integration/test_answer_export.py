@@ -0,0 +1,75 @@
+import io
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from rest_framework import status
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestAnswerExport:
+    def _answers(self, sample_exam, count=3):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        question = QuestionFactory(exam=sample_exam, order=1)
+        for _ in range(count):
+            AnswerFactory(
+                submission=SubmissionFactory(exam=sample_exam),
+                question=question,
+                marks_obtained=5,
+                graded_by_service="mock",
+            )
+
+    def _admin_client(self, api_client):
+        from tests.factories.user_factory import UserFactory
+
+        api_client.force_authenticate(user=UserFactory(role="ADMIN"))
+        return api_client
+
+    def test_parquet_export(self, api_client, sample_exam):
+        import pyarrow.parquet as pq
+
+        self._answers(sample_exam)
+
+        response = self._admin_client(api_client).get(
+            f"/submissions/answers/export/?exam={sample_exam.uuid}&format=parquet"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        assert table.num_rows == 3
+        assert pa.types.is_dictionary(table.schema.field("question_type").type)
+        assert table.column("marks_obtained").to_pylist() == [5.0, 5.0, 5.0]
+
+    def test_arrow_export_by_course_code(self, api_client, sample_exam):
+        self._answers(sample_exam, count=2)
+
+        response = self._admin_client(api_client).get(
+            f"/submissions/answers/export/?course={sample_exam.course.code}&format=arrow"
+        )
+
+        table = pa.ipc.open_stream(b"".join(response.streaming_content)).read_all()
+        assert table.num_rows == 2
+        assert table.column("graded_by_service").to_pylist() == ["mock", "mock"]
+
+    def test_non_admin_forbidden(self, instructor_client, sample_exam):
+        response = instructor_client.get(f"/submissions/answers/export/?exam={sample_exam.uuid}")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_command_chunks_record_batches(self, sample_exam, tmp_path):
+        import pyarrow.parquet as pq
+
+        self._answers(sample_exam, count=5)
+        output = tmp_path / "answers.parquet"
+
+        call_command(
+            "export_answers", exam_uuid=str(sample_exam.uuid), output=str(output), chunk_size=2, stdout=StringIO()
+        )
+
+        parquet = pq.ParquetFile(output)
+        assert parquet.metadata.num_rows == 5
+        assert parquet.metadata.num_row_groups == 3
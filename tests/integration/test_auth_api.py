@@ -145,3 +145,19 @@ class TestAuthAPI:
 
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["data"]["user"]["email"] == "test@example.com"
+
+    def test_login_email_is_case_insensitive(self, api_client, student_user):
+        data = {"email": f"  {student_user.email.upper()} ", "password": "testpass123"}
+
+        response = api_client.post("/auth/login/", data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["data"]["user"]["email"] == student_user.email
+
+    def test_email_lookups_use_the_lower_email_index(self, student_user):
+        from django.db import IntegrityError, transaction
+        from apps.accounts.models import User
+
+        assert "users_email_lower_uniq" in User.objects.by_email(student_user.email.upper()).explain()
+        with pytest.raises(IntegrityError), transaction.atomic():
+            User.objects.bulk_create([User(email=student_user.email.title(), first_name="A", last_name="B")])
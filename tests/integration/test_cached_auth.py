@@ -0,0 +1,58 @@
+import time
+import pytest
+from unittest.mock import patch
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.authentication import CachedJWTAuthentication
+
+
+def _authenticate(token):
+    request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return CachedJWTAuthentication().authenticate(request)[0]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    @pytest.fixture
+    def token(self, student_user):
+        return str(RefreshToken.for_user(student_user).access_token)
+
+    def test_repeat_lookups_are_served_from_the_cache(self, student_user, token):
+        _authenticate(token)
+
+        with CaptureQueriesContext(connection) as queries:
+            user = _authenticate(token)
+
+        assert len(queries) == 0
+        assert user == student_user and user.email == student_user.email
+
+    def test_each_request_gets_its_own_copy(self, student_user, token):
+        _authenticate(token).first_name = "Mutated"
+
+        assert _authenticate(token).first_name == student_user.first_name
+
+    def test_user_writes_evict_the_entry(self, student_user, token):
+        _authenticate(token)
+        student_user.first_name = "Renamed"
+        student_user.save()
+
+        assert _authenticate(token).first_name == "Renamed"
+
+        student_user.is_active = False
+        student_user.save()
+        with pytest.raises(AuthenticationFailed):
+            _authenticate(token)
+
+    def test_ttl_expiry_picks_up_changes_from_other_processes(self, student_user, token, settings):
+        _authenticate(token)
+        type(student_user).objects.filter(pk=student_user.pk).update(first_name="Elsewhere")
+
+        assert _authenticate(token).first_name == student_user.first_name
+
+        later = time.monotonic() + settings.AUTH_USER_CACHE_TTL + 1
+        with patch("apps.common.utils.ttl_cache.time.monotonic", return_value=later):
+            assert _authenticate(token).first_name == "Elsewhere"
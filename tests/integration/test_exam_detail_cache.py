@@ -0,0 +1,76 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.exams.cache import ExamDetailCache
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestExamDetailCache:
+    def test_repeat_request_skips_question_query(self, authenticated_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory(exam=sample_exam, order=1)
+        authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+
+        assert len(response.data["data"]["questions"]) == 1
+        assert not any('"questions"' in query["sql"] for query in queries.captured_queries)
+
+    def test_question_edit_outside_service_changes_key(
+        self, authenticated_client, sample_exam, django_capture_on_commit_callbacks
+    ):
+        from tests.factories.exam_factory import QuestionFactory
+
+        question = QuestionFactory(exam=sample_exam, order=1)
+        authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+
+        question.question_text = "Edited in admin"
+        with django_capture_on_commit_callbacks(execute=True):
+            question.save()
+        response = authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+
+        assert response.data["data"]["questions"][0]["question_text"] == "Edited in admin"
+
+    def test_waiters_reuse_payload_built_by_lock_holder(self, sample_exam):
+        key = ExamDetailCache._key(sample_exam.uuid, sample_exam.updated_at)
+        cache.add(f"{key}:lock", 1)
+        build_calls = []
+
+        def other_worker_finishes(_):
+            cache.set(key, {"title": "built elsewhere"})
+
+        with patch("apps.exams.cache.time.sleep", side_effect=other_worker_finishes):
+            data = ExamDetailCache.get_or_build(sample_exam.uuid, sample_exam.updated_at, build_calls.append)
+
+        assert data == {"title": "built elsewhere"}
+        assert build_calls == []
+
+    def test_waiter_builds_itself_after_timeout(self, settings, sample_exam):
+        settings.EXAM_DETAIL_BUILD_WAIT = 0
+        key = ExamDetailCache._key(sample_exam.uuid, sample_exam.updated_at)
+        cache.add(f"{key}:lock", 1)
+
+        data = ExamDetailCache.get_or_build(sample_exam.uuid, sample_exam.updated_at, lambda: {"title": "fallback"})
+
+        assert data == {"title": "fallback"}
+
+    def test_warm_command_builds_upcoming_exams(self, sample_exam):
+        from tests.factories.exam_factory import ExamFactory
+
+        upcoming = ExamFactory(start_time=timezone.now() + timedelta(minutes=10))
+        out = StringIO()
+
+        call_command("warm_exam_cache", "--minutes", "30", stdout=out)
+
+        assert cache.get(ExamDetailCache._key(upcoming.uuid, upcoming.updated_at))["id"] == str(upcoming.uuid)
+        assert cache.get(ExamDetailCache._key(sample_exam.uuid, sample_exam.updated_at)) is None
+        assert "Warmed 1 exams" in out.getvalue()
@@ -0,0 +1,45 @@
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.exams.cache import ActiveExamListCache
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestActiveExamListCache:
+    def test_second_request_is_served_from_cache(self, authenticated_client, sample_exam):
+        authenticated_client.get("/exams/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get("/exams/")
+
+        assert response.data["data"]["count"] == 1
+        assert not any('"exams"' in query["sql"] for query in queries.captured_queries)
+
+    def test_exam_save_invalidates_listing(self, authenticated_client, sample_exam, django_capture_on_commit_callbacks):
+        authenticated_client.get("/exams/")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sample_exam.title = "Renamed exam"
+            sample_exam.save()
+        response = authenticated_client.get("/exams/")
+
+        assert response.data["data"]["results"][0]["title"] == "Renamed exam"
+
+    def test_ttl_ends_at_next_window_boundary(self, sample_exam):
+        from tests.factories.exam_factory import ExamFactory
+
+        now = timezone.now()
+        ExamFactory(start_time=now + timedelta(minutes=5), end_time=now + timedelta(hours=3))
+
+        # sample_exam closes in two hours; the upcoming exam opens in five minutes
+        assert ActiveExamListCache.seconds_until_next_boundary(now) == 5 * 60 + 1
+
+    def test_ttl_capped_without_boundaries(self, settings, sample_exam):
+        settings.EXAM_LIST_CACHE_MAX_TIMEOUT = 120
+        sample_exam.start_time = sample_exam.end_time = None
+        sample_exam.save()
+
+        assert ActiveExamListCache.seconds_until_next_boundary() == 120
@@ -0,0 +1,104 @@
+import pytest
+from rest_framework import status
+from apps.submissions.models import Answer
+
+OPTIONS = {"A": "2", "B": "3", "C": "4", "D": "5", "E": "6", "F": "7"}
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestExamShuffleAPI:
+    @pytest.fixture
+    def shuffled_exam(self, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        sample_exam.shuffle_questions = True
+        sample_exam.shuffle_options = True
+        sample_exam.save()
+        for order in range(1, 9):
+            QuestionFactory(exam=sample_exam, order=order, options=OPTIONS, correct_answer="C", marks=1)
+        return sample_exam
+
+    def test_students_get_stable_orderings_that_differ_across_buckets(self, api_client, shuffled_exam, settings):
+        from tests.factories.user_factory import UserFactory
+
+        settings.EXAM_SHUFFLE_BUCKETS = 1000
+        orderings = set()
+        for student in UserFactory.create_batch(3, role="STUDENT"):
+            api_client.force_authenticate(user=student)
+            first = api_client.get(f"/exams/{shuffled_exam.uuid}/").data["data"]["questions"]
+            again = api_client.get(f"/exams/{shuffled_exam.uuid}/").data["data"]["questions"]
+            assert first == again
+            orderings.add(tuple(question["id"] for question in first))
+
+        assert len(orderings) > 1
+
+    def test_unshuffled_exams_keep_stored_order(self, authenticated_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        questions = [QuestionFactory(exam=sample_exam, order=order, options=OPTIONS) for order in (1, 2, 3)]
+
+        data = authenticated_client.get(f"/exams/{sample_exam.uuid}/").data["data"]
+
+        assert [question["id"] for question in data["questions"]] == [str(question.uuid) for question in questions]
+        assert all(question["options"] == OPTIONS for question in data["questions"])
+
+    def _correct_answers(self, payload):
+        return [
+            {
+                "question_uuid": question["id"],
+                # The label showing the correct text ("4") in this student's ordering
+                "answer_text": next(label for label, text in question["options"].items() if text == "4"),
+            }
+            for question in payload["questions"]
+        ]
+
+    def _submit(self, client, exam, answers, **extra):
+        return client.post("/submissions/", {"exam_uuid": str(exam.uuid), "answers": answers, **extra}, format="json")
+
+    def test_shuffled_labels_are_inverted_before_grading(self, authenticated_client, shuffled_exam):
+        payload = authenticated_client.get(f"/exams/{shuffled_exam.uuid}/").data["data"]
+
+        response = self._submit(
+            authenticated_client, shuffled_exam, self._correct_answers(payload), exam_version=payload["version"]
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert set(Answer.objects.values_list("answer_text", flat=True)) == {"C"}
+        assert all(Answer.objects.values_list("is_correct", flat=True))
+
+    def test_lowercase_labels_are_inverted_too(self, authenticated_client, shuffled_exam):
+        payload = authenticated_client.get(f"/exams/{shuffled_exam.uuid}/").data["data"]
+        answers = [
+            {**answer, "answer_text": answer["answer_text"].lower()} for answer in self._correct_answers(payload)
+        ]
+
+        response = self._submit(authenticated_client, shuffled_exam, answers, exam_version=payload["version"])
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert all(Answer.objects.values_list("is_correct", flat=True))
+
+    def test_answers_to_a_superseded_version_are_rejected(
+        self, authenticated_client, shuffled_exam, django_capture_on_commit_callbacks
+    ):
+        payload = authenticated_client.get(f"/exams/{shuffled_exam.uuid}/").data["data"]
+        question = shuffled_exam.questions.first()
+        question.question_text = "Edited in admin"
+        with django_capture_on_commit_callbacks(execute=True):
+            question.save()
+
+        response = self._submit(
+            authenticated_client, shuffled_exam, self._correct_answers(payload), exam_version=payload["version"]
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["code"] == "exam_version_mismatch"
+        assert not Answer.objects.exists()
+
+    def test_served_version_is_required(self, authenticated_client, shuffled_exam):
+        payload = authenticated_client.get(f"/exams/{shuffled_exam.uuid}/").data["data"]
+
+        response = self._submit(authenticated_client, shuffled_exam, self._correct_answers(payload))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "exam_version" in response.data["errors"]
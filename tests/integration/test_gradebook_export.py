@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import pytest
+from rest_framework import status
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestGradebookExport:
+    def _graded_exam(self, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        q1 = QuestionFactory(exam=sample_exam, order=1, marks=10)
+        q2 = QuestionFactory(exam=sample_exam, order=2, marks=10)
+        for marks in [(10, 0), (5, 10)]:
+            submission = SubmissionFactory(exam=sample_exam, status="COMPLETED", set_score=sum(marks))
+            AnswerFactory(submission=submission, question=q1, marks_obtained=marks[0])
+            AnswerFactory(submission=submission, question=q2, marks_obtained=marks[1])
+
+    def _content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_pivots_answers(self, instructor_client, sample_exam):
+        self._graded_exam(sample_exam)
+
+        response = instructor_client.get(f"/exams/{sample_exam.uuid}/gradebook/?format=csv")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        assert len(rows) == 2
+        assert [(row["Q1"], row["Q2"]) for row in rows] == [("10.0", "0.0"), ("5.0", "10.0")]
+
+    def test_jsonl_export(self, instructor_client, sample_exam):
+        self._graded_exam(sample_exam)
+
+        response = instructor_client.get(f"/exams/{sample_exam.uuid}/gradebook/?format=jsonl")
+
+        records = [json.loads(line) for line in self._content(response).splitlines()]
+        assert len(records) == 2
+        assert records[1]["marks"] == {"Q1": 5.0, "Q2": 10.0}
+        assert records[1]["score"] == 15.0
+
+    def test_submissions_without_answers_get_a_row(self, instructor_client, sample_exam):
+        from tests.factories.submission_factory import SubmissionFactory
+
+        self._graded_exam(sample_exam)
+        empty = SubmissionFactory(exam=sample_exam, status="COMPLETED", set_score=0)
+
+        response = instructor_client.get(f"/exams/{sample_exam.uuid}/gradebook/?format=csv")
+
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        assert len(rows) == 3
+        assert (rows[2]["submission_id"], rows[2]["Q1"], rows[2]["Q2"]) == (str(empty.uuid), "", "")
+
+    def test_unsupported_format(self, instructor_client, sample_exam):
+        response = instructor_client.get(f"/exams/{sample_exam.uuid}/gradebook/?format=xlsx")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["success"] is False
+
+    def test_other_instructor_forbidden(self, api_client, sample_exam):
+        from tests.factories.user_factory import UserFactory
+
+        api_client.force_authenticate(user=UserFactory(role="INSTRUCTOR"))
+
+        response = api_client.get(f"/exams/{sample_exam.uuid}/gradebook/?format=csv")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
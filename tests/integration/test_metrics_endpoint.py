@@ -0,0 +1,46 @@
+import pytest
+from rest_framework import status
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_requests_are_recorded_per_route(self, authenticated_client, sample_exam):
+        authenticated_client.get("/exams/")
+        authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+        authenticated_client.get("/does-not-exist/")
+
+        response = authenticated_client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.content.decode()
+        assert 'http_requests_total{method="GET",route="exams:exam-list",status="200"} 1' in text
+        assert 'route="exams:exam-detail",status="200"} 1' in text
+        assert str(sample_exam.uuid) not in text
+        assert 'route="unmatched",status="404"} 1' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="exams:exam-list"} 1' in text
+        assert 'http_request_db_queries_bucket{route="exams:exam-list",le="+Inf"} 1' in text
+        # The scrape itself is still in flight
+        assert "http_requests_in_flight 1" in text
+
+    def test_grading_durations_are_recorded(self, authenticated_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        question = QuestionFactory(exam=sample_exam, order=1)
+        data = {
+            "exam_uuid": str(sample_exam.uuid),
+            "answers": [{"question_uuid": str(question.uuid), "answer_text": "A"}],
+        }
+        authenticated_client.post("/submissions/", data, format="json")
+
+        text = authenticated_client.get("/metrics").content.decode()
+
+        assert 'grading_duration_seconds_count{grader="MockGrader",outcome="success"} 1' in text
+
+    def test_scrapes_can_require_a_token(self, api_client, settings):
+        settings.METRICS_AUTH_TOKEN = "scrape-secret"
+
+        assert api_client.get("/metrics").status_code == status.HTTP_401_UNAUTHORIZED
+        response = api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        assert response.status_code == status.HTTP_200_OK
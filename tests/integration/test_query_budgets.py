@@ -0,0 +1,74 @@
+import pytest
+from rest_framework import status
+
+
+def _submit(client, exam, questions):
+    data = {
+        "exam_uuid": str(exam.uuid),
+        "answers": [{"question_uuid": str(question.uuid), "answer_text": "A"} for question in questions],
+    }
+    return client.post("/submissions/", data, format="json")
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestEndpointQueryBudgets:
+    def test_exam_endpoints(self, authenticated_client, sample_exam, query_budget):
+        from tests.factories.exam_factory import ExamFactory, QuestionFactory
+
+        ExamFactory.create_batch(5, course=sample_exam.course)
+        QuestionFactory.create_batch(5, exam=sample_exam)
+
+        with query_budget(8):
+            assert authenticated_client.get("/exams/").status_code == status.HTTP_200_OK
+        with query_budget(5):
+            assert authenticated_client.get(f"/exams/{sample_exam.uuid}/").status_code == status.HTTP_200_OK
+
+    def test_submission_intake_does_not_grow_with_answers(self, authenticated_client, student_user, query_budget):
+        from tests.factories.exam_factory import ExamFactory, QuestionFactory
+
+        counts = []
+        for size in (2, 10):
+            exam = ExamFactory()
+            questions = QuestionFactory.create_batch(size, exam=exam)
+            # First submission to a fresh exam, so this includes publishing its version,
+            # compiling its grading plan, creating its stats rows and logging its ranking change
+            with query_budget(41) as budget:
+                assert _submit(authenticated_client, exam, questions).status_code == status.HTTP_201_CREATED
+            counts.append(budget.count)
+
+        assert counts[0] == counts[1]
+
+    def test_submission_endpoints(self, authenticated_client, student_user, query_budget):
+        from tests.factories.submission_factory import SubmissionFactory
+
+        submissions = SubmissionFactory.create_batch(5, student=student_user)
+
+        with query_budget(3):
+            assert authenticated_client.get("/submissions/list/").status_code == status.HTTP_200_OK
+        with query_budget(5):
+            response = authenticated_client.get(f"/submissions/{submissions[0].uuid}/")
+            assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/admin/submissions/submission/",
+            "/admin/submissions/answer/",
+            "/admin/exams/question/",
+            "/admin/exams/exam/",
+            "/admin/exams/course/",
+        ],
+    )
+    def test_admin_changelists(self, client, url, query_budget):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import AnswerFactory, SubmissionFactory
+        from tests.factories.user_factory import UserFactory
+
+        for _ in range(6):
+            submission = SubmissionFactory()
+            AnswerFactory(submission=submission, question=QuestionFactory(exam=submission.exam))
+        client.force_login(UserFactory(role="ADMIN", is_staff=True, is_superuser=True))
+
+        with query_budget(8):
+            assert client.get(url).status_code == status.HTTP_200_OK
@@ -0,0 +1,98 @@
+import json
+import pytest
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework import status
+
+
+def _jsonl(*rows):
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows).encode()
+
+
+MCQ = {"question_text": "2 + 2?", "question_type": "MCQ", "marks": "2", "options": ["3", "4"], "correct_answer": "4"}
+ESSAY = {"question_text": "Discuss.", "question_type": "ESSAY", "marks": "10", "grading_rubric": {"min_length": 50}}
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestQuestionBank:
+    def _upload(self, client, exam, content, query=""):
+        upload = SimpleUploadedFile("bank.jsonl", content, content_type="application/x-ndjson")
+        return client.post(f"/exams/{exam.uuid}/questions/import/{query}", {"file": upload}, format="multipart")
+
+    def test_import_appends_questions_in_chunks(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory(exam=sample_exam, order=1)
+
+        response = self._upload(instructor_client, sample_exam, _jsonl(MCQ, "", ESSAY, {**ESSAY, "order": 10}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["data"]["created"] == 3
+        assert list(sample_exam.questions.values_list("order", flat=True)) == [1, 2, 3, 10]
+        sample_exam.refresh_from_db()
+        assert sample_exam.question_count == 4
+
+    def test_invalid_lines_are_reported_and_nothing_is_imported(self, instructor_client, sample_exam):
+        content = _jsonl(MCQ, "{not json", {**MCQ, "options": None}, {**ESSAY, "order": 1})
+
+        response = self._upload(instructor_client, sample_exam, content)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        lines = response.data["errors"]["lines"]
+        assert [error["line"] for error in lines] == [2, 3, 4]
+        assert "options" in lines[1]["errors"]
+        assert "order" in lines[2]["errors"]
+        assert not sample_exam.questions.exists()
+
+    def test_skip_invalid_keeps_valid_lines(self, instructor_client, sample_exam):
+        response = self._upload(instructor_client, sample_exam, _jsonl(MCQ, "[]", ESSAY), query="?skip_invalid=true")
+
+        assert response.data["data"]["created"] == 2
+        assert response.data["data"]["skipped"] == 1
+
+    def test_export_round_trips_through_import(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import ExamFactory
+
+        self._upload(instructor_client, sample_exam, _jsonl(MCQ, ESSAY))
+        response = instructor_client.get(f"/exams/{sample_exam.uuid}/questions/export/")
+        content = b"".join(response.streaming_content)
+
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [row["correct_answer"] for row in rows] == ["4", None]
+
+        copy = ExamFactory(course=sample_exam.course)
+        self._upload(instructor_client, copy, content)
+        assert list(copy.questions.values_list("question_text", flat=True)) == ["2 + 2?", "Discuss."]
+
+    def test_import_refreshes_cached_exam_detail(self, authenticated_client, sample_exam):
+        from apps.exams.services import ExamService
+
+        before = authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+
+        ExamService.import_question_bank(sample_exam, [json.dumps(MCQ)])
+        after = authenticated_client.get(f"/exams/{sample_exam.uuid}/")
+
+        assert before.data["data"]["questions"] == []
+        assert [question["question_text"] for question in after.data["data"]["questions"]] == ["2 + 2?"]
+
+    def test_other_instructor_forbidden(self, api_client, sample_exam):
+        from tests.factories.user_factory import UserFactory
+
+        api_client.force_authenticate(user=UserFactory(role="INSTRUCTOR"))
+
+        response = self._upload(api_client, sample_exam, _jsonl(MCQ))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_import_command(self, sample_exam, tmp_path):
+        path = tmp_path / "bank.jsonl"
+        path.write_bytes(_jsonl(MCQ, ESSAY))
+        out = StringIO()
+
+        call_command("import_questions", str(sample_exam.uuid), str(path), "--chunk-size", "1", stdout=out)
+
+        assert sample_exam.questions.count() == 2
+        assert "Imported 2 questions from 2 lines" in out.getvalue()
@@ -0,0 +1,141 @@
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+from rest_framework import status
+from apps.exams import search
+from apps.exams.services import ExamService
+
+
+@pytest.fixture
+def search_index(db):
+    # Tests run without migrations, so create the index the 0005 migration would
+    search.install()
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+@pytest.mark.usefixtures("search_index")
+class TestExamSearch:
+    def _search(self, client, **params):
+        return client.get("/exams/search/", params)
+
+    def test_questions_are_ranked_by_relevance(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory(exam=sample_exam, question_text="Explain how photosynthesis converts light into energy.")
+        QuestionFactory(exam=sample_exam, question_text="Photosynthesis, photosynthesis: define photosynthesis.")
+        QuestionFactory(exam=sample_exam, question_text="Describe cellular respiration.")
+
+        response = self._search(instructor_client, q="photosynthesis")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data["data"]
+        assert data["count"] == 2
+        assert data["results"][0]["question_text"].startswith("Photosynthesis, photosynthesis")
+        assert data["results"][0]["rank"] >= data["results"][1]["rank"]
+        assert data["results"][0]["exam"]["id"] == str(sample_exam.uuid)
+
+    def test_results_are_paginated(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        for _ in range(5):
+            QuestionFactory(exam=sample_exam, question_text="What is a binary tree?")
+
+        response = self._search(instructor_client, q="binary", page=2, page_size=2)
+
+        data = response.data["data"]
+        assert data["count"] == 5
+        assert (data["page"], data["page_size"], len(data["results"])) == (2, 2, 2)
+
+    def test_quoted_phrases_and_fts_syntax_in_queries(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory(exam=sample_exam, question_text="The quick brown fox.")
+        QuestionFactory(exam=sample_exam, question_text="The brown quick fox.")
+
+        phrase = self._search(instructor_client, q='"quick brown"').data["data"]
+        assert [result["question_text"] for result in phrase["results"]] == ["The quick brown fox."]
+
+        response = self._search(instructor_client, q='fox AND (NEAR "')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_answers_are_searched_by_text_and_feedback(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import AnswerFactory, SubmissionFactory
+
+        question = QuestionFactory(exam=sample_exam)
+        submission = SubmissionFactory(exam=sample_exam)
+        AnswerFactory(submission=submission, question=question, answer_text="Mitochondria make energy.")
+        other = QuestionFactory(exam=sample_exam)
+        AnswerFactory(submission=submission, question=other, answer_text="No idea", feedback="Mention mitochondria.")
+
+        response = self._search(instructor_client, q="mitochondria", scope="answers")
+
+        data = response.data["data"]
+        assert data["count"] == 2
+        assert {result["submission_id"] for result in data["results"]} == {str(submission.uuid)}
+
+    def test_index_follows_updates_and_deletes(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        question = QuestionFactory(exam=sample_exam, question_text="Define entropy.")
+        question.question_text = "Define enthalpy."
+        question.save()
+
+        assert self._search(instructor_client, q="entropy").data["data"]["count"] == 0
+        assert self._search(instructor_client, q="enthalpy").data["data"]["count"] == 1
+
+        question.delete()
+        assert self._search(instructor_client, q="enthalpy").data["data"]["count"] == 0
+
+    def test_instructors_only_see_their_own_courses(self, instructor_client, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.user_factory import UserFactory
+
+        QuestionFactory(exam=sample_exam, question_text="Kinetic energy formula?")
+        QuestionFactory(question_text="Kinetic energy of a falling body?")
+
+        assert self._search(instructor_client, q="kinetic").data["data"]["count"] == 1
+
+        result = ExamService.search("kinetic", UserFactory(role="ADMIN"))
+        assert result.data["count"] == 2
+
+    def test_query_and_scope_are_validated(self, instructor_client):
+        response = self._search(instructor_client, q=" ", scope="exams")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data["errors"]) == {"q", "scope"}
+
+    def test_students_cannot_search(self, authenticated_client):
+        assert self._search(authenticated_client, q="energy").status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_search_uses_the_index(self, sample_exam):
+        from apps.exams.models import Question
+        from tests.factories.exam_factory import QuestionFactory
+
+        match = QuestionFactory(exam=sample_exam, question_text="Normalise the database schema.")
+        QuestionFactory(exam=sample_exam, question_text="Unrelated question.")
+        model_admin = admin.site._registry[Question]
+
+        results, _ = model_admin.get_search_results(RequestFactory().get("/"), Question.objects.all(), "schemas")
+
+        assert list(results) == [match]
+
+    def test_admin_search_matches_other_fields_exactly(self, sample_exam):
+        from apps.submissions.models import Answer
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import AnswerFactory, SubmissionFactory
+
+        submission = SubmissionFactory(exam=sample_exam)
+        answer = AnswerFactory(submission=submission, question=QuestionFactory(exam=sample_exam), answer_text="Ohm")
+        AnswerFactory(question=QuestionFactory(exam=sample_exam), answer_text="Volt")
+        model_admin = admin.site._registry[Answer]
+
+        def search(term):
+            return model_admin.get_search_results(RequestFactory().get("/"), Answer.objects.all(), term)[0]
+
+        assert list(search(submission.student.email)) == [answer]
+        assert list(search(str(submission.uuid))) == [answer]
+        partial = search(submission.student.email[:5])
+        assert list(partial) == []
+        assert "LIKE" not in str(partial.query)
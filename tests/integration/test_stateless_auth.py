@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.models import User
+
+
+def _users_queries(queries):
+    return [query["sql"] for query in queries.captured_queries if 'FROM "users"' in query["sql"]]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestStatelessJWTAuthentication:
+    @pytest.fixture(autouse=True)
+    def version_cache(self, settings):
+        # The test cache is process-local, but so is the test run
+        settings.TOKEN_VERSION_CACHE_ENABLED = True
+
+    def _login(self, client, user):
+        client.credentials()
+        response = client.post("/auth/login/", {"email": user.email, "password": "testpass123"}, format="json")
+        return response.data["data"]
+
+    def _bearer(self, client, access):
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client
+
+    def test_role_checks_need_no_users_query(self, api_client, student_user):
+        tokens = self._login(api_client, student_user)
+        client = self._bearer(api_client, tokens["access"])
+        client.get("/exams/")  # warm the token version cache
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/exams/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert _users_queries(queries) == []
+
+    def test_other_fields_are_loaded_in_one_query(self, api_client, student_user):
+        client = self._bearer(api_client, self._login(api_client, student_user)["access"])
+        client.get("/exams/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/auth/profile/")
+
+        user = response.data["data"]["user"]
+        assert (user["email"], user["first_name"]) == (student_user.email, student_user.first_name)
+        assert len(_users_queries(queries)) == 1
+
+    def test_role_change_revokes_tokens(self, api_client, student_user, django_capture_on_commit_callbacks):
+        tokens = self._login(api_client, student_user)
+        client = self._bearer(api_client, tokens["access"])
+        assert client.get("/exams/").status_code == status.HTTP_200_OK
+
+        user = User.objects.get(pk=student_user.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            user.role = "INSTRUCTOR"
+            user.save(update_fields=["role"])
+
+        assert User.objects.get(pk=user.pk).token_version == 1
+        assert client.get("/exams/").status_code == status.HTTP_401_UNAUTHORIZED
+        api_client.credentials()
+        refreshed = api_client.post("/auth/refresh-token/", {"refresh_token": tokens["refresh"]}, format="json")
+        assert refreshed.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_deactivation_and_explicit_revocation(self, api_client, student_user, django_capture_on_commit_callbacks):
+        client = self._bearer(api_client, self._login(api_client, student_user)["access"])
+        client.get("/exams/")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            student_user.revoke_tokens()
+        assert client.get("/exams/").status_code == status.HTTP_401_UNAUTHORIZED
+
+        client = self._bearer(api_client, self._login(api_client, student_user)["access"])
+        assert client.get("/exams/").status_code == status.HTTP_200_OK
+        with django_capture_on_commit_callbacks(execute=True):
+            student_user.is_active = False
+            student_user.save()
+        assert client.get("/exams/").status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_unrelated_changes_keep_tokens_valid(self, api_client, student_user, django_capture_on_commit_callbacks):
+        client = self._bearer(api_client, self._login(api_client, student_user)["access"])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            student_user.first_name = "Renamed"
+            student_user.save()
+
+        assert client.get("/exams/").status_code == status.HTTP_200_OK
+
+    def test_tokens_without_claims_use_the_database(self, api_client, student_user):
+        access = RefreshToken.for_user(student_user).access_token
+        client = self._bearer(api_client, str(access))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/exams/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(_users_queries(queries)) == 1
+
+    def test_process_local_cache_reads_versions_from_the_database(self, settings, api_client, student_user):
+        settings.TOKEN_VERSION_CACHE_ENABLED = None
+        client = self._bearer(api_client, self._login(api_client, student_user)["access"])
+        assert client.get("/exams/").status_code == status.HTTP_200_OK
+
+        # Revoked by another worker, whose cache invalidation never reaches this process
+        User.objects.filter(pk=student_user.pk).update(token_version=F("token_version") + 1)
+
+        assert client.get("/exams/").status_code == status.HTTP_401_UNAUTHORIZED
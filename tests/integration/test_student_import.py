@@ -0,0 +1,151 @@
+import json
+import pytest
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from apps.accounts.models import User
+from apps.accounts.provisioning import hash_passwords, import_students
+
+
+def _csv(*rows):
+    return ("email,first_name,last_name,password\n" + "".join(f"{row}\n" for row in rows)).encode()
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestStudentImport:
+    @pytest.fixture(autouse=True)
+    def fast_hasher(self, settings):
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+    def _upload(self, client, content, name="roster.csv", query=""):
+        upload = SimpleUploadedFile(name, content, content_type="text/csv")
+        return client.post(f"/auth/students/import/{query}", {"file": upload}, format="multipart")
+
+    def test_csv_roster_creates_students_with_per_row_results(self, instructor_client, student_user):
+        content = _csv(
+            "Ada@Example.com,Ada,Lovelace,password123",
+            f"{student_user.email.upper()},Existing,User,password123",
+            "ada@example.com,Ada,Again,password123",
+            "not-an-email,Bad,Row,short",
+        )
+
+        response = self._upload(instructor_client, content)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data["data"]
+        assert (data["rows"], data["created"], data["exists"], data["duplicate"], data["invalid"]) == (4, 1, 1, 1, 1)
+        assert [result["status"] for result in data["results"]] == ["created", "exists", "duplicate", "invalid"]
+        assert set(data["results"][3]["errors"]) == {"email", "password"}
+
+        user = User.objects.get(email="ada@example.com")
+        assert user.role == "STUDENT" and str(user.uuid) == data["results"][0]["id"]
+        assert check_password("password123", user.password)
+
+    def test_jsonl_roster_and_login(self, api_client, instructor_client):
+        content = "\n".join(
+            [
+                json.dumps(
+                    {
+                        "email": "grace@example.com",
+                        "first_name": "Grace",
+                        "last_name": "Hopper",
+                        "password": "cobol1959",
+                    }
+                ),
+                "",
+                "{broken",
+            ]
+        ).encode()
+
+        data = self._upload(instructor_client, content, name="roster.jsonl").data["data"]
+
+        assert (data["created"], data["invalid"]) == (1, 1)
+        assert data["results"][1] == {
+            "line": 3,
+            "email": None,
+            "status": "invalid",
+            "errors": data["results"][1]["errors"],
+        }
+        login = api_client.post("/auth/login/", {"email": "grace@example.com", "password": "cobol1959"}, format="json")
+        assert login.status_code == status.HTTP_200_OK
+
+    def test_existing_emails_are_checked_in_one_query_and_inserted_in_chunks(self, settings):
+        settings.STUDENT_IMPORT_HASH_WORKERS = 1
+        lines = [f"student{i}@example.com,First,Last,password123\n" for i in range(7)]
+
+        with CaptureQueriesContext(connection) as queries:
+            summary = import_students(["email,first_name,last_name,password\n", *lines], "csv", chunk_size=3)
+
+        assert summary["created"] == 7
+        selects = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        inserts = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+        # One lookup of existing emails, then per chunk an insert and a check of which rows went in
+        assert len(selects) == 1 + 3 and len(inserts) == 3
+
+    def test_accounts_registered_during_the_import_are_reported_as_existing(self):
+        from tests.factories.user_factory import UserFactory
+
+        def hash_and_race(passwords, workers):
+            # A registration commits between the existing-email lookup and the insert
+            UserFactory(email="racer@example.com")
+            return hash_passwords(passwords, 1)
+
+        lines = [
+            "email,first_name,last_name,password\n",
+            "first@example.com,First,Row,password123\n",
+            "Racer@example.com,Racer,Row,password123\n",
+        ]
+        with patch("apps.accounts.provisioning.hash_passwords", side_effect=hash_and_race):
+            summary = import_students(lines, "csv")
+
+        assert [result["status"] for result in summary["results"]] == ["created", "exists"]
+        assert (summary["created"], summary["exists"]) == (1, 1)
+        assert User.objects.get(email="racer@example.com").first_name != "Racer"
+
+    def test_large_rosters_are_sent_to_the_management_command(self, instructor_client, settings):
+        settings.STUDENT_IMPORT_MAX_ROWS = 2
+        content = _csv(*[f"student{i}@example.com,First,Last,password123" for i in range(3)])
+
+        with patch("apps.accounts.provisioning.hash_passwords") as hash_passwords_mock:
+            response = self._upload(instructor_client, content)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "import_students" in response.data["errors"]["file"][0]
+        assert not hash_passwords_mock.called
+        assert not User.objects.filter(email__startswith="student").exists()
+
+    def test_passwords_are_hashed_in_a_process_pool(self):
+        passwords = [f"password-{i}" for i in range(40)]
+
+        hashed = hash_passwords(passwords, workers=2)
+
+        assert all(check_password(password, encoded) for password, encoded in zip(passwords, hashed))
+        assert len(set(hashed)) == 40
+
+    def test_format_is_explicit_or_taken_from_the_extension(self, instructor_client):
+        response = self._upload(instructor_client, b"", name="roster.txt")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "format" in response.data["errors"]
+
+        response = self._upload(instructor_client, b"", name="roster.txt", query="?format=csv")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_students_cannot_import(self, authenticated_client):
+        assert self._upload(authenticated_client, _csv()).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_management_command(self, tmp_path):
+        path = tmp_path / "roster.csv"
+        path.write_bytes(_csv("cmd@example.com,Cmd,Line,password123", "bad,Row,Here,password123"))
+        out, err = StringIO(), StringIO()
+
+        call_command("import_students", str(path), "--workers", "1", stdout=out, stderr=err)
+
+        assert "Created 1 students from 2 rows" in out.getvalue()
+        assert "line 3: invalid" in err.getvalue()
+        assert User.objects.filter(email="cmd@example.com").exists()
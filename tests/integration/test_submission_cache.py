@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestSubmissionDetailCache:
+    def _graded_submission(self, student_user):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        submission = SubmissionFactory(student=student_user, status="COMPLETED")
+        question = QuestionFactory(exam=submission.exam, order=1)
+        AnswerFactory(submission=submission, question=question, answer_text="B")
+        return submission
+
+    def test_completed_submission_has_etag(self, authenticated_client, student_user):
+        submission = self._graded_submission(student_user)
+
+        response = authenticated_client.get(f"/submissions/{submission.uuid}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"].startswith('"')
+
+    def test_if_none_match_returns_304_without_answers_query(self, authenticated_client, student_user):
+        submission = self._graded_submission(student_user)
+        etag = authenticated_client.get(f"/submissions/{submission.uuid}/")["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(f"/submissions/{submission.uuid}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not any("answers" in query["sql"] for query in queries.captured_queries)
+
+    def test_regrade_changes_etag(self, authenticated_client, student_user):
+        from apps.submissions.services import SubmissionService
+
+        submission = self._graded_submission(student_user)
+        etag = authenticated_client.get(f"/submissions/{submission.uuid}/")["ETag"]
+
+        SubmissionService.grade_submission(str(submission.uuid))
+        response = authenticated_client.get(f"/submissions/{submission.uuid}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["data"]["submission"]["answers"][0]["graded_by_service"] == "mock"
+
+    def test_question_edit_changes_etag(self, authenticated_client, student_user, django_capture_on_commit_callbacks):
+        submission = self._graded_submission(student_user)
+        etag = authenticated_client.get(f"/submissions/{submission.uuid}/")["ETag"]
+
+        question = submission.exam.questions.get()
+        question.question_text = "Reworded question"
+        with django_capture_on_commit_callbacks(execute=True):
+            question.save()
+        response = authenticated_client.get(f"/submissions/{submission.uuid}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["data"]["submission"]["answers"][0]["question_text"] == "Reworded question"
+
+    def test_pending_submission_is_not_cached(self, authenticated_client, student_user):
+        from tests.factories.submission_factory import SubmissionFactory
+
+        submission = SubmissionFactory(student=student_user, status="PENDING")
+
+        response = authenticated_client.get(f"/submissions/{submission.uuid}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.has_header("ETag")
+
+    def test_other_student_gets_forbidden(self, api_client, student_user):
+        from tests.factories.user_factory import UserFactory
+
+        submission = self._graded_submission(student_user)
+        api_client.force_authenticate(user=UserFactory(role="STUDENT"))
+
+        response = api_client.get(f"/submissions/{submission.uuid}/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
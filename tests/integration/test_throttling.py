@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from apps.common.utils.throttling import SlidingWindowThrottle
+from apps.submissions.models import Submission
+
+
+def _register(client, email, ip="10.0.0.1"):
+    data = {
+        "email": email,
+        "password": "testpass123",
+        "password_confirm": "testpass123",
+        "first_name": "John",
+        "last_name": "Doe",
+    }
+    return client.post("/auth/register/", data, format="json", REMOTE_ADDR=ip)
+
+
+def _login(client, email, password="wrongpass1", ip="10.0.0.1"):
+    return client.post("/auth/login/", {"email": email, "password": password}, format="json", REMOTE_ADDR=ip)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestThrottling:
+    @pytest.fixture(autouse=True)
+    def rates(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                "login_ip": "3/min",
+                "login_email": "2/min",
+                "register_ip": "2/hour",
+                "submission_user": "1/min",
+                "submission_ip": "100/min",
+            },
+        }
+
+    @pytest.fixture(autouse=True)
+    def frozen_clock(self):
+        # Every request in a test lands in the same window, however long the test takes
+        with patch.object(SlidingWindowThrottle, "timer", return_value=1_700_000_030.0):
+            yield
+
+    def test_login_is_limited_per_ip_before_any_work(self, api_client):
+        for i in range(3):
+            _login(api_client, f"user{i}@example.com")
+
+        with patch("apps.accounts.serializers.authenticate") as authenticate:
+            with CaptureQueriesContext(connection) as queries:
+                response = _login(api_client, "user9@example.com")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response["Retry-After"]) >= 1
+        assert not authenticate.called
+        assert len(queries) == 0
+        assert _login(api_client, "user9@example.com", ip="10.0.0.2").status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_login_is_limited_per_account_across_ips(self, api_client, student_user):
+        _login(api_client, student_user.email, ip="10.0.0.1")
+        _login(api_client, student_user.email.upper(), ip="10.0.0.2")
+
+        response = _login(api_client, student_user.email, password="testpass123", ip="10.0.0.3")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_registration_is_limited_per_ip(self, api_client):
+        assert _register(api_client, "a@example.com").status_code == status.HTTP_201_CREATED
+        assert _register(api_client, "b@example.com").status_code == status.HTTP_201_CREATED
+
+        response = _register(api_client, "c@example.com")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response
+
+    def test_submissions_are_limited_per_student(self, authenticated_client, sample_exam, student_user):
+        from tests.factories.exam_factory import QuestionFactory
+
+        question = QuestionFactory(exam=sample_exam, order=1)
+        data = {
+            "exam_uuid": str(sample_exam.uuid),
+            "answers": [{"question_uuid": str(question.uuid), "answer_text": "A"}],
+        }
+        assert authenticated_client.post("/submissions/", data, format="json").status_code == status.HTTP_201_CREATED
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.post("/submissions/", data, format="json")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert len(queries) == 0
+        assert Submission.objects.filter(student=student_user).count() == 1
@@ -0,0 +1,107 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.accounts.tokens import AuthRefreshToken, TokenBlacklistFilter
+
+
+def _blacklist_queries(queries):
+    return [query["sql"] for query in queries.captured_queries if "token_blacklist_blacklistedtoken" in query["sql"]]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestTokenBlacklistFilter:
+    @pytest.fixture(autouse=True)
+    def enabled(self, settings):
+        # The test cache is process-local, but so is the test run
+        settings.TOKEN_BLACKLIST_FILTER_ENABLED = True
+
+    def test_unblacklisted_tokens_skip_the_blacklist_table(self, student_user):
+        AuthRefreshToken(str(AuthRefreshToken.for_user(student_user)))  # builds the filter
+        token = str(AuthRefreshToken.for_user(student_user))
+
+        with CaptureQueriesContext(connection) as queries:
+            AuthRefreshToken(token)
+
+        assert _blacklist_queries(queries) == []
+
+    def test_blacklisted_tokens_are_rejected(self, student_user, django_capture_on_commit_callbacks):
+        token = AuthRefreshToken.for_user(student_user)
+        AuthRefreshToken(str(token))
+        with django_capture_on_commit_callbacks(execute=True):
+            token.blacklist()
+
+        with pytest.raises(TokenError):
+            AuthRefreshToken(str(token))
+
+    def test_blacklisting_by_another_process_is_picked_up(self, student_user):
+        token = AuthRefreshToken.for_user(student_user)
+        AuthRefreshToken(str(token))
+
+        # Another process writes the row and bumps the shared generation; this process's filter has not seen it
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token["jti"]))
+        assert token["jti"] not in TokenBlacklistFilter._bloom
+        TokenBlacklistFilter.bump_generation()
+
+        with pytest.raises(TokenError):
+            AuthRefreshToken(str(token))
+
+    def test_rows_committed_after_a_rebuild_are_picked_up_whatever_their_id(self, student_user):
+        late, early = AuthRefreshToken.for_user(student_user), AuthRefreshToken.for_user(student_user)
+        BlacklistedToken.objects.create(id=1_000, token=OutstandingToken.objects.get(jti=early["jti"]))
+        AuthRefreshToken(str(late))  # builds the filter
+        # Blacklisted in a transaction that started before the rebuild but committed after it,
+        # far behind the highest id the rebuild saw
+        row = BlacklistedToken.objects.create(id=1, token=OutstandingToken.objects.get(jti=late["jti"]))
+        BlacklistedToken.objects.filter(pk=row.pk).update(blacklisted_at=timezone.now() - timedelta(minutes=1))
+        TokenBlacklistFilter.bump_generation()
+
+        with pytest.raises(TokenError):
+            AuthRefreshToken(str(late))
+
+    def test_process_local_cache_checks_every_token_in_the_database(self, settings, student_user):
+        settings.TOKEN_BLACKLIST_FILTER_ENABLED = None
+        token = str(AuthRefreshToken.for_user(student_user))
+
+        with CaptureQueriesContext(connection) as queries:
+            AuthRefreshToken(token)
+
+        assert not TokenBlacklistFilter.enabled()
+        assert TokenBlacklistFilter._bloom is None
+        assert len(_blacklist_queries(queries)) == 1
+
+    def test_rotated_and_logged_out_tokens_cannot_be_reused(
+        self, api_client, student_user, django_capture_on_commit_callbacks
+    ):
+        login = api_client.post(
+            "/auth/login/", {"email": student_user.email, "password": "testpass123"}, format="json"
+        ).data["data"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            rotated = api_client.post("/auth/refresh-token/", {"refresh_token": login["refresh"]}, format="json")
+        assert rotated.status_code == status.HTTP_200_OK
+
+        reused = api_client.post("/auth/refresh-token/", {"refresh_token": login["refresh"]}, format="json")
+        assert reused.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_purge_removes_expired_tokens_in_chunks(self, student_user):
+        now = timezone.now()
+        for i in range(5):
+            expired = OutstandingToken.objects.create(jti=f"old-{i}", token="t", expires_at=now - timedelta(days=1))
+            if i % 2 == 0:
+                BlacklistedToken.objects.create(token=expired)
+        OutstandingToken.objects.create(jti="live", token="t", expires_at=now + timedelta(days=1))
+        out = StringIO()
+
+        call_command("purge_expired_tokens", "--chunk-size", "2", stdout=out)
+
+        assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live"]
+        assert not BlacklistedToken.objects.exists()
+        assert "Removed 5 outstanding and 3 blacklisted tokens" in out.getvalue()
@@ -0,0 +1,31 @@
+import pytest
+from apps.common.utils.bloom import BloomFilter
+
+
+@pytest.mark.unit
+class TestBloomFilter:
+    def test_added_items_are_always_found(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert bloom.is_full
+
+    def test_false_positive_rate_stays_near_target(self):
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"jti-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+
+        assert false_positives < 10000 * 0.03
+
+    def test_sizing(self):
+        bloom = BloomFilter(capacity=10000, error_rate=0.001)
+
+        # ~14.4 bits and ~10 hash functions per item for a 0.1% error rate
+        assert 140000 < bloom.size < 150000
+        assert bloom.hash_count == 10
+        assert "anything" not in bloom
@@ -0,0 +1,87 @@
+import pytest
+from rest_framework import status
+from apps.exams.analytics import compute_exam_analytics
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExamAnalytics:
+    def _graded_exam(self, sample_exam, results):
+        """results: one list of (answer_text, marks) per student, aligned with the questions."""
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        q1 = QuestionFactory(exam=sample_exam, order=1, question_type="MCQ", correct_answer="B", marks=10)
+        q2 = QuestionFactory(exam=sample_exam, order=2, question_type="MCQ", correct_answer="C", marks=10)
+        for row in results:
+            submission = SubmissionFactory(exam=sample_exam, status="COMPLETED")
+            for question, (text, marks) in zip([q1, q2], row):
+                AnswerFactory(
+                    submission=submission,
+                    question=question,
+                    answer_text=text,
+                    marks_obtained=marks,
+                    is_correct=marks >= 10,
+                )
+        return q1, q2
+
+    def test_score_distribution(self, sample_exam):
+        self._graded_exam(
+            sample_exam,
+            [[("B", 10), ("C", 10)], [("B", 10), ("A", 0)], [("A", 0), ("A", 0)], [("B", 10), ("D", 0)]],
+        )
+
+        data = compute_exam_analytics(sample_exam)
+        distribution = data["score_distribution"]
+
+        assert data["submission_count"] == 4
+        assert distribution["mean"] == 50.0
+        assert distribution["median"] == 50.0
+        assert distribution["min"] == 0.0
+        assert distribution["max"] == 100.0
+        assert sum(bucket["count"] for bucket in distribution["histogram"]) == 4
+
+    def test_item_analysis(self, sample_exam):
+        q1, q2 = self._graded_exam(
+            sample_exam,
+            [[("B", 10), ("C", 10)], [("B", 10), ("A", 0)], [("A", 0), ("A", 0)], [("B", 10), ("D", 0)]],
+        )
+
+        questions = {q["id"]: q for q in compute_exam_analytics(sample_exam)["questions"]}
+
+        assert questions[str(q1.uuid)]["difficulty"] == 0.75
+        assert questions[str(q2.uuid)]["difficulty"] == 0.25
+        assert questions[str(q1.uuid)]["discrimination_index"] == 1.0
+        assert questions[str(q1.uuid)]["point_biserial"] > 0
+        assert questions[str(q2.uuid)]["common_wrong_answers"][0] == {"answer": "A", "count": 2}
+
+    def test_exam_without_submissions(self, sample_exam):
+        self._graded_exam(sample_exam, [])
+
+        data = compute_exam_analytics(sample_exam)
+
+        assert data["submission_count"] == 0
+        assert data["score_distribution"]["mean"] is None
+        assert data["questions"][0]["difficulty"] is None
+
+    def test_endpoint_requires_owning_instructor(self, api_client, instructor_user, sample_exam):
+        from tests.factories.user_factory import UserFactory
+
+        api_client.force_authenticate(user=instructor_user)
+        assert api_client.get(f"/exams/{sample_exam.uuid}/analytics/").status_code == status.HTTP_200_OK
+
+        api_client.force_authenticate(user=UserFactory(role="INSTRUCTOR"))
+        assert api_client.get(f"/exams/{sample_exam.uuid}/analytics/").status_code == status.HTTP_403_FORBIDDEN
+
+    def test_grading_invalidates_cached_analytics(self, instructor_client, sample_exam):
+        from apps.exams.analytics import ExamAnalyticsCache
+        from apps.submissions.services import SubmissionService
+        from apps.submissions.models import Submission
+
+        self._graded_exam(sample_exam, [[("B", 10), ("C", 10)]])
+        instructor_client.get(f"/exams/{sample_exam.uuid}/analytics/")
+        assert ExamAnalyticsCache.get(sample_exam.id) is not None
+
+        SubmissionService.grade_submission(str(Submission.objects.get(exam=sample_exam).uuid))
+
+        assert ExamAnalyticsCache.get(sample_exam.id) is None
@@ -0,0 +1,64 @@
+import uuid
+import pytest
+from apps.exams.shuffle import (
+    permutation,
+    seed_bucket,
+    shuffle_exam_payload,
+    shuffle_options,
+    shuffle_seed,
+    unshuffle_answer,
+)
+
+OPTIONS = {"A": "Paris", "B": "Rome", "C": "Madrid", "D": "Berlin", "E": "Lisbon"}
+
+
+@pytest.mark.unit
+class TestExamShuffle:
+    def test_permutation_is_deterministic_and_complete(self):
+        assert permutation("exam:1:3", 20) == permutation("exam:1:3", 20)
+        assert sorted(permutation("exam:1:3", 20)) == list(range(20))
+        assert permutation("exam:1:3", 20) != permutation("exam:1:4", 20)
+
+    def test_seed_bucket_respects_setting(self, settings):
+        settings.EXAM_SHUFFLE_BUCKETS = 4
+        student = uuid.uuid4()
+
+        assert seed_bucket(student) == seed_bucket(str(student))
+        assert {seed_bucket(uuid.uuid4()) for _ in range(200)} == {0, 1, 2, 3}
+
+    def test_labelled_options_keep_labels_and_invert(self):
+        question = uuid.uuid4()
+        shuffled = shuffle_options(OPTIONS, "seed", question)
+
+        assert list(shuffled) == list(OPTIONS)
+        assert sorted(shuffled.values()) == sorted(OPTIONS.values())
+        for label, text in shuffled.items():
+            original = unshuffle_answer(OPTIONS, f" {label} ", "seed", question)
+            assert OPTIONS[original] == text
+
+    def test_list_options_and_free_text_are_not_inverted(self):
+        assert sorted(shuffle_options(["3", "4", "5"], "seed", "q")) == ["3", "4", "5"]
+        assert unshuffle_answer(["3", "4"], "4", "seed", "q") == "4"
+        assert unshuffle_answer(OPTIONS, "Rome", "seed", "q") == "Rome"
+
+    def test_label_case_is_ignored_unless_case_sensitive(self):
+        question = uuid.uuid4()
+        original = unshuffle_answer(OPTIONS, "B", "seed", question)
+
+        assert unshuffle_answer(OPTIONS, "b", "seed", question, case_sensitive=False) == original
+        assert unshuffle_answer(OPTIONS, "b", "seed", question) == "b"
+
+    def test_payload_questions_are_reordered_and_renumbered(self):
+        questions = [
+            {"id": str(uuid.uuid4()), "order": i, "question_type": "MCQ", "options": OPTIONS} for i in range(1, 11)
+        ]
+        data = {"title": "Exam", "questions": questions}
+        seed = shuffle_seed("exam", 1, 0)
+
+        shuffled = shuffle_exam_payload(data, seed, questions=True, options=False)
+
+        assert [q["order"] for q in shuffled["questions"]] == list(range(1, 11))
+        assert {q["id"] for q in shuffled["questions"]} == {q["id"] for q in questions}
+        assert all(q["options"] == OPTIONS for q in shuffled["questions"])
+        assert shuffled == shuffle_exam_payload(data, seed, questions=True, options=False)
+        assert data["questions"] is questions and questions[0]["order"] == 1
@@ -0,0 +1,106 @@
+import pytest
+from io import StringIO
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.management import call_command
+from apps.submissions.models import ExamStats
+from apps.submissions.services import ExamStatsService, SubmissionService
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExamStats:
+    def _submission(self, exam, answer_text):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        question = exam.questions.first() or QuestionFactory(exam=exam, order=1, correct_answer="B", marks=100)
+        submission = SubmissionFactory(exam=exam)
+        AnswerFactory(submission=submission, question=question, answer_text=answer_text)
+        return submission
+
+    def _summary(self, exam):
+        return ExamStats.objects.get(exam=exam).summary()
+
+    def test_grading_updates_aggregate(self, sample_exam):
+        for text in ["B", "B", "A"]:
+            SubmissionService.grade_submission(str(self._submission(sample_exam, text).uuid))
+
+        summary = self._summary(sample_exam)
+
+        assert summary["submission_count"] == 3
+        assert summary["mean_score"] == pytest.approx(66.67)
+        assert summary["min_score"] == 0.0
+        assert summary["max_score"] == 100.0
+        assert summary["pass_count"] == 2
+        assert summary["histogram"][9]["count"] == 2
+        assert summary["histogram"][0]["count"] == 1
+
+    def test_regrade_replaces_previous_score(self, sample_exam):
+        submission = self._submission(sample_exam, "A")
+        SubmissionService.grade_submission(str(submission.uuid))
+        submission.answers.update(answer_text="B")
+
+        SubmissionService.grade_submission(str(submission.uuid))
+        summary = self._summary(sample_exam)
+
+        assert summary["submission_count"] == 1
+        assert summary["min_score"] == 100.0
+        assert summary["histogram"][0]["count"] == 0
+
+    def test_failed_regrade_retracts_previous_score_once(self, sample_exam):
+        keep = self._submission(sample_exam, "B")
+        regraded = self._submission(sample_exam, "A")
+        SubmissionService.grade_submission(str(keep.uuid))
+        SubmissionService.grade_submission(str(regraded.uuid))
+
+        with patch.object(ExamStatsService, "record", side_effect=RuntimeError("stats unavailable")):
+            response = SubmissionService.grade_submission(str(regraded.uuid))
+        summary = self._summary(sample_exam)
+
+        assert not response.success
+        regraded.refresh_from_db()
+        assert regraded.status == "FAILED"
+        assert (summary["submission_count"], summary["min_score"], summary["pass_count"]) == (1, 100.0, 1)
+
+    def test_delete_retracts_score(self, sample_exam):
+        keep = self._submission(sample_exam, "A")
+        drop = self._submission(sample_exam, "B")
+        SubmissionService.grade_submission(str(keep.uuid))
+        SubmissionService.grade_submission(str(drop.uuid))
+
+        drop.refresh_from_db()
+        drop.delete()
+        summary = self._summary(sample_exam)
+
+        assert summary["submission_count"] == 1
+        assert summary["max_score"] == 0.0
+        assert summary["pass_count"] == 0
+
+    def test_exam_delete_skips_per_submission_retraction(self, sample_exam):
+        for text in ["A", "B"]:
+            SubmissionService.grade_submission(str(self._submission(sample_exam, text).uuid))
+
+        with patch.object(ExamStatsService, "remove") as remove:
+            sample_exam.delete()
+
+        remove.assert_not_called()
+        assert not ExamStats.objects.exists()
+
+    def test_rebuild_command_matches_incremental(self, sample_exam):
+        for text in ["B", "A", "B"]:
+            SubmissionService.grade_submission(str(self._submission(sample_exam, text).uuid))
+        incremental = self._summary(sample_exam)
+        ExamStats.objects.filter(exam=sample_exam).update(submission_count=0, score_sum=Decimal("0"))
+
+        call_command("rebuild_exam_stats", stdout=StringIO())
+
+        assert self._summary(sample_exam) == incremental
+
+    def test_stats_endpoint(self, instructor_client, sample_exam):
+        SubmissionService.grade_submission(str(self._submission(sample_exam, "B").uuid))
+
+        response = instructor_client.get(f"/exams/{sample_exam.uuid}/stats/")
+
+        assert response.status_code == 200
+        assert response.data["data"]["submission_count"] == 1
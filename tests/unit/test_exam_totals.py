@@ -0,0 +1,86 @@
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.exams.models import Exam, Question
+from apps.exams.services import ExamService
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExamQuestionTotals:
+    def test_service_updates_totals(self, sample_exam, instructor_user):
+        payload = [
+            {"question_text": "One", "question_type": "ESSAY", "marks": "40", "order": 1},
+            {"question_text": "Two", "question_type": "ESSAY", "marks": "60", "order": 2},
+        ]
+
+        ExamService.update_exam(str(sample_exam.uuid), {"questions": payload}, instructor_user)
+        sample_exam.refresh_from_db()
+
+        assert sample_exam.question_count == 2
+        assert sample_exam.question_marks_total == Decimal("100")
+
+    def test_direct_question_writes_update_totals(self, sample_exam, django_capture_on_commit_callbacks):
+        from tests.factories.exam_factory import QuestionFactory
+
+        with django_capture_on_commit_callbacks(execute=True):
+            question = QuestionFactory(exam=sample_exam, order=1, marks=5)
+            QuestionFactory(exam=sample_exam, order=2, marks=7)
+            question.delete()
+        sample_exam.refresh_from_db()
+
+        assert sample_exam.question_count == 1
+        assert sample_exam.question_marks_total == Decimal("7")
+
+    def test_bulk_question_delete_refreshes_each_exam_once(self, sample_exam, django_capture_on_commit_callbacks):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory.create_batch(5, exam=sample_exam)
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                Question.objects.filter(exam=sample_exam).delete()
+        sample_exam.refresh_from_db()
+
+        assert sample_exam.question_count == 0
+        assert len([query for query in queries.captured_queries if query["sql"].startswith('UPDATE "exams"')]) == 1
+
+    def test_exam_delete_skips_question_sync(self, sample_exam, django_capture_on_commit_callbacks):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory.create_batch(3, exam=sample_exam)
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                sample_exam.delete()
+
+        assert not any(query["sql"].startswith('UPDATE "exams"') for query in queries.captured_queries)
+
+    def test_listing_does_not_load_questions(
+        self, authenticated_client, sample_exam, django_capture_on_commit_callbacks
+    ):
+        from tests.factories.exam_factory import QuestionFactory
+
+        with django_capture_on_commit_callbacks(execute=True):
+            QuestionFactory(exam=sample_exam, order=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get("/exams/")
+
+        assert response.data["data"]["results"][0]["question_count"] == 1
+        assert not any('"questions"' in query["sql"] for query in queries.captured_queries)
+
+    def test_check_command_flags_mismatches_and_fixes_drift(self, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory(exam=sample_exam, order=1, marks=30)
+        Exam.objects.filter(pk=sample_exam.pk).update(question_count=0)
+        out = StringIO()
+
+        call_command("check_exam_totals", "--fix", stdout=out)
+        sample_exam.refresh_from_db()
+
+        assert "total_marks 100.00 != sum of question marks 30.00" in out.getvalue()
+        assert "1 exams with mismatched total_marks, 1 with drifted question totals (fixed)" in out.getvalue()
+        assert sample_exam.question_count == 1
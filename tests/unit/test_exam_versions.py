@@ -0,0 +1,85 @@
+import pytest
+from apps.exams.models import ExamVersion
+from apps.exams.services import ExamService, ExamVersionService
+from apps.submissions.grading.plan import GradingPlanStore
+from apps.submissions.models import Submission
+from apps.submissions.services import SubmissionService
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExamVersions:
+    @pytest.fixture
+    def sample_exam(self, sample_exam):
+        from tests.factories.exam_factory import QuestionFactory
+
+        QuestionFactory(exam=sample_exam, order=1, question_type="MCQ", correct_answer="B", marks=10)
+        QuestionFactory(exam=sample_exam, order=2, question_type="MCQ", correct_answer="C", marks=10)
+        sample_exam.refresh_from_db()
+        return sample_exam
+
+    def _submit(self, client, exam, answer_text):
+        payload = {
+            "exam_uuid": str(exam.uuid),
+            "answers": [{"question_uuid": str(q.uuid), "answer_text": answer_text} for q in exam.questions.all()],
+        }
+        return client.post("/submissions/", payload, format="json")
+
+    def test_publish_is_idempotent_for_unchanged_questions(self, sample_exam):
+        first = ExamVersionService.publish(sample_exam)
+
+        assert ExamVersionService.publish(sample_exam).pk == first.pk
+        assert first.version == 1
+        assert [q["uuid"] for q in first.snapshot["questions"]] == [str(q.uuid) for q in sample_exam.questions.all()]
+
+    def test_versions_are_immutable(self, sample_exam):
+        from django.core.exceptions import ValidationError
+
+        version = ExamVersionService.publish(sample_exam)
+        version.content_hash = "x"
+
+        with pytest.raises(ValidationError):
+            version.save()
+
+    def test_submission_records_current_version(self, authenticated_client, sample_exam):
+        response = self._submit(authenticated_client, sample_exam, "B")
+
+        submission = Submission.objects.get(uuid=response.data["data"]["submission"]["id"])
+        assert submission.exam_version == sample_exam.versions.first()
+
+    def test_regrade_uses_snapshot_after_question_edit(self, authenticated_client, sample_exam, instructor_user):
+        question = sample_exam.questions.first()
+        response = self._submit(authenticated_client, sample_exam, "B")
+        submission = Submission.objects.get(uuid=response.data["data"]["submission"]["id"])
+        score = submission.score
+
+        payload = [{"id": str(question.uuid), "order": question.order, "marks": "5"}]
+        ExamService.update_exam(str(sample_exam.uuid), {"questions": payload}, instructor_user)
+        GradingPlanStore.clear()
+        SubmissionService.grade_submission(str(submission.uuid))
+        submission.refresh_from_db()
+
+        assert sample_exam.versions.count() == 2
+        assert submission.exam_version.version == 1
+        assert submission.score == score
+
+    def test_admin_edit_publishes_new_version_on_next_submission(self, sample_exam, django_capture_on_commit_callbacks):
+        first = ExamVersionService.current(sample_exam)
+        question = sample_exam.questions.first()
+        question.question_text = "Edited in admin"
+        with django_capture_on_commit_callbacks(execute=True):
+            question.save()
+        sample_exam.refresh_from_db()
+
+        second = ExamVersionService.current(sample_exam)
+
+        assert second.version == first.version + 1
+        assert ExamVersion.objects.get(pk=second.pk).snapshot["questions"][0]["question_text"] == "Edited in admin"
+
+    def test_exam_delete_cascades_through_versions(self, authenticated_client, sample_exam):
+        self._submit(authenticated_client, sample_exam, "B")
+
+        sample_exam.delete()
+
+        assert not ExamVersion.objects.exists()
+        assert not Submission.objects.exists()
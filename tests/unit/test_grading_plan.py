@@ -0,0 +1,150 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from apps.submissions.grading.mock_grader import MockGrader
+from apps.submissions.grading.plan import (
+    PLAN_MAGIC,
+    GradingPlanStore,
+    MappedQuestions,
+    compile_grading_plan,
+    decode_plan,
+    encode_plan,
+    extract_keywords,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestGradingPlan:
+    def _exam_with_questions(self):
+        from tests.factories.exam_factory import ExamFactory, QuestionFactory
+
+        exam = ExamFactory()
+        QuestionFactory(exam=exam, order=1, question_type="MCQ", correct_answer=" B ", marks=5)
+        QuestionFactory(
+            exam=exam,
+            order=2,
+            question_type="SHORT_ANSWER",
+            correct_answer="Photosynthesis converts light energy",
+            marks=10,
+            grading_rubric={"keyword_weight": 0.5},
+        )
+        return exam
+
+    def test_compiled_entries_resolve_rubric_defaults(self):
+        exam = self._exam_with_questions()
+
+        plan = compile_grading_plan(GradingPlanStore.source_rows(exam))
+        mcq, short = sorted(plan["questions"].values(), key=lambda entry: entry["type"])
+
+        assert mcq["match"] == "b"
+        assert short["keywords_lower"] == ["photosynthesis", "converts", "light", "energy"]
+        assert short["keyword_weight"] == 0.5
+        assert short["similarity_weight"] == 0.6
+
+    def test_hash_changes_with_question_content(self):
+        exam = self._exam_with_questions()
+        before = compile_grading_plan(GradingPlanStore.source_rows(exam))["hash"]
+
+        exam.questions.filter(order=1).update(marks=6)
+
+        assert compile_grading_plan(GradingPlanStore.source_rows(exam))["hash"] != before
+
+    def test_plan_round_trips_through_disk(self, grading_plan_dir):
+        exam = self._exam_with_questions()
+
+        plan = GradingPlanStore.compile(exam)
+        GradingPlanStore.clear()
+        exam.refresh_from_db()
+
+        assert exam.grading_plan_hash == plan["hash"]
+        assert GradingPlanStore.path_for(GradingPlanStore.live_key(exam.uuid, plan["hash"])).exists()
+        assert GradingPlanStore.get(exam) == plan
+
+    def test_plan_files_are_mapped_and_the_cache_is_bounded(self, grading_plan_dir, settings):
+        from tests.factories.exam_factory import ExamFactory, QuestionFactory
+
+        settings.GRADING_PLAN_CACHE_SIZE = 2
+        GradingPlanStore.clear()
+        exams = ExamFactory.create_batch(3)
+        for exam in exams:
+            QuestionFactory(exam=exam, order=1)
+            GradingPlanStore.compile(exam)
+            GradingPlanStore.get(exam)
+
+        path = GradingPlanStore.path_for(GradingPlanStore.live_key(exams[0].uuid, exams[0].grading_plan_hash))
+        assert path.read_bytes().startswith(PLAN_MAGIC)
+        assert isinstance(GradingPlanStore.get(exams[0])["questions"], MappedQuestions)
+        assert len(GradingPlanStore.plan_cache()) == 2
+
+    def test_binary_layout_round_trips_every_entry_type(self):
+        from tests.factories.exam_factory import QuestionFactory
+
+        exam = self._exam_with_questions()
+        essay = QuestionFactory(
+            exam=exam, order=3, question_type="ESSAY", grading_rubric={"min_length": 50, "keywords": ["Énergie"]}
+        )
+        plan = compile_grading_plan(GradingPlanStore.source_rows(exam))
+
+        mapped = decode_plan(encode_plan(plan))
+
+        assert mapped == plan
+        assert mapped["questions"][essay.id]["keywords_lower"] == ["énergie"]
+        assert essay.id + 1000 not in mapped["questions"]
+
+    def test_truncated_plan_file_is_recompiled(self, grading_plan_dir):
+        exam = self._exam_with_questions()
+        plan = GradingPlanStore.compile(exam)
+        path = GradingPlanStore.path_for(GradingPlanStore.live_key(exam.uuid, plan["hash"]))
+        path.write_bytes(path.read_bytes()[:40])
+        GradingPlanStore.clear()
+
+        assert GradingPlanStore.get(exam) == plan
+        GradingPlanStore.clear()
+        assert isinstance(GradingPlanStore.get(exam)["questions"], MappedQuestions)
+
+    def test_question_edit_expires_plan(self, django_capture_on_commit_callbacks):
+        exam = self._exam_with_questions()
+        GradingPlanStore.compile(exam)
+
+        question = exam.questions.get(order=1)
+        question.correct_answer = "C"
+        with django_capture_on_commit_callbacks(execute=True):
+            question.save()
+        exam.refresh_from_db()
+
+        assert exam.grading_plan_hash == ""
+        assert GradingPlanStore.get(exam)["questions"][question.id]["expected"] == "C"
+
+    def test_grade_submission_executes_plan(self):
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        exam = self._exam_with_questions()
+        submission = SubmissionFactory(exam=exam)
+        answers = {"MCQ": "b", "SHORT_ANSWER": "Plants turn light into energy"}
+        for question in exam.questions.all():
+            AnswerFactory(submission=submission, question=question, answer_text=answers[question.question_type])
+
+        result = MockGrader().grade_submission(submission)
+
+        assert result["total_possible"] == 15.0
+        assert 5.0 < result["total_score"] < 15.0
+        assert submission.answers.get(question__order=1).is_correct is True
+
+    def test_extract_keywords_is_deterministic(self):
+        assert extract_keywords("Energy flows; energy is light and light is fast") == [
+            "energy",
+            "flows",
+            "light",
+            "fast",
+        ]
+
+    def test_compile_command(self):
+        exam = self._exam_with_questions()
+        out = StringIO()
+
+        call_command("compile_grading_plans", stdout=out)
+        exam.refresh_from_db()
+
+        assert exam.grading_plan_hash
+        assert "1 exams" in out.getvalue()
@@ -0,0 +1,94 @@
+import json
+import logging
+import pytest
+from unittest.mock import patch
+from django.http import HttpResponse
+from django.test import RequestFactory
+from apps.common.middleware.logging_middleware import LoggingMiddleware
+from apps.common.utils.logging_utils import JSONFormatter, QueueListenerHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class Mutable:
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return self.value
+
+
+@pytest.fixture
+def records():
+    target = ListHandler()
+    logger = logging.getLogger("apps")
+    original = logger.handlers
+    logger.handlers = [target]
+    yield target.records
+    logger.handlers = original
+
+
+@pytest.mark.unit
+class TestQueueListenerHandler:
+    def test_records_are_formatted_before_they_are_queued(self):
+        target, errors = ListHandler(), ListHandler(logging.ERROR)
+        handler = QueueListenerHandler([target, errors])
+        logger = logging.getLogger("tests.queue")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            argument = Mutable("formatted")
+            logger.warning("value: %s", argument)
+            argument.value = "changed after logging"
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        assert [record.getMessage() for record in target.records] == ["value: formatted", "failed"]
+        assert [record.getMessage() for record in errors.records] == ["failed"]
+        assert "ValueError: boom" in target.records[1].exc_text
+        assert all(record.args is None and record.exc_info is None for record in target.records)
+
+    def test_json_formatter_includes_extra_fields(self):
+        record = logging.makeLogRecord({"name": "apps", "levelname": "INFO", "msg": "GET %s", "args": ("/exams/",)})
+        record.status_code = 200
+
+        payload = json.loads(JSONFormatter().format(record))
+
+        assert payload["message"] == "GET /exams/"
+        assert (payload["logger"], payload["level"], payload["status_code"]) == ("apps", "INFO", 200)
+
+
+@pytest.mark.unit
+class TestLoggingMiddleware:
+    def _call(self, status_code, path="/exams/"):
+        middleware = LoggingMiddleware(lambda request: HttpResponse(status=status_code))
+        return middleware(RequestFactory().get(path))
+
+    def test_one_structured_record_per_request(self, records):
+        self._call(200)
+
+        (record,) = records
+        assert (record.method, record.path, record.status_code) == ("GET", "/exams/", 200)
+        assert record.getMessage().startswith("GET /exams/ | Status: 200")
+
+    def test_successful_requests_are_sampled(self, settings, records):
+        settings.LOG_REQUEST_SAMPLE_RATE = 0.25
+
+        with patch("apps.common.middleware.logging_middleware.random.random", side_effect=[0.1, 0.5, 0.9]):
+            for _ in range(3):
+                self._call(200)
+            self._call(500)
+
+        assert [record.status_code for record in records] == [200, 500]
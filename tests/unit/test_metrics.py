@@ -0,0 +1,67 @@
+import json
+import os
+import time
+import pytest
+from apps.common.utils.metrics import LATENCY_BUCKETS, Metrics, render_prometheus
+
+
+@pytest.mark.unit
+class TestMetrics:
+    def test_histograms_render_cumulative_buckets(self):
+        for value in (0.003, 0.02, 0.02, 3.0):
+            Metrics.observe("http_request_duration_seconds", value, route="exams:exam-list", method="GET")
+
+        text = render_prometheus(Metrics.collect())
+
+        labels = 'method="GET",route="exams:exam-list"'
+        assert "# TYPE http_request_duration_seconds histogram" in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 3' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="2.5"}} 3' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+        assert f"http_request_duration_seconds_count{{{labels}}} 4" in text
+        assert len([line for line in text.splitlines() if "_bucket" in line]) == len(LATENCY_BUCKETS) + 1
+
+    def test_snapshots_of_other_workers_are_merged(self, metrics_dir):
+        Metrics.inc("http_requests_total", route="accounts:login", method="POST", status=200)
+        Metrics.inc("http_requests_in_flight")
+        metrics_dir.mkdir(parents=True)
+        counters = {"http_requests_total": [[{"route": "accounts:login", "method": "POST", "status": "200"}, 2]]}
+        gauges = {"http_requests_in_flight": [[{}, 3]]}
+        # An exited worker keeps its counters but not its gauges
+        (metrics_dir / "metrics-1.json").write_text(json.dumps({"pid": 999999999, "metrics": {**counters, **gauges}}))
+
+        merged = Metrics.collect()
+
+        assert merged["http_requests_total"][(("method", "POST"), ("route", "accounts:login"), ("status", "200"))] == 3
+        assert merged["http_requests_in_flight"][()] == 1
+
+    def test_snapshots_are_kept_apart_per_process_start(self, metrics_dir):
+        Metrics.inc("http_requests_total", route="accounts:login", method="POST", status=200)
+        Metrics.flush()
+        # Same PID, later process: e.g. a new worker that was handed an exited worker's PID
+        Metrics._process = (Metrics.process()[0], Metrics.process()[1] + 1)
+        Metrics.flush()
+
+        assert len(list(metrics_dir.glob("metrics-*.json"))) == 2
+        key = (("method", "POST"), ("route", "accounts:login"), ("status", "200"))
+        assert Metrics.collect()["http_requests_total"][key] == 2
+
+    def test_snapshots_of_exited_processes_expire(self, metrics_dir, settings):
+        settings.METRICS_RETENTION_SECONDS = 60
+        metrics_dir.mkdir(parents=True)
+        counters = {"http_requests_total": [[{"route": "r", "method": "GET", "status": "200"}, 1]]}
+        for name in ("recent", "expired"):
+            path = metrics_dir / f"metrics-{name}.json"
+            path.write_text(json.dumps({"pid": 999999999, "started": len(name), "metrics": counters}))
+        os.utime(metrics_dir / "metrics-expired.json", (time.time() - 120, time.time() - 120))
+
+        merged = Metrics.collect()
+
+        assert merged["http_requests_total"][(("method", "GET"), ("route", "r"), ("status", "200"))] == 1
+        assert [path.name for path in metrics_dir.glob("metrics-*.json")] == ["metrics-recent.json"]
+
+    def test_label_values_are_escaped(self):
+        Metrics.inc("http_requests_total", route='a"b\\c', method="GET", status=200)
+
+        assert 'route="a\\"b\\\\c"' in render_prometheus(Metrics.collect())
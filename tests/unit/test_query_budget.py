@@ -0,0 +1,46 @@
+import logging
+import pytest
+from apps.accounts.models import User
+from apps.common.utils.query_budget import QueryBudget, QueryBudgetExceeded, query_shape
+
+
+@pytest.mark.unit
+class TestQueryShape:
+    def test_parameter_lists_are_collapsed(self):
+        assert query_shape('SELECT * FROM "t" WHERE "t"."id" IN (%s, %s, %s)') == query_shape(
+            'SELECT * FROM "t" WHERE "t"."id" IN (%s)'
+        )
+        assert query_shape('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)') == (
+            'INSERT INTO "t" ("a", "b") VALUES (...)'
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestQueryBudget:
+    def test_counts_queries_and_time(self):
+        with QueryBudget() as budget:
+            list(User.objects.all())
+            User.objects.count()
+
+        assert budget.count == 2
+        assert budget.duration > 0
+
+    def test_repeated_shapes_are_reported_as_n_plus_one(self):
+        with pytest.raises(QueryBudgetExceeded, match="likely N\\+1, 3x"):
+            with QueryBudget(n_plus_one_threshold=3, raise_on_violation=True):
+                for pk in range(3):
+                    User.objects.filter(pk=pk).first()
+
+    def test_exceeding_the_budget_is_logged_by_default(self, caplog):
+        logger = logging.getLogger("apps")
+        logger.addHandler(caplog.handler)
+        try:
+            with QueryBudget(max_queries=1, label="GET /exams/"):
+                User.objects.count()
+                User.objects.exists()
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert "Query budget exceeded in GET /exams/" in caplog.text
+        assert "2 queries (budget 1)" in caplog.text
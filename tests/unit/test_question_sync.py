@@ -0,0 +1,95 @@
+import pytest
+from apps.exams.services import ExamService
+from apps.submissions.models import Answer
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestQuestionUpsert:
+    def _exam(self):
+        from tests.factories.exam_factory import ExamFactory, QuestionFactory
+
+        exam = ExamFactory()
+        for order in (1, 2, 3):
+            QuestionFactory(exam=exam, order=order, question_text=f"Question {order}", marks=5)
+        return exam
+
+    def _payload(self, exam):
+        return [
+            {
+                "id": str(q.uuid),
+                "question_text": q.question_text,
+                "question_type": q.question_type,
+                "marks": str(q.marks),
+                "order": q.order,
+                "options": q.options,
+            }
+            for q in exam.questions.order_by("order")
+        ]
+
+    def test_typo_fix_keeps_uuids_and_answers(self, instructor_user):
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        exam = self._exam()
+        first = exam.questions.get(order=1)
+        answer = AnswerFactory(submission=SubmissionFactory(exam=exam), question=first)
+        payload = self._payload(exam)
+        payload[0]["question_text"] = "Question one"
+
+        result = ExamService.update_exam(str(exam.uuid), {"questions": payload}, instructor_user)
+
+        assert result.success is True
+        assert result.data["question_changes"] == {"created": 0, "updated": 1, "deleted": 0, "unchanged": 2}
+        first.refresh_from_db()
+        assert first.question_text == "Question one"
+        assert Answer.objects.filter(pk=answer.pk).exists()
+
+    def test_reorder_create_and_delete(self, instructor_user):
+        exam = self._exam()
+        original = {q.order: q.uuid for q in exam.questions.all()}
+        payload = self._payload(exam)
+        payload[0]["order"], payload[1]["order"] = 2, 1
+        payload[2] = {"question_text": "New", "question_type": "ESSAY", "marks": "10", "order": 4}
+
+        result = ExamService.update_exam(str(exam.uuid), {"questions": payload}, instructor_user)
+
+        assert result.data["question_changes"] == {"created": 1, "updated": 2, "deleted": 1, "unchanged": 0}
+        orders = dict(exam.questions.values_list("order", "uuid"))
+        assert orders[1] == original[2]
+        assert orders[2] == original[1]
+        assert orders[4] != original[3]
+        assert 3 not in orders
+
+    def test_matches_by_order_without_uuid(self, instructor_user):
+        exam = self._exam()
+        second = exam.questions.get(order=2)
+        payload = [{key: value for key, value in item.items() if key != "id"} for item in self._payload(exam)]
+        payload[1]["marks"] = "7"
+
+        result = ExamService.update_exam(str(exam.uuid), {"questions": payload}, instructor_user)
+
+        assert result.data["question_changes"]["updated"] == 1
+        assert exam.questions.get(order=2).uuid == second.uuid
+
+    def test_invalid_payload_changes_nothing(self, instructor_user):
+        exam = self._exam()
+        payload = self._payload(exam)
+        payload[1]["order"] = 1
+
+        result = ExamService.update_exam(str(exam.uuid), {"title": "Renamed", "questions": payload}, instructor_user)
+
+        assert result.success is False
+        assert "order" in result.errors["questions"]
+        exam.refresh_from_db()
+        assert exam.title != "Renamed"
+
+    def test_foreign_question_uuid_rejected(self, instructor_user):
+        other = self._exam()
+        exam = self._exam()
+        payload = self._payload(exam)
+        payload[0]["id"] = str(other.questions.first().uuid)
+
+        result = ExamService.update_exam(str(exam.uuid), {"questions": payload}, instructor_user)
+
+        assert result.success is False
+        assert 0 in result.errors["questions"]
@@ -0,0 +1,140 @@
+import pytest
+from unittest.mock import patch
+from rest_framework import status
+from apps.submissions.ranking import ExamRanking, ExamRankingIndex, FenwickTree
+from apps.submissions.services import SubmissionService
+
+
+@pytest.mark.unit
+class TestFenwickRanking:
+    def test_prefix_sums(self):
+        tree = FenwickTree(10)
+        for index in [0, 3, 3, 9]:
+            tree.add(index)
+
+        assert tree.prefix_sum(2) == 1
+        assert tree.prefix_sum(3) == 3
+        assert tree.prefix_sum(9) == 4
+        assert tree.total == 4
+
+    def test_rank_and_percentile(self):
+        ranking = ExamRanking()
+        for percentage in [40, 60, 60, 90]:
+            ranking.add(percentage)
+
+        assert ranking.rank(90) == 1
+        assert ranking.rank(60) == 2
+        assert ranking.rank(40) == 4
+        assert ranking.percentile_rank(60) == 50.0
+        assert ranking.percentile_rank(90) == 87.5
+
+        ranking.remove(90)
+        assert ranking.rank(60) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExamRankingIndex:
+    def _graded(self, exam, answer_text, student=None):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        question = exam.questions.first() or QuestionFactory(exam=exam, order=1, correct_answer="B", marks=100)
+        submission = SubmissionFactory(exam=exam, **({"student": student} if student else {}))
+        AnswerFactory(submission=submission, question=question, answer_text=answer_text)
+        SubmissionService.grade_submission(str(submission.uuid))
+        return submission
+
+    def test_grading_updates_index_incrementally(self, sample_exam):
+        self._graded(sample_exam, "A")
+        ranking = ExamRankingIndex.get(sample_exam.id)
+
+        self._graded(sample_exam, "B")
+
+        assert ExamRankingIndex.get(sample_exam.id) is ranking
+        assert ranking.count == 2
+        assert ranking.rank(100) == 1
+
+    def test_stale_index_rebuilds_after_restart(self, sample_exam):
+        self._graded(sample_exam, "B")
+        self._graded(sample_exam, "A")
+        ExamRankingIndex.clear()
+
+        assert ExamRankingIndex.get(sample_exam.id).count == 2
+
+    def test_changes_are_replayed_without_rebuilding(self, sample_exam):
+        submission = self._graded(sample_exam, "A")
+        ranking = ExamRankingIndex.get(sample_exam.id)
+
+        # Graded and regraded as if by other processes; the change log is all this one sees
+        self._graded(sample_exam, "B")
+        submission.answers.update(answer_text="B")
+        SubmissionService.grade_submission(str(submission.uuid))
+
+        with patch.object(ExamRankingIndex, "_build", side_effect=AssertionError("rebuilt")):
+            assert ExamRankingIndex.get(sample_exam.id) is ranking
+        assert ranking.count == 2
+        assert ranking.percentile_rank(100) == 50.0
+        assert ranking.version == ExamRankingIndex.current_version(sample_exam.id) == 4
+
+    def test_stats_rebuild_rebuilds_index(self, sample_exam):
+        from apps.submissions.services import ExamStatsService
+
+        self._graded(sample_exam, "A")
+        ranking = ExamRankingIndex.get(sample_exam.id)
+
+        ExamStatsService.rebuild(sample_exam.id)
+
+        rebuilt = ExamRankingIndex.get(sample_exam.id)
+        assert rebuilt is not ranking
+        assert rebuilt.count == 1
+
+    def test_pruned_changes_rebuild_index(self, settings, sample_exam):
+        settings.RANKING_CHANGE_RETENTION = 2
+        self._graded(sample_exam, "A")
+        ranking = ExamRankingIndex.get(sample_exam.id)
+
+        for _ in range(3):
+            self._graded(sample_exam, "B")
+
+        rebuilt = ExamRankingIndex.get(sample_exam.id)
+        assert rebuilt is not ranking
+        assert rebuilt.count == 4
+
+    def test_tree_built_across_a_commit_is_not_kept(self, sample_exam):
+        self._graded(sample_exam, "A")
+        versions = iter([1, 2])
+
+        with patch.object(ExamRankingIndex, "current_version", side_effect=lambda exam_id: next(versions)):
+            ranking = ExamRankingIndex.get(sample_exam.id)
+
+        assert ranking.count == 1
+        assert ExamRankingIndex.get(sample_exam.id) is not ranking
+
+    def test_submission_detail_includes_percentile(self, authenticated_client, student_user, sample_exam):
+        mine = self._graded(sample_exam, "B", student=student_user)
+        self._graded(sample_exam, "A")
+        first = authenticated_client.get(f"/submissions/{mine.uuid}/")
+
+        self._graded(sample_exam, "B")
+        second = authenticated_client.get(f"/submissions/{mine.uuid}/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert first.data["data"]["statistics"]["percentile_rank"] == 75.0
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data["data"]["statistics"]["rank"] == 1
+        assert second.data["data"]["statistics"]["ranked_submissions"] == 3
+
+    def test_leaderboard_endpoint(self, authenticated_client, student_user, sample_exam):
+        self._graded(sample_exam, "A", student=student_user)
+        self._graded(sample_exam, "B")
+
+        response = authenticated_client.get(f"/exams/{sample_exam.uuid}/leaderboard/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry["rank"] for entry in response.data["data"]["entries"]] == [1, 2]
+        assert response.data["data"]["me"]["rank"] == 2
+
+    def test_leaderboard_requires_submission(self, authenticated_client, sample_exam):
+        response = authenticated_client.get(f"/exams/{sample_exam.uuid}/leaderboard/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
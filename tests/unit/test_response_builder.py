@@ -38,3 +38,11 @@ class TestResponseBuilder:
         assert response.status_code == 201
         assert response.data["success"] is True
         assert "REGISTRATION" in response.data["code"] or response.status_code == 201
+
+    def test_service_response_not_modified(self):
+        result = ResponseBuilder.success("not_modified", headers={"ETag": '"abc"'})
+        response = result.to_response()
+
+        assert response.status_code == 304
+        assert response.data is None
+        assert response["ETag"] == '"abc"'
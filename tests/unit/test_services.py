@@ -87,6 +87,11 @@ class TestSubmissionService:
 
         assert result.success is False
 
+    def test_grade_submission_malformed_uuid(self):
+        result = SubmissionService.grade_submission("not-a-uuid")
+
+        assert result.success is False
+
     def test_get_student_submissions(self, student_user):
         """Test getting student submissions."""
         result = SubmissionService.get_student_submissions(student_user)
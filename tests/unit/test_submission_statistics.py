@@ -0,0 +1,58 @@
+import pytest
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+from apps.submissions.services import SubmissionService
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSubmissionStatistics:
+    def _submission_with_answers(self, student_user, **kwargs):
+        from tests.factories.exam_factory import QuestionFactory
+        from tests.factories.submission_factory import SubmissionFactory, AnswerFactory
+
+        submission = SubmissionFactory(student=student_user, **kwargs)
+        q1 = QuestionFactory(exam=submission.exam, order=1, correct_answer="B", marks=50)
+        q2 = QuestionFactory(exam=submission.exam, order=2, correct_answer="C", marks=50)
+        AnswerFactory(submission=submission, question=q1, answer_text="B")
+        AnswerFactory(submission=submission, question=q2, answer_text="A")
+        return submission
+
+    def test_grading_persists_statistics(self, student_user):
+        submission = self._submission_with_answers(student_user)
+
+        SubmissionService.grade_submission(str(submission.uuid))
+        submission.refresh_from_db()
+
+        assert submission.questions_answered == 2
+        assert submission.correct_count == 1
+        assert submission.accuracy == Decimal("50.00")
+        assert submission.passed is True
+
+    def test_detail_statistics_read_from_columns(self, student_user):
+        submission = self._submission_with_answers(student_user)
+        SubmissionService.grade_submission(str(submission.uuid))
+
+        result = SubmissionService.get_submission_detail(str(submission.uuid), student_user)
+
+        statistics = result.data["statistics"]
+        assert {key: statistics[key] for key in ("questions_answered", "correct_answers", "accuracy")} == {
+            "questions_answered": 2,
+            "correct_answers": 1,
+            "accuracy": 50.0,
+        }
+        assert result.data["submission"]["passed"] is True
+
+    def test_backfill_command_populates_missing_rows(self, student_user):
+        from apps.submissions.models import Answer
+
+        submission = self._submission_with_answers(student_user, status="COMPLETED", set_score=50)
+        Answer.objects.filter(submission=submission, answer_text="B").update(is_correct=True)
+
+        call_command("backfill_submission_statistics", stdout=StringIO())
+        submission.refresh_from_db()
+
+        assert submission.correct_count == 1
+        assert submission.accuracy == Decimal("50.00")
+        assert submission.passed is True
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from rest_framework.test import APIRequestFactory
+from apps.common.utils.throttling import IPRateThrottle
+
+RATES = {"exam_ip": "10/min"}
+
+
+class ThrottledView:
+    throttle_scope = "exam"
+
+
+def _allow(now, ip="10.0.0.1"):
+    throttle = IPRateThrottle()
+    request = APIRequestFactory().get("/", REMOTE_ADDR=ip)
+    with patch.object(IPRateThrottle, "timer", return_value=now):
+        return throttle.allow_request(request, ThrottledView()), throttle
+
+
+@pytest.mark.unit
+class TestSlidingWindowThrottle:
+    @pytest.fixture(autouse=True)
+    def rates(self, settings):
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": RATES}
+
+    def test_limit_applies_per_ip(self):
+        assert all(_allow(600 + i)[0] for i in range(10))
+
+        allowed, throttle = _allow(615)
+        assert not allowed
+        assert throttle.wait() == pytest.approx(45)
+        assert _allow(615, ip="10.0.0.2")[0]
+
+    def test_previous_window_decays_as_the_window_slides(self):
+        for i in range(10):
+            _allow(600 + i)
+
+        # Next window starts with the previous one fully counted
+        allowed, throttle = _allow(660)
+        assert not allowed
+        assert throttle.wait() == 1
+        # Half-way through, it counts for 5 of the 10 requests
+        assert [_allow(690)[0] for _ in range(6)] == [True] * 5 + [False]
+
+    def test_rejected_requests_are_not_counted(self):
+        for i in range(10):
+            _allow(600 + i)
+        for _ in range(50):
+            _allow(630)
+
+        assert _allow(720)[0]
+
+    def test_views_without_a_rate_are_not_throttled(self, settings):
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+
+        assert all(_allow(600)[0] for _ in range(20))
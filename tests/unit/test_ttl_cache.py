@@ -0,0 +1,34 @@
+import pytest
+from unittest.mock import patch
+from apps.common.utils.ttl_cache import TTLCache
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(maxsize=10, ttl=30)
+        with patch("apps.common.utils.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            assert cache.get("a") == 1
+        with patch("apps.common.utils.ttl_cache.time.monotonic", return_value=130.0):
+            assert cache.get("a") is None
+            assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+    def test_delete_and_clear(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("a")
+        cache.delete("missing")
+        assert cache.get("a", "default") == "default"
+        cache.clear()
+        assert len(cache) == 0